@@ -0,0 +1,98 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "./interfaces/oracles.sol";
+
+interface IHarvestable {
+    function harvest() external;
+
+    function harvestTrigger(uint256 callCostInWei) external view returns (bool);
+}
+
+// Harvests many strategies in one transaction. Each harvest after the first one gets our swap pools, routers and tokens
+// already warm, and we only pay the base transaction cost once. Set this contract as the keeper on each strategy.
+contract BatchHarvester {
+    /* ========== STATE VARIABLES ========== */
+
+    address public owner; // can add or remove keepers
+    mapping(address => bool) public keepers; // addresses allowed to call our harvest functions
+    IPriceSnapshot public priceSnapshot; // if set, we snapshot prices before checking triggers so every check shares them
+
+    /* ========== EVENTS ========== */
+
+    event StrategyHarvested(address indexed strategy, uint256 gasUsed);
+    event HarvestFailed(address indexed strategy);
+    event UpdatedKeeper(address indexed keeper, bool allowed);
+    event UpdatedOwner(address indexed owner);
+
+    /* ========== CONSTRUCTOR ========== */
+
+    constructor() public {
+        owner = msg.sender;
+        keepers[msg.sender] = true;
+    }
+
+    /* ========== MODIFIERS ========== */
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "!owner");
+        _;
+    }
+
+    modifier onlyKeepers() {
+        require(keepers[msg.sender], "!keeper");
+        _;
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /// @notice Harvest every strategy in the list. One failing harvest won't block the others.
+    function harvest(address[] calldata _strategies) external onlyKeepers {
+        for (uint256 i = 0; i < _strategies.length; i++) {
+            _harvest(_strategies[i]);
+        }
+    }
+
+    /// @notice Harvest only the strategies in the list whose harvestTrigger is true.
+    function harvestTriggered(address[] calldata _strategies)
+        external
+        onlyKeepers
+    {
+        if (address(priceSnapshot) != address(0)) {
+            priceSnapshot.update();
+        }
+        for (uint256 i = 0; i < _strategies.length; i++) {
+            if (IHarvestable(_strategies[i]).harvestTrigger(0)) {
+                _harvest(_strategies[i]);
+            }
+        }
+    }
+
+    // log the gas each harvest used so we can compare against harvesting one at a time
+    function _harvest(address _strategy) internal {
+        uint256 _gasBefore = gasleft();
+        try IHarvestable(_strategy).harvest() {
+            emit StrategyHarvested(_strategy, _gasBefore - gasleft());
+        } catch {
+            emit HarvestFailed(_strategy);
+        }
+    }
+
+    /* ========== SETTERS ========== */
+
+    function setKeeper(address _keeper, bool _allowed) external onlyOwner {
+        keepers[_keeper] = _allowed;
+        emit UpdatedKeeper(_keeper, _allowed);
+    }
+
+    function setPriceSnapshot(address _priceSnapshot) external onlyOwner {
+        priceSnapshot = IPriceSnapshot(_priceSnapshot);
+    }
+
+    function setOwner(address _owner) external onlyOwner {
+        require(_owner != address(0));
+        owner = _owner;
+        emit UpdatedOwner(_owner);
+    }
+}
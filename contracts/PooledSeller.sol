@@ -0,0 +1,233 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import "@openzeppelin/contracts/math/SafeMath.sol";
+
+import "./interfaces/curve.sol";
+
+interface IPooledStrategy {
+    function claimForSeller()
+        external
+        returns (uint256 _crvAmount, uint256 _convexAmount);
+
+    function harvest() external;
+}
+
+// Sells CRV and CVX for many strategies at once. Each strategy sends us its CRV and CVX, we make one swap on crveth
+// and one on cvxeth, send each strategy its pro-rata share of the WETH, then harvest it so it compounds that WETH.
+// Set this contract as both the pooledSeller and the keeper on every strategy that takes part.
+contract PooledSeller {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    /* ========== STATE VARIABLES ========== */
+
+    address public owner; // can add or remove keepers, and sweep out rounding dust
+    mapping(address => bool) public keepers; // addresses allowed to call sellAndHarvest
+
+    IERC20 internal constant crv =
+        IERC20(0xD533a949740bb3306d119CC777fa900bA034cd52);
+    IERC20 internal constant convexToken =
+        IERC20(0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B);
+    IERC20 internal constant weth =
+        IERC20(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
+    ICurveFi internal constant crveth =
+        ICurveFi(0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511); // use curve's new CRV-ETH crypto pool to sell our CRV
+    ICurveFi internal constant cvxeth =
+        ICurveFi(0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4); // use curve's new CVX-ETH crypto pool to sell our CVX
+
+    // below these totals we don't sell. we hold on to everyone's CRV or CVX until a later round, since it's already had
+    // keepCRV and keepCVX taken out; sending it back would take them out again on the strategy's next harvest.
+    uint256 public minCrvToSell = 1e17;
+    uint256 public minCvxToSell = 1e17;
+    mapping(address => uint256) public crvCarried; // CRV we're holding for each strategy until we sell it
+    mapping(address => uint256) public convexCarried; // CVX we're holding for each strategy until we sell it
+
+    // if set, the most our swaps can fall short of curve's price oracles (in basis points), like a strategy's maxSlippage
+    uint256 public maxSlippage;
+    uint256 internal constant FEE_DENOMINATOR = 10000;
+
+    /* ========== EVENTS ========== */
+
+    event Sold(
+        uint256 crvAmount,
+        uint256 convexAmount,
+        uint256 wethFromCrv,
+        uint256 wethFromConvex
+    );
+    event Distributed(
+        address indexed strategy,
+        uint256 crvAmount,
+        uint256 convexAmount,
+        uint256 wethAmount
+    );
+    event UpdatedKeeper(address indexed keeper, bool allowed);
+    event UpdatedOwner(address indexed owner);
+
+    /* ========== CONSTRUCTOR ========== */
+
+    constructor() public {
+        owner = msg.sender;
+        keepers[msg.sender] = true;
+        crv.approve(address(crveth), type(uint256).max);
+        convexToken.approve(address(cvxeth), type(uint256).max);
+    }
+
+    /* ========== MODIFIERS ========== */
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "!owner");
+        _;
+    }
+
+    modifier onlyKeepers() {
+        require(keepers[msg.sender], "!keeper");
+        _;
+    }
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /// @notice Pool the CRV and CVX from every strategy in the list, sell it together, and harvest each strategy.
+    function sellAndHarvest(address[] calldata _strategies)
+        external
+        onlyKeepers
+    {
+        uint256 _length = _strategies.length;
+        uint256[] memory _crvAmounts = new uint256[](_length);
+        uint256[] memory _convexAmounts = new uint256[](_length);
+        uint256 _totalCrv;
+        uint256 _totalConvex;
+        for (uint256 i = 0; i < _length; i++) {
+            (_crvAmounts[i], _convexAmounts[i]) = IPooledStrategy(
+                _strategies[i]
+            )
+                .claimForSeller();
+            // add in anything we held back for this strategy last time
+            _crvAmounts[i] = _crvAmounts[i].add(crvCarried[_strategies[i]]);
+            _convexAmounts[i] = _convexAmounts[i].add(
+                convexCarried[_strategies[i]]
+            );
+            _totalCrv = _totalCrv.add(_crvAmounts[i]);
+            _totalConvex = _totalConvex.add(_convexAmounts[i]);
+        }
+
+        // don't want to swap dust or we might revert
+        uint256 _wethFromCrv;
+        if (_totalCrv > minCrvToSell) {
+            _wethFromCrv = _sell(crveth, _totalCrv);
+        }
+        uint256 _wethFromConvex;
+        if (_totalConvex > minCvxToSell) {
+            _wethFromConvex = _sell(cvxeth, _totalConvex);
+        }
+        emit Sold(_totalCrv, _totalConvex, _wethFromCrv, _wethFromConvex);
+
+        for (uint256 i = 0; i < _length; i++) {
+            address _strategy = _strategies[i];
+            uint256 _wethAmount;
+            if (_wethFromCrv > 0) {
+                _wethAmount = _wethFromCrv.mul(_crvAmounts[i]).div(_totalCrv);
+                crvCarried[_strategy] = 0;
+            } else {
+                crvCarried[_strategy] = _crvAmounts[i];
+            }
+            if (_wethFromConvex > 0) {
+                _wethAmount = _wethAmount.add(
+                    _wethFromConvex.mul(_convexAmounts[i]).div(_totalConvex)
+                );
+                convexCarried[_strategy] = 0;
+            } else {
+                convexCarried[_strategy] = _convexAmounts[i];
+            }
+            if (_wethAmount > 0) {
+                weth.safeTransfer(_strategy, _wethAmount);
+            }
+            emit Distributed(
+                _strategy,
+                _crvAmounts[i],
+                _convexAmounts[i],
+                _wethAmount
+            );
+
+            IPooledStrategy(_strategy).harvest();
+        }
+    }
+
+    /// @notice Sell whatever CRV and CVX we're holding for a strategy that's leaving our pool, and send it the WETH.
+    function release(address _strategy) external onlyOwner {
+        uint256 _wethAmount;
+        uint256 _crvAmount = crvCarried[_strategy];
+        if (_crvAmount > 0) {
+            crvCarried[_strategy] = 0;
+            _wethAmount = _sell(crveth, _crvAmount);
+        }
+        uint256 _convexAmount = convexCarried[_strategy];
+        if (_convexAmount > 0) {
+            convexCarried[_strategy] = 0;
+            _wethAmount = _wethAmount.add(_sell(cvxeth, _convexAmount));
+        }
+        if (_wethAmount > 0) {
+            weth.safeTransfer(_strategy, _wethAmount);
+        }
+        emit Distributed(_strategy, _crvAmount, _convexAmount, _wethAmount);
+    }
+
+    // sell our CRV or CVX (coin 1) for WETH (coin 0), returning how much WETH we got. with maxSlippage set, our minimum
+    // output comes from the pool's own price oracle, the same way a strategy's _minOut works.
+    function _sell(ICurveFi _pool, uint256 _amount) internal returns (uint256) {
+        uint256 _minWeth;
+        if (maxSlippage > 0) {
+            _minWeth = _amount
+                .mul(_pool.price_oracle())
+                .div(1e18)
+                .mul(FEE_DENOMINATOR.sub(maxSlippage))
+                .div(FEE_DENOMINATOR);
+        }
+        uint256 _wethBefore = weth.balanceOf(address(this));
+        _pool.exchange(1, 0, _amount, _minWeth, false);
+        return weth.balanceOf(address(this)).sub(_wethBefore);
+    }
+
+    /* ========== SETTERS ========== */
+
+    function setKeeper(address _keeper, bool _allowed) external onlyOwner {
+        keepers[_keeper] = _allowed;
+        emit UpdatedKeeper(_keeper, _allowed);
+    }
+
+    function setOwner(address _owner) external onlyOwner {
+        require(_owner != address(0));
+        owner = _owner;
+        emit UpdatedOwner(_owner);
+    }
+
+    function setMinToSell(uint256 _minCrvToSell, uint256 _minCvxToSell)
+        external
+        onlyOwner
+    {
+        minCrvToSell = _minCrvToSell;
+        minCvxToSell = _minCvxToSell;
+    }
+
+    /// @notice Set how far below curve's price oracles our swaps can fill before we revert. Set to zero to turn off.
+    function setMaxSlippage(uint256 _maxSlippage) external onlyOwner {
+        require(_maxSlippage < FEE_DENOMINATOR);
+        maxSlippage = _maxSlippage;
+    }
+
+    /// @notice Rounding down our pro-rata shares can leave a few wei of WETH here; this lets us clean it up. CRV and CVX
+    /// we're holding belong to our strategies, so use release() for those.
+    function sweep(address _token) external onlyOwner {
+        require(
+            _token != address(crv) && _token != address(convexToken),
+            "!protected"
+        );
+        IERC20(_token).safeTransfer(
+            owner,
+            IERC20(_token).balanceOf(address(this))
+        );
+    }
+}
@@ -0,0 +1,115 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import "./interfaces/curve.sol";
+import "./interfaces/oracles.sol";
+
+// Caches the prices and base fee check our strategies' harvestTrigger reads, once per block. Anyone can call update();
+// after that, every read this block (like a keeper checking dozens of clones in one transaction) is a single SLOAD
+// pair instead of four external oracle calls. Reads in a block we haven't updated in just go to the oracles directly.
+contract PriceSnapshot is IPriceSnapshot {
+    /* ========== STATE VARIABLES ========== */
+
+    IBaseFee internal constant baseFeeOracle =
+        IBaseFee(0xb5e1CAcB567d98faaDB60a1fD4820720141f064F);
+    IOracle internal constant ethOracle =
+        IOracle(0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419); // chainlink ETH-USD, 8 decimals
+    ICurveFi internal constant crveth =
+        ICurveFi(0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511); // CRV price in ETH, 18 decimals
+    ICurveFi internal constant cvxeth =
+        ICurveFi(0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4); // CVX price in ETH, 18 decimals
+
+    // packed into two slots
+    uint64 public lastUpdate; // block number of our last snapshot
+    bool internal baseFeeAcceptable;
+    uint128 internal ethPrice;
+    uint128 internal crvEthPrice;
+    uint128 internal cvxEthPrice;
+
+    /* ========== EVENTS ========== */
+
+    event Updated(
+        uint256 blockNumber,
+        bool baseFeeAcceptable,
+        uint256 ethPrice,
+        uint256 crvEthPrice,
+        uint256 cvxEthPrice
+    );
+
+    /* ========== MUTATIVE FUNCTIONS ========== */
+
+    /// @notice Snapshot our oracles for this block. Does nothing if we already have this block.
+    function update() external override {
+        if (lastUpdate == block.number) {
+            return;
+        }
+        bool _baseFeeAcceptable = baseFeeOracle.isCurrentBaseFeeAcceptable();
+        (uint256 _ethPrice, uint256 _crvEthPrice, uint256 _cvxEthPrice) =
+            _readPrices();
+        lastUpdate = uint64(block.number);
+        baseFeeAcceptable = _baseFeeAcceptable;
+        ethPrice = uint128(_ethPrice);
+        crvEthPrice = uint128(_crvEthPrice);
+        cvxEthPrice = uint128(_cvxEthPrice);
+        emit Updated(
+            block.number,
+            _baseFeeAcceptable,
+            _ethPrice,
+            _crvEthPrice,
+            _cvxEthPrice
+        );
+    }
+
+    /* ========== VIEWS ========== */
+
+    /// @notice True if we've already snapshotted this block.
+    function isCurrent() public view override returns (bool) {
+        return lastUpdate == block.number;
+    }
+
+    /// @notice Chainlink's ETH price (8 decimals), and curve's CRV and CVX prices in ETH (18 decimals).
+    function prices()
+        external
+        view
+        override
+        returns (
+            uint256 _ethPrice,
+            uint256 _crvEthPrice,
+            uint256 _cvxEthPrice
+        )
+    {
+        if (isCurrent()) {
+            return (ethPrice, crvEthPrice, cvxEthPrice);
+        }
+        return _readPrices();
+    }
+
+    /// @notice Same as our base fee oracle, so strategies can use either.
+    function isCurrentBaseFeeAcceptable()
+        external
+        view
+        override
+        returns (bool)
+    {
+        if (isCurrent()) {
+            return baseFeeAcceptable;
+        }
+        return baseFeeOracle.isCurrentBaseFeeAcceptable();
+    }
+
+    // only our prices, since prices() on a stale snapshot has no use for the base fee (strategies check that on its own)
+    function _readPrices()
+        internal
+        view
+        returns (
+            uint256 _ethPrice,
+            uint256 _crvEthPrice,
+            uint256 _cvxEthPrice
+        )
+    {
+        _ethPrice = ethOracle.latestAnswer();
+        _crvEthPrice = crveth.price_oracle();
+        _cvxEthPrice = cvxeth.price_oracle();
+    }
+}
@@ -6,22 +6,16 @@ pragma experimental ABIEncoderV2;
 import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import "@openzeppelin/contracts/utils/Address.sol";
 import "@openzeppelin/contracts/math/Math.sol";
+import "@openzeppelin/contracts/utils/SafeCast.sol";
 
 import "./interfaces/curve.sol";
+import "./interfaces/oracles.sol";
 import {IUniswapV2Router02} from "./interfaces/uniswap.sol";
 import {
     BaseStrategy,
     StrategyParams
 } from "@yearnvaults/contracts/BaseStrategy.sol";
 
-interface IBaseFee {
-    function isCurrentBaseFeeAcceptable() external view returns (bool);
-}
-
-interface IOracle {
-    function latestAnswer() external view returns (uint256);
-}
-
 interface IUniV3 {
     struct ExactInputParams {
         bytes path;
@@ -100,20 +94,32 @@ interface IConvexDeposit {
 
 abstract contract StrategyConvexBase is BaseStrategy {
     using Address for address;
+    using SafeCast for uint256;
 
     /* ========== STATE VARIABLES ========== */
     // these should stay the same across different wants.
+    // NOTE: variables we read on every harvest and harvestTrigger are packed together, so keep their order and sizes.
 
-    // convex stuff
+    // convex stuff, packed into one slot with our harvest settings
     address internal constant depositContract =
         0xF403C135812408BFbE8713b5A23a04b3D48AAE31; // this is the deposit contract that all pools use, aka booster
     IConvexRewards public rewardsContract; // This is unique to each curve pool
+    uint16 public keepCRV; // the percentage of CRV we re-lock for boost (in basis points)
+    uint16 public keepCVX; // the percentage of CVX we keep for boosting yield (in basis points)
+    bool internal forceHarvestTriggerOnce; // only set this to true when we want to trigger our keepers to harvest for us
+    bool public claimRewards; // boolean if we should always claim rewards when withdrawing, usually via withdrawAndUnwrap (generally this should be false)
+
+    // keeper stuff, packed into one slot
+    uint64 public harvestProfitMin; // minimum size in USD (6 decimals) that we want to harvest
+    uint64 public harvestProfitMax; // maximum size in USD (6 decimals) that we want to harvest
+    uint128 public creditThreshold; // amount of credit in underlying tokens that will automatically trigger a harvest
+
+    // deposit stuff, packed into one slot
+    uint128 public minDeposit; // we leave want loose until we have more than this to deposit to convex
+    uint128 public idleBuffer; // want we keep loose so small withdrawals don't need to unstake from convex
+
     address public virtualRewardsPool; // This is only if we have bonus rewards
     uint256 public pid; // this is unique to each pool
-
-    // keepCRV stuff
-    uint256 public keepCRV; // the percentage of CRV we re-lock for boost (in basis points)
-    uint256 public keepCVX; // the percentage of CVX we keep for boosting yield (in basis points)
     address public keepCVXDestination; // where we send the CVX we are keeping
     address internal constant voter =
         0xF147b8125d2ef93FB6965Db97D6746952a133934; // Yearn's veCRV voter, we send some extra CRV here
@@ -130,17 +136,8 @@ abstract contract StrategyConvexBase is BaseStrategy {
     IERC20 internal constant weth =
         IERC20(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
 
-    // keeper stuff
-    uint256 public harvestProfitMin; // minimum size in USD (6 decimals) that we want to harvest
-    uint256 public harvestProfitMax; // maximum size in USD (6 decimals) that we want to harvest
-    uint256 public creditThreshold; // amount of credit in underlying tokens that will automatically trigger a harvest
-    bool internal forceHarvestTriggerOnce; // only set this to true when we want to trigger our keepers to harvest for us
-
     string internal stratName;
 
-    // convex-specific variables
-    bool public claimRewards; // boolean if we should always claim rewards when withdrawing, usually via withdrawAndUnwrap (generally this should be false)
-
     /* ========== CONSTRUCTOR ========== */
 
     constructor(address _vault) public BaseStrategy(_vault) {}
@@ -176,10 +173,15 @@ abstract contract StrategyConvexBase is BaseStrategy {
         if (emergencyExit) {
             return;
         }
-        // Send all of our Curve pool tokens to be deposited
-        uint256 _toInvest = balanceOfWant();
-        // deposit into convex and stake immediately (but only if we have something to invest)
-        if (_toInvest > 0) {
+        // Send our Curve pool tokens to be deposited, keeping our idle buffer loose
+        uint256 _wantBal = balanceOfWant();
+        uint256 _idleBuffer = idleBuffer;
+        if (_wantBal <= _idleBuffer) {
+            return;
+        }
+        uint256 _toInvest = _wantBal - _idleBuffer;
+        // deposit into convex and stake immediately (but only if we have enough to be worth the gas)
+        if (_toInvest > minDeposit) {
             IConvexDeposit(depositContract).deposit(pid, _toInvest, true);
         }
     }
@@ -193,8 +195,12 @@ abstract contract StrategyConvexBase is BaseStrategy {
         if (_amountNeeded > _wantBal) {
             uint256 _stakedBal = stakedBalance();
             if (_stakedBal > 0) {
+                // since we're unstaking anyway, refill our idle buffer with the same call
                 rewardsContract.withdrawAndUnwrap(
-                    Math.min(_stakedBal, _amountNeeded.sub(_wantBal)),
+                    Math.min(
+                        _stakedBal,
+                        _amountNeeded.sub(_wantBal).add(idleBuffer)
+                    ),
                     claimRewards
                 );
             }
@@ -246,8 +252,8 @@ abstract contract StrategyConvexBase is BaseStrategy {
         address _keepCVXDestination
     ) external onlyGovernance {
         require(_keepCRV <= 10_000 && _keepCVX <= 10_000);
-        keepCRV = _keepCRV;
-        keepCVX = _keepCVX;
+        keepCRV = uint16(_keepCRV);
+        keepCVX = uint16(_keepCVX);
         keepCVXDestination = _keepCVXDestination;
     }
 
@@ -263,24 +269,52 @@ abstract contract StrategyConvexBase is BaseStrategy {
     {
         forceHarvestTriggerOnce = _forceHarvestTriggerOnce;
     }
+
+    /**
+     * @notice
+     * Set how we batch deposits to convex and keep want on hand for
+     * withdrawals. Both are in want, and both default to zero.
+     * @param _minDeposit Loose want (above our idle buffer) needs to be more
+     * than this before we deposit it, so dust and small profits wait to be
+     * deposited together.
+     * @param _idleBuffer Want we keep loose to serve withdrawals without
+     * unstaking. Withdrawals bigger than this unstake enough to refill it.
+     */
+    function setDepositParams(uint256 _minDeposit, uint256 _idleBuffer)
+        external
+        onlyVaultManagers
+    {
+        minDeposit = _minDeposit.toUint128();
+        idleBuffer = _idleBuffer.toUint128();
+    }
 }
 
 contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
     /* ========== STATE VARIABLES ========== */
     // these will likely change across different wants.
 
-    // Curve stuff
+    // Curve stuff, packed into one slot with the flags we check on every harvest and harvestTrigger
     address public curve; // Curve Pool, this is our pool specific to this vault
     ICurveFi internal constant zapContract =
         ICurveFi(0xA79828DF1850E8a3A3064576f380D90aECDD3359); // this is used for depositing to all 3Crv metapools
 
     bool public checkEarmark; // this determines if we should check if we need to earmark rewards before harvesting
+    bool public hasRewards;
+    bool internal isOriginal = true; // check for cloning
+    bool public useCurveRoute; // make our WETH -> USDT swap on curve's tricrypto2 instead of UniV3 (same hop, other venue)
 
     // use Curve to sell our CVX and CRV rewards to WETH
     ICurveFi internal constant crveth =
         ICurveFi(0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511); // use curve's new CRV-ETH crypto pool to sell our CRV
     ICurveFi internal constant cvxeth =
         ICurveFi(0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4); // use curve's new CVX-ETH crypto pool to sell our CVX
+    ICurveFi internal constant tricrypto =
+        ICurveFi(0xD51a44d3FaE010294C616388b506AcdA1bfAAE46); // curve's USDT-WBTC-WETH pool, used if useCurveRoute is on
+
+    // we skip claiming or selling anything below these amounts, so we don't waste gas on dust (or revert swapping it)
+    uint80 public minCrvToSell; // also the least claimable CRV we'll bother claiming, unless we have bonus rewards
+    uint80 public minCvxToSell;
+    uint80 public minWethToSell;
 
     // we use these to deposit to our curve pool
     address public targetStable;
@@ -293,14 +327,20 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
     IERC20 internal constant dai =
         IERC20(0x6B175474E89094C44Da98b954EedeAC495271d0F);
     uint24 public uniStableFee; // this is equal to 0.05%, can change this later if a different path becomes more optimal
+    uint16 public maxSlippage; // if set, the most our CRV, CVX and WETH swaps can fall short of our oracles (in basis points)
 
-    // rewards token info. we can have more than 1 reward token but this is rare, so we don't include this in the template
+    // rewards token info. rewardsToken and virtualRewardsPool are our first bonus reward; rewardsPairs holds every bonus
+    // reward we claim and sell, each as its token and virtual rewards pool packed back to back (40 bytes a pair)
     IERC20 public rewardsToken;
-    bool public hasRewards;
-    address[] internal rewardsPath;
+    bytes internal rewardsPairs;
+    // the least WETH we'll take on sushiswap for 1e18 of each bonus reward token (in its own decimals), set by managers
+    mapping(address => uint256) public minRewardsPrice;
 
-    // check for cloning
-    bool internal isOriginal = true;
+    // if set, this contract can claim our CRV and CVX to sell together with other strategies' (see PooledSeller)
+    address public pooledSeller;
+
+    // if set, we read our prices and base fee check through this, which caches them once per block (see PriceSnapshot)
+    IPriceSnapshot public priceSnapshot;
 
     /* ========== CONSTRUCTOR ========== */
 
@@ -423,6 +463,11 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
 
         // set our uniswap pool fees
         uniStableFee = 500;
+
+        // don't claim or sell less than 0.1 CRV or CVX, or 0.001 WETH
+        minCrvToSell = 1e17;
+        minCvxToSell = 1e17;
+        minWethToSell = 1e15;
     }
 
     /* ========== MUTATIVE FUNCTIONS ========== */
@@ -436,37 +481,18 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
             uint256 _debtPayment
         )
     {
-        // this claims our CRV, CVX, and any extra tokens like SNX or ANKR. no harm leaving this true even if no extra rewards currently.
-        rewardsContract.getReward(address(this), true);
-
-        uint256 crvBalance = crv.balanceOf(address(this));
-        uint256 convexBalance = convexToken.balanceOf(address(this));
-
-        uint256 _sendToVoter = crvBalance.mul(keepCRV).div(FEE_DENOMINATOR);
-        if (_sendToVoter > 0) {
-            crv.safeTransfer(voter, _sendToVoter);
-            crvBalance = crv.balanceOf(address(this));
-        }
-
-        uint256 _cvxToKeep = convexBalance.mul(keepCVX).div(FEE_DENOMINATOR);
-        if (_cvxToKeep > 0) {
-            convexToken.safeTransfer(keepCVXDestination, _cvxToKeep);
-            convexBalance = convexToken.balanceOf(address(this));
-        }
+        (uint256 crvBalance, uint256 convexBalance) = _claimAndKeep();
 
-        // claim and sell our rewards if we have them
+        // sell our bonus rewards to WETH if we have them, so they go to stables in one swap with our CRV and CVX
         if (hasRewards) {
-            uint256 _rewardsBalance =
-                IERC20(rewardsToken).balanceOf(address(this));
-            if (_rewardsBalance > 0) {
-                _sellRewards(_rewardsBalance);
-            }
+            _sellRewards();
         }
 
         // do this even if we have zero balances so we can sell WETH from rewards
         _sellCrvAndCvx(crvBalance, convexBalance);
 
-        // check for balances of tokens to deposit
+        // check for balances of tokens to deposit. we don't only check what we just bought, so stables from donations
+        // or an earlier harvest get deposited too.
         uint256 _daiBalance = dai.balanceOf(address(this));
         uint256 _usdcBalance = usdc.balanceOf(address(this));
         uint256 _usdtBalance = usdt.balanceOf(address(this));
@@ -480,35 +506,40 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
             );
         }
 
+        // serious loss should never happen, but if it does (for instance, if Curve is hacked), let's record it accurately.
+        // unstaking doesn't change our assets, so we can do this before we pay any debt. (scoped to keep our stack short)
+        {
+            uint256 assets = estimatedTotalAssets();
+            uint256 debt = vault.strategies(address(this)).totalDebt;
+            if (assets > debt) {
+                // if assets are greater than debt, things are working great!
+                _profit = assets.sub(debt);
+            } else {
+                // if assets are less than debt, we are in trouble
+                _loss = debt.sub(assets);
+            }
+        }
+
         // debtOustanding will only be > 0 in the event of revoking or if we need to rebalance from a withdrawal or lowering the debtRatio
         if (_debtOutstanding > 0) {
+            // like liquidatePosition, pay from our loose want first. the vault takes our profit too, so only unstake what
+            // that and our debt need on top of what we have, plus what keeps our idle buffer full.
+            uint256 _needed = _profit.add(_debtOutstanding).add(idleBuffer);
+            uint256 _wantBal = balanceOfWant();
             uint256 _stakedBal = stakedBalance();
-            if (_stakedBal > 0) {
+            if (_needed > _wantBal && _stakedBal > 0) {
                 rewardsContract.withdrawAndUnwrap(
-                    Math.min(_stakedBal, _debtOutstanding),
+                    Math.min(_stakedBal, _needed.sub(_wantBal)),
                     claimRewards
                 );
             }
-            uint256 _withdrawnBal = balanceOfWant();
-            _debtPayment = Math.min(_debtOutstanding, _withdrawnBal);
+            _debtPayment = Math.min(_debtOutstanding, balanceOfWant());
         }
 
-        // serious loss should never happen, but if it does (for instance, if Curve is hacked), let's record it accurately
-        uint256 assets = estimatedTotalAssets();
-        uint256 debt = vault.strategies(address(this)).totalDebt;
-
-        // if assets are greater than debt, things are working great!
-        if (assets > debt) {
-            _profit = assets.sub(debt);
-            uint256 _wantBal = balanceOfWant();
-            if (_profit.add(_debtPayment) > _wantBal) {
-                // this should only be hit following donations to strategy
-                liquidateAllPositions();
-            }
-        }
-        // if assets are less than debt, we are in trouble
-        else {
-            _loss = debt.sub(assets);
+        // make sure we can pay out our profit too
+        if (_profit.add(_debtPayment) > balanceOfWant()) {
+            // this should only be hit following donations to strategy
+            liquidateAllPositions();
         }
 
         // we're done harvesting, so reset our trigger if we used it
@@ -529,48 +560,166 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
         );
     }
 
-    // Sells our CRV and CVX on Curve, then WETH -> stables together on UniV3
+    // Claims our rewards and sends out our keepCRV and keepCVX. Returns the CRV and CVX we have left to sell.
+    function _claimAndKeep()
+        internal
+        returns (uint256 crvBalance, uint256 convexBalance)
+    {
+        // this claims our CRV, CVX, and any extra tokens like SNX or ANKR. no harm leaving this true even if no extra rewards currently.
+        // skip it if we'd only claim dust, like on harvests that just rebalance debt
+        if (hasRewards || claimableBalance() > minCrvToSell) {
+            rewardsContract.getReward(address(this), true);
+        }
+
+        crvBalance = crv.balanceOf(address(this));
+        convexBalance = convexToken.balanceOf(address(this));
+
+        uint256 _sendToVoter = crvBalance.mul(keepCRV).div(FEE_DENOMINATOR);
+        if (_sendToVoter > 0) {
+            crv.safeTransfer(voter, _sendToVoter);
+            crvBalance = crv.balanceOf(address(this));
+        }
+
+        uint256 _cvxToKeep = convexBalance.mul(keepCVX).div(FEE_DENOMINATOR);
+        if (_cvxToKeep > 0) {
+            convexToken.safeTransfer(keepCVXDestination, _cvxToKeep);
+            convexBalance = convexToken.balanceOf(address(this));
+        }
+    }
+
+    /// @notice Claim our rewards and send our CRV and CVX to our pooled seller, which sells them together with other
+    /// strategies' and sends us back our share of WETH before harvesting us.
+    function claimForSeller()
+        external
+        returns (uint256 _crvAmount, uint256 _convexAmount)
+    {
+        require(msg.sender == pooledSeller && msg.sender != address(0));
+        (_crvAmount, _convexAmount) = _claimAndKeep();
+        if (_crvAmount > 0) {
+            crv.safeTransfer(msg.sender, _crvAmount);
+        }
+        if (_convexAmount > 0) {
+            convexToken.safeTransfer(msg.sender, _convexAmount);
+        }
+    }
+
+    // Sells our CRV and CVX on Curve, then WETH -> stables together on UniV3 (or on Curve's tricrypto2 for USDT).
     function _sellCrvAndCvx(uint256 _crvAmount, uint256 _convexAmount)
         internal
     {
-        if (_convexAmount > 1e17) {
+        // if we're checking slippage, our minimum outputs come from the same prices we value our claimable profit at.
+        // otherwise these stay zero, and so do our minimum outputs.
+        uint256 _ethPrice;
+        uint256 _crvEthPrice;
+        uint256 _cvxEthPrice;
+        if (maxSlippage > 0) {
+            (_ethPrice, _crvEthPrice, _cvxEthPrice) = _prices();
+        }
+
+        if (_convexAmount > minCvxToSell) {
             // don't want to swap dust or we might revert
-            cvxeth.exchange(1, 0, _convexAmount, 0, false);
+            cvxeth.exchange(
+                1,
+                0,
+                _convexAmount,
+                _minOut(_convexAmount.mul(_cvxEthPrice).div(1e18)),
+                false
+            );
         }
 
-        if (_crvAmount > 1e17) {
+        if (_crvAmount > minCrvToSell) {
             // don't want to swap dust or we might revert
-            crveth.exchange(1, 0, _crvAmount, 0, false);
+            crveth.exchange(
+                1,
+                0,
+                _crvAmount,
+                _minOut(_crvAmount.mul(_crvEthPrice).div(1e18)),
+                false
+            );
         }
 
         uint256 _wethBalance = weth.balanceOf(address(this));
-        if (_wethBalance > 1e15) {
+        if (_wethBalance > minWethToSell) {
+            // chainlink's price has 8 decimals; USDC and USDT have 12 fewer than WETH, DAI has the same
+            uint256 _minStableOut =
+                _minOut(_wethBalance.mul(_ethPrice).div(1e8));
+            if (targetStable != address(dai)) {
+                _minStableOut = _minStableOut.div(1e12);
+            }
+
             // don't want to swap dust or we might revert
-            IUniV3(uniswapv3).exactInput(
-                IUniV3.ExactInputParams(
-                    abi.encodePacked(
-                        address(weth),
-                        uint24(uniStableFee),
-                        address(targetStable)
-                    ),
-                    address(this),
-                    block.timestamp,
-                    _wethBalance,
-                    uint256(1)
-                )
+            if (useCurveRoute) {
+                // WETH is coin 2 and USDT is coin 0 on tricrypto2
+                tricrypto.exchange(2, 0, _wethBalance, _minStableOut, false);
+            } else {
+                IUniV3(uniswapv3).exactInput(
+                    IUniV3.ExactInputParams(
+                        abi.encodePacked(
+                            address(weth),
+                            uint24(uniStableFee),
+                            address(targetStable)
+                        ),
+                        address(this),
+                        block.timestamp,
+                        _wethBalance,
+                        Math.max(_minStableOut, 1)
+                    )
+                );
+            }
+        }
+    }
+
+    // the least we'll accept for a swap we expect to get _expected from, after our maxSlippage
+    function _minOut(uint256 _expected) internal view returns (uint256) {
+        return
+            _expected.mul(FEE_DENOMINATOR.sub(maxSlippage)).div(
+                FEE_DENOMINATOR
             );
+    }
+
+    // Sells each of our bonus reward tokens to WETH on sushiswap. CRV and CVX rewards were claimed into the balances
+    // _claimAndKeep returned, so they're sold on Curve with the rest. there's no oracle for an arbitrary reward token,
+    // and our WETH -> stables minimum is taken from the WETH this buys, so it doesn't bound this leg. each sale is
+    // only as safe as the minRewardsPrice floor managers set for its token; with no floor, we take what we're given.
+    function _sellRewards() internal {
+        bytes memory _pairs = rewardsPairs;
+        address[] memory _path = new address[](2);
+        _path[1] = address(weth);
+        for (uint256 i = 0; i < _pairs.length / 40; i++) {
+            (address _token, ) = _rewardsPairAt(_pairs, i);
+            if (_isCrvOrCvx(_token)) {
+                continue;
+            }
+            uint256 _balance = IERC20(_token).balanceOf(address(this));
+            if (_balance > 0) {
+                _path[0] = _token;
+                IUniswapV2Router02(sushiswap).swapExactTokensForTokens(
+                    _balance,
+                    _balance.mul(minRewardsPrice[_token]).div(1e18),
+                    _path,
+                    address(this),
+                    block.timestamp
+                );
+            }
         }
     }
 
-    // Sells our harvested reward token into the selected output.
-    function _sellRewards(uint256 _amount) internal {
-        IUniswapV2Router02(sushiswap).swapExactTokensForTokens(
-            _amount,
-            uint256(0),
-            rewardsPath,
-            address(this),
-            block.timestamp
-        );
+    // our i-th bonus reward token and the virtual rewards pool it comes from
+    function _rewardsPairAt(bytes memory _pairs, uint256 _i)
+        internal
+        pure
+        returns (address _token, address _pool)
+    {
+        assembly {
+            let _pair := add(add(_pairs, 0x20), mul(_i, 40))
+            _token := shr(96, mload(_pair))
+            _pool := shr(96, mload(add(_pair, 20)))
+        }
+    }
+
+    // some pools pay extra CRV or CVX, which we sell (and value) like the rest of our CRV and CVX
+    function _isCrvOrCvx(address _token) internal pure returns (bool) {
+        return _token == address(crv) || _token == address(convexToken);
     }
 
     /* ========== KEEP3RS ========== */
@@ -656,35 +805,90 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
         }
 
         // our chainlink oracle returns prices normalized to 8 decimals, we convert it to 6
-        IOracle ethOracle = IOracle(0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419);
-        uint256 ethPrice = ethOracle.latestAnswer().div(1e2); // 1e8 div 1e2 = 1e6
-        uint256 crvPrice = crveth.price_oracle().mul(ethPrice).div(1e18); // 1e18 mul 1e6 div 1e18 = 1e6
-        uint256 cvxPrice = cvxeth.price_oracle().mul(ethPrice).div(1e18); // 1e18 mul 1e6 div 1e18 = 1e6
+        (uint256 ethPrice, uint256 crvEthPrice, uint256 cvxEthPrice) =
+            _prices();
+        ethPrice = ethPrice.div(1e2); // 1e8 div 1e2 = 1e6
+        uint256 crvPrice = crvEthPrice.mul(ethPrice).div(1e18); // 1e18 mul 1e6 div 1e18 = 1e6
+        uint256 cvxPrice = cvxEthPrice.mul(ethPrice).div(1e18); // 1e18 mul 1e6 div 1e18 = 1e6
 
         uint256 crvValue = crvPrice.mul(_claimableBal).div(1e18); // 1e6 mul 1e18 div 1e18 = 1e6
         uint256 cvxValue = cvxPrice.mul(mintableCvx).div(1e18); // 1e6 mul 1e18 div 1e18 = 1e6
 
-        // get the value of our rewards token if we have one
+        // get the value of our bonus rewards if we have them
         uint256 rewardsValue;
         if (hasRewards) {
-            address[] memory usd_path = new address[](3);
-            usd_path[0] = address(rewardsToken);
-            usd_path[1] = address(weth);
-            usd_path[2] = address(usdt);
-
-            uint256 _claimableBonusBal =
-                IConvexRewards(virtualRewardsPool).earned(address(this));
-            if (_claimableBonusBal > 0) {
-                uint256[] memory rewardSwap =
+            rewardsValue = _claimableRewardsValue(ethPrice, crvPrice, cvxPrice);
+        }
+
+        return crvValue.add(cvxValue).add(rewardsValue);
+    }
+
+    // the value of our claimable bonus rewards, with prices in USDT (6 decimals). extra CRV and CVX are valued at our
+    // prices; everything else is quoted in WETH on sushiswap, and we value that WETH all at once at our ETH price.
+    function _claimableRewardsValue(
+        uint256 _ethPrice,
+        uint256 _crvPrice,
+        uint256 _cvxPrice
+    ) internal view returns (uint256 _value) {
+        bytes memory _pairs = rewardsPairs;
+        address[] memory _path = new address[](2);
+        _path[1] = address(weth);
+        uint256 _wethValue;
+        for (uint256 i = 0; i < _pairs.length / 40; i++) {
+            (address _token, address _pool) = _rewardsPairAt(_pairs, i);
+            uint256 _earned = IConvexRewards(_pool).earned(address(this));
+            if (_earned == 0) {
+                continue;
+            }
+            if (_token == address(crv)) {
+                _value = _value.add(_crvPrice.mul(_earned).div(1e18));
+            } else if (_token == address(convexToken)) {
+                _value = _value.add(_cvxPrice.mul(_earned).div(1e18));
+            } else {
+                _path[0] = _token;
+                _wethValue = _wethValue.add(
                     IUniswapV2Router02(sushiswap).getAmountsOut(
-                        _claimableBonusBal,
-                        usd_path
-                    );
-                rewardsValue = rewardSwap[rewardSwap.length - 1];
+                        _earned,
+                        _path
+                    )[1]
+                );
             }
         }
+        _value = _value.add(_ethPrice.mul(_wethValue).div(1e18)); // 1e6 mul 1e18 div 1e18 = 1e6
+    }
 
-        return crvValue.add(cvxValue).add(rewardsValue);
+    /// @notice Every bonus reward we claim and sell: its token, and the virtual rewards pool it comes from.
+    function allRewards()
+        external
+        view
+        returns (address[] memory _tokens, address[] memory _pools)
+    {
+        bytes memory _pairs = rewardsPairs;
+        uint256 _length = _pairs.length / 40;
+        _tokens = new address[](_length);
+        _pools = new address[](_length);
+        for (uint256 i = 0; i < _length; i++) {
+            (_tokens[i], _pools[i]) = _rewardsPairAt(_pairs, i);
+        }
+    }
+
+    // chainlink's ETH price (8 decimals), and curve's CRV and CVX prices in ETH (18 decimals)
+    function _prices()
+        internal
+        view
+        returns (
+            uint256 _ethPrice,
+            uint256 _crvEthPrice,
+            uint256 _cvxEthPrice
+        )
+    {
+        if (address(priceSnapshot) != address(0)) {
+            return priceSnapshot.prices();
+        }
+        _ethPrice = IOracle(0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419)
+            .latestAnswer();
+        _crvEthPrice = crveth.price_oracle();
+        _cvxEthPrice = cvxeth.price_oracle();
     }
 
     // convert our keeper's eth cost into want, we don't need this anymore since we don't use baseStrategy harvestTrigger
@@ -697,6 +901,9 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
 
     // check if the current baseFee is below our external target
     function isBaseFeeAcceptable() internal view returns (bool) {
+        if (address(priceSnapshot) != address(0)) {
+            return priceSnapshot.isCurrentBaseFeeAcceptable();
+        }
         return
             IBaseFee(0xb5e1CAcB567d98faaDB60a1fD4820720141f064F)
                 .isCurrentBaseFeeAcceptable();
@@ -710,9 +917,13 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
             return true;
         } else if (hasRewards) {
             // check if there is any bonus reward we need to earmark
-            uint256 rewardsExpiry =
-                IConvexRewards(virtualRewardsPool).periodFinish();
-            return rewardsExpiry < block.timestamp;
+            bytes memory _pairs = rewardsPairs;
+            for (uint256 i = 0; i < _pairs.length / 40; i++) {
+                (, address _pool) = _rewardsPairAt(_pairs, i);
+                if (IConvexRewards(_pool).periodFinish() < block.timestamp) {
+                    return true;
+                }
+            }
         }
     }
 
@@ -722,6 +933,8 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
 
     /// @notice Set optimal token to sell harvested funds for depositing to Curve.
     function setOptimal(uint256 _optimal) external onlyVaultManagers {
+        // our curve route only sells to USDT
+        require(!useCurveRoute || _optimal == 2, "curve route is USDT only");
         if (_optimal == 0) {
             targetStable = address(dai);
         } else if (_optimal == 1) {
@@ -733,31 +946,55 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
         }
     }
 
-    /// @notice Use to update, add, or remove extra rewards tokens.
+    /// @notice Use to update, add, or remove extra rewards tokens. This sets one bonus reward, the one at
+    /// _rewardsIndex in our rewardsContract's extraRewards; use updateAllRewards() to sell all of them.
     function updateRewards(bool _hasRewards, uint256 _rewardsIndex)
         external
         onlyGovernance
     {
-        if (
-            address(rewardsToken) != address(0) &&
-            address(rewardsToken) != address(convexToken)
-        ) {
-            rewardsToken.approve(sushiswap, uint256(0));
-        }
-        if (_hasRewards == false) {
-            hasRewards = false;
-            rewardsToken = IERC20(address(0));
-            virtualRewardsPool = address(0);
-        } else {
-            // update with our new token. get this via our virtualRewardsPool
-            virtualRewardsPool = rewardsContract.extraRewards(_rewardsIndex);
-            address _rewardsToken =
-                IConvexRewards(virtualRewardsPool).rewardToken();
-            rewardsToken = IERC20(_rewardsToken);
-
-            // approve, setup our path, and turn on rewards
-            rewardsToken.approve(sushiswap, type(uint256).max);
-            rewardsPath = [address(rewardsToken), address(weth)];
+        _clearRewards();
+        if (_hasRewards) {
+            _addRewards(_rewardsIndex);
+        }
+    }
+
+    /// @notice Claim and sell every extra reward our rewardsContract has. Turns off rewards if it has none.
+    function updateAllRewards() external onlyGovernance {
+        _clearRewards();
+        uint256 _length = rewardsContract.extraRewardsLength();
+        for (uint256 i = 0; i < _length; i++) {
+            _addRewards(i);
+        }
+    }
+
+    // revoke our approvals and forget all of our bonus rewards
+    function _clearRewards() internal {
+        bytes memory _pairs = rewardsPairs;
+        for (uint256 i = 0; i < _pairs.length / 40; i++) {
+            (address _token, ) = _rewardsPairAt(_pairs, i);
+            if (!_isCrvOrCvx(_token)) {
+                IERC20(_token).approve(sushiswap, uint256(0));
+            }
+        }
+        delete rewardsPairs;
+        hasRewards = false;
+        rewardsToken = IERC20(address(0));
+        virtualRewardsPool = address(0);
+    }
+
+    // add extraRewards(_rewardsIndex) to our bonus rewards. the first one we add is also our rewardsToken.
+    function _addRewards(uint256 _rewardsIndex) internal {
+        // get our token via its virtual rewards pool
+        address _pool = rewardsContract.extraRewards(_rewardsIndex);
+        address _token = IConvexRewards(_pool).rewardToken();
+        if (!_isCrvOrCvx(_token)) {
+            IERC20(_token).approve(sushiswap, type(uint256).max);
+        }
+        rewardsPairs = abi.encodePacked(rewardsPairs, _token, _pool);
+
+        if (!hasRewards) {
+            rewardsToken = IERC20(_token);
+            virtualRewardsPool = _pool;
             hasRewards = true;
         }
     }
@@ -780,12 +1017,91 @@ contract StrategyConvex3CrvRewardsClonable is StrategyConvexBase {
         uint256 _creditThreshold,
         bool _checkEarmark
     ) external onlyVaultManagers {
-        harvestProfitMin = _harvestProfitMin;
-        harvestProfitMax = _harvestProfitMax;
-        creditThreshold = _creditThreshold;
+        harvestProfitMin = _harvestProfitMin.toUint64();
+        harvestProfitMax = _harvestProfitMax.toUint64();
+        creditThreshold = _creditThreshold.toUint128();
         checkEarmark = _checkEarmark;
     }
 
+    /// @notice Make our WETH -> USDT swap on Curve's tricrypto2 instead of UniV3. This is the same hop on another venue,
+    /// not a shorter route, so use whichever fills better (see our route benchmark). This also sets USDT as our targetStable.
+    function setUseCurveRoute(bool _useCurveRoute) external onlyVaultManagers {
+        if (_useCurveRoute) {
+            targetStable = address(usdt);
+            weth.approve(address(tricrypto), type(uint256).max);
+        } else {
+            weth.approve(address(tricrypto), 0);
+        }
+        useCurveRoute = _useCurveRoute;
+    }
+
+    /**
+     * @notice
+     * Set the smallest amounts we'll bother claiming or selling on harvests.
+     * @param _minCrvToSell CRV we need before selling it. Unless we have
+     * bonus rewards, we also skip claiming if our claimable CRV is below this.
+     * @param _minCvxToSell CVX we need before selling it.
+     * @param _minWethToSell WETH we need before swapping it to stables and
+     * depositing to Curve.
+     */
+    function setDustThresholds(
+        uint256 _minCrvToSell,
+        uint256 _minCvxToSell,
+        uint256 _minWethToSell
+    ) external onlyVaultManagers {
+        minCrvToSell = _toUint80(_minCrvToSell);
+        minCvxToSell = _toUint80(_minCvxToSell);
+        minWethToSell = _toUint80(_minWethToSell);
+    }
+
+    // SafeCast has no uint80 downcast, so this is one that works like its others
+    function _toUint80(uint256 _value) internal pure returns (uint80) {
+        require(_value < 2**80, "SafeCast: value doesn't fit in 80 bits");
+        return uint80(_value);
+    }
+
+    /// @notice Let a PooledSeller claim and sell our CRV and CVX. It also needs to be our keeper. Set to zero to turn off.
+    function setPooledSeller(address _pooledSeller) external onlyGovernance {
+        pooledSeller = _pooledSeller;
+    }
+
+    /// @notice Read our prices and base fee check through a PriceSnapshot. Set to zero to read the oracles directly.
+    function setPriceSnapshot(address _priceSnapshot)
+        external
+        onlyVaultManagers
+    {
+        priceSnapshot = IPriceSnapshot(_priceSnapshot);
+    }
+
+    /**
+     * @notice
+     * Set how far below our oracle prices our CRV, CVX and WETH swaps can
+     * fill before our harvest reverts. Set to zero to turn this off.
+     * @param _maxSlippage Our tolerance, in basis points. Curve's price
+     * oracles are moving averages, so leave room for their lag and our swap
+     * fees on top of the slippage we'll accept.
+     */
+    function setMaxSlippage(uint256 _maxSlippage) external onlyVaultManagers {
+        require(_maxSlippage < FEE_DENOMINATOR);
+        maxSlippage = uint16(_maxSlippage);
+    }
+
+    /**
+     * @notice
+     * Set the least WETH we'll accept for a bonus reward token when we sell
+     * it on sushiswap. Set to zero to take whatever sushiswap gives us.
+     * @param _token The bonus reward token.
+     * @param _minPrice WETH (in wei) per 1e18 of _token, in _token's own
+     * decimals. Keep it under the market price by at least our swap fee and
+     * whatever slippage we'll accept, or our harvests will revert.
+     */
+    function setMinRewardsPrice(address _token, uint256 _minPrice)
+        external
+        onlyVaultManagers
+    {
+        minRewardsPrice[_token] = _minPrice;
+    }
+
     /// @notice Set the fee pool we'd like to swap through on UniV3 (1% = 10_000)
     function setUniFees(uint24 _stableFee) external onlyVaultManagers {
         uniStableFee = _stableFee;
@@ -0,0 +1,28 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+interface IBaseFee {
+    function isCurrentBaseFeeAcceptable() external view returns (bool);
+}
+
+interface IOracle {
+    function latestAnswer() external view returns (uint256);
+}
+
+interface IPriceSnapshot {
+    function update() external;
+
+    function isCurrent() external view returns (bool);
+
+    function prices()
+        external
+        view
+        returns (
+            uint256 _ethPrice,
+            uint256 _crvEthPrice,
+            uint256 _cvxEthPrice
+        );
+
+    function isCurrentBaseFeeAcceptable() external view returns (bool);
+}
@@ -0,0 +1,187 @@
+from collections import namedtuple
+
+import numpy as np
+from brownie import Contract, StrategyConvex3CrvRewardsClonable
+
+from scripts.claimable_profit import CONVEX_TOKEN, CRVETH, CVXETH, ETH_ORACLE
+from scripts.cvx_mint import cvx_per_crv
+from scripts.earned_model import REWARD_POOL_ABI
+
+# how often should we harvest? each harvest compounds our CRV and CVX back into the pool, but costs gas and pays slippage
+# on every swap. this models one year of harvests at a fixed interval in closed form, so a sweep over every pool, TVL and
+# interval we care about is a single broadcast numpy expression instead of a loop.
+#
+# swaps are priced as constant-product pools against the reserves we sell into. curve's crypto pools and UniV3 are
+# more concentrated than that near the current price, so treat our slippage as an upper bound.
+
+SECONDS_PER_YEAR = 31_536_000
+FEE_DENOMINATOR = 10_000
+DEFAULT_HARVEST_GAS = 1_000_000
+DEFAULT_INTERVALS = np.array([1, 3, 6, 12, 24, 48, 72, 168, 336, 504, 720]) * 3600
+DEFAULT_TVLS = np.array([1, 5, 10, 25, 50, 100, 250]) * 1e6
+
+# one convex pool: CRV its rewards contract pays out per second, and the USD value already staked in it
+Pool = namedtuple("Pool", ["name", "crv_per_second", "staked_usd"])
+
+# prices (USD), the reserves we sell into (in each pool's sell-side token), swap fees (as fractions), and gas
+Market = namedtuple(
+    "Market",
+    [
+        "crv_price",
+        "cvx_price",
+        "eth_price",
+        "cvx_per_crv",
+        "crveth_crv_reserve",
+        "cvxeth_cvx_reserve",
+        "stable_weth_reserve",
+        "crveth_fee",
+        "cvxeth_fee",
+        "stable_fee",
+        "gas_price",  # wei, base fee plus tip
+    ],
+)
+
+Result = namedtuple(
+    "Result",
+    [
+        "net_apy",
+        "gross_apr",  # what our rewards would be worth with no keep, fees, slippage or gas, and no compounding
+        "per_harvest",  # USD we compound per harvest, after everything
+        "slippage",  # USD per year lost to swap fees and price impact
+        "gas",  # USD per year spent on harvests
+    ],
+)
+
+
+def _swap(amount, reserve, fee):
+    # what's left of amount (in the token we sell) after a constant-product swap against reserve, and the pool fee
+    return amount * reserve / (reserve + amount) * (1 - fee)
+
+
+def simulate_apy(
+    pool,
+    market,
+    tvl,
+    interval,
+    keep_crv=1000,
+    keep_cvx=0,
+    harvest_gas=DEFAULT_HARVEST_GAS,
+):
+    """
+    Net APY for our depositors from harvesting every `interval` seconds with `tvl` USD in our strategy. Every input
+    broadcasts, so pass arrays shaped to line up and get a Result of arrays back.
+    """
+    tvl = np.asarray(tvl, dtype=float)
+    interval = np.asarray(interval, dtype=float)
+    crv_per_second = np.asarray(pool.crv_per_second, dtype=float)
+
+    # our share of the pool's CRV, counting the dilution from our own deposit
+    share = tvl / (np.asarray(pool.staked_usd, dtype=float) + tvl)
+    crv = crv_per_second * share * interval
+    cvx = crv * market.cvx_per_crv
+    gross = crv * market.crv_price + cvx * market.cvx_price
+
+    # keepCRV goes to our voter and keepCVX to its destination; neither reaches the vault
+    crv_to_sell = crv * (1 - keep_crv / FEE_DENOMINATOR)
+    cvx_to_sell = cvx * (1 - keep_cvx / FEE_DENOMINATOR)
+    weth = (
+        _swap(crv_to_sell, market.crveth_crv_reserve, market.crveth_fee)
+        * market.crv_price
+        + _swap(cvx_to_sell, market.cvxeth_cvx_reserve, market.cvxeth_fee)
+        * market.cvx_price
+    ) / market.eth_price
+    proceeds = (
+        _swap(weth, market.stable_weth_reserve, market.stable_fee) * market.eth_price
+    )
+    sold_value = crv_to_sell * market.crv_price + cvx_to_sell * market.cvx_price
+
+    gas = harvest_gas * market.gas_price / 1e18 * market.eth_price
+    per_harvest = proceeds - gas
+
+    # the same return every interval, compounded over a year. our share of rewards barely moves as we grow, so we
+    # keep it fixed; if gas eats everything we just lose money every harvest.
+    harvests_per_year = SECONDS_PER_YEAR / interval
+    rate = per_harvest / tvl
+    net_apy = np.where(
+        rate > -1, np.power(np.maximum(1 + rate, 0), harvests_per_year) - 1, -1.0
+    )
+    return Result(
+        net_apy,
+        gross * harvests_per_year / tvl,
+        per_harvest,
+        (sold_value - proceeds) * harvests_per_year,
+        gas * harvests_per_year,
+    )
+
+
+def sweep(pools, market, tvls=DEFAULT_TVLS, intervals=DEFAULT_INTERVALS, **kwargs):
+    """
+    simulate_apy() for every pool x TVL x interval at once. Returns the Result (arrays shaped (pools, tvls,
+    intervals)) and the best interval in seconds for each pool and TVL.
+    """
+    crv_per_second = np.array([pool.crv_per_second for pool in pools], dtype=float)
+    staked = np.array([pool.staked_usd for pool in pools], dtype=float)
+    grid = Pool("sweep", crv_per_second[:, None, None], staked[:, None, None])
+    result = simulate_apy(
+        grid,
+        market,
+        np.asarray(tvls, dtype=float)[None, :, None],
+        np.asarray(intervals, dtype=float)[None, None, :],
+        **kwargs,
+    )
+    best = np.asarray(intervals)[np.argmax(result.net_apy, axis=-1)]
+    return result, best
+
+
+def load_pool(strategy):
+    """Our strategy's convex pool as it is right now: its CRV emissions, and what's staked in it (in USD)."""
+    rewards = Contract.from_abi(
+        "RewardPool", strategy.rewardsContract(), REWARD_POOL_ABI
+    )
+    curve = Contract(strategy.curve())
+    # our LPs are stablecoin pools, so a virtual price of 1 is about $1
+    staked_usd = rewards.totalSupply() * curve.get_virtual_price() / 1e36
+    return Pool(strategy.name(), rewards.rewardRate() / 1e18, staked_usd)
+
+
+def load_market(gas_price):
+    """Prices, reserves and fees from our oracles and swap pools right now. gas_price is in wei."""
+    eth_price = Contract(ETH_ORACLE).latestAnswer() / 1e8
+    crveth = Contract(CRVETH)
+    cvxeth = Contract(CVXETH)
+    crv_price = crveth.price_oracle() / 1e18 * eth_price
+    cvx_price = cvxeth.price_oracle() / 1e18 * eth_price
+    return Market(
+        crv_price,
+        cvx_price,
+        eth_price,
+        float(cvx_per_crv(Contract(CONVEX_TOKEN).totalSupply())),
+        crveth.balances(1) / 1e18,
+        cvxeth.balances(1) / 1e18,
+        20_000.0,  # the UniV3 WETH/stable pools are deep and concentrated, so call it 20k WETH of effective depth
+        crveth.fee() / 1e10,
+        cvxeth.fee() / 1e10,
+        0.0005,
+        gas_price,
+    )
+
+
+def main(*strategies, gas_gwei=50):
+    strategies = [StrategyConvex3CrvRewardsClonable.at(s) for s in strategies]
+    pools = [load_pool(strategy) for strategy in strategies]
+    market = load_market(int(float(gas_gwei) * 1e9))
+    result, best = sweep(
+        pools,
+        market,
+        keep_crv=np.array([s.keepCRV() for s in strategies])[:, None, None],
+        keep_cvx=np.array([s.keepCVX() for s in strategies])[:, None, None],
+    )
+    for i, pool in enumerate(pools):
+        print(f"\n{pool.name}: gross APR {result.gross_apr[i, 0, 0]:.2%} at $1m")
+        for j, tvl in enumerate(DEFAULT_TVLS):
+            k = int(np.argmax(result.net_apy[i, j]))
+            print(
+                f"  ${tvl / 1e6:,.0f}m: harvest every {best[i, j] / 3600:g}h for "
+                f"{result.net_apy[i, j, k]:.2%} net APY "
+                f"(gas ${result.gas[i, j, k]:,.0f}/yr, slippage ${result.slippage[i, j, k]:,.0f}/yr)"
+            )
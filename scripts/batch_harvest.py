@@ -0,0 +1,91 @@
+import click
+from brownie import (
+    BatchHarvester,
+    StrategyConvex3CrvRewardsClonable,
+    accounts,
+    chain,
+    network,
+)
+
+from scripts.claimable_profit import multicall
+
+# harvest all of our clones that are ready through our BatchHarvester, in a single transaction. run it with
+# `brownie run batch_harvest main <harvester> <strategy> <strategy> ... --network`. on a fork, measure_gas_saved() shows
+# how much each strategy saves compared to harvesting it on its own.
+
+
+def triggered(strategies, block=None):
+    """The strategies whose harvestTrigger(0) is true, all read in one multicall."""
+    _, results = multicall(
+        [(strategy.harvestTrigger, [0]) for strategy in strategies], block
+    )
+    return [strategy for strategy, trigger in zip(strategies, results) if trigger]
+
+
+def harvest_batch(harvester, strategies, keeper):
+    """Harvest a list of strategies in one transaction. Returns the tx, and the gas each harvest used inside it."""
+    tx = harvester.harvest(strategies, {"from": keeper})
+    harvested = (
+        tx.events["StrategyHarvested"] if "StrategyHarvested" in tx.events else []
+    )
+    failed = tx.events["HarvestFailed"] if "HarvestFailed" in tx.events else []
+    for event in failed:
+        print(f"Harvest failed for {event['strategy']}")
+    return tx, {event["strategy"]: event["gasUsed"] for event in harvested}
+
+
+def measure_gas_saved(harvester, strategies, keeper, caller):
+    """
+    Only use this on a fork. Harvests each strategy on its own (from caller, who needs to be allowed to harvest them
+    directly, like gov), undoes those harvests, then harvests them all together from the same state. Returns the gas
+    each strategy used both ways, counting an even share of the batch transaction's overhead against each strategy.
+    """
+    individual = []
+    for strategy in strategies:
+        tx = strategy.harvest({"from": caller})
+        individual.append(tx.gas_used)
+    chain.undo(len(strategies))
+
+    tx, batch_gas = harvest_batch(harvester, strategies, keeper)
+    overhead = (tx.gas_used - sum(batch_gas.values())) // len(strategies)
+    report = []
+    for strategy, gas_used in zip(strategies, individual):
+        batched = batch_gas[strategy.address] + overhead
+        report.append(
+            {
+                "strategy": strategy.address,
+                "individual": gas_used,
+                "batched": batched,
+                "saved": gas_used - batched,
+            }
+        )
+
+    print(f"{'strategy':<44}{'alone':>10}{'batched':>10}{'saved':>10}")
+    for row in report:
+        print(
+            f"{row['strategy']:<44}{row['individual']:>10}{row['batched']:>10}{row['saved']:>10}"
+        )
+    total_saved = sum(row["saved"] for row in report)
+    print(
+        f"Saved {total_saved} gas in total, {total_saved // len(report)} per strategy"
+    )
+    return report, tx
+
+
+def main(harvester_address, *addresses):
+    print(f"You are using the '{network.show_active()}' network")
+    keeper = accounts.load(click.prompt("Keeper", type=click.Choice(accounts.load())))
+    harvester = BatchHarvester.at(harvester_address)
+    strategies = [
+        StrategyConvex3CrvRewardsClonable.at(address) for address in addresses
+    ]
+
+    to_harvest = triggered(strategies)
+    if not to_harvest:
+        print("Nothing to harvest")
+        return
+    print(f"Harvesting {len(to_harvest)} of {len(strategies)} strategies")
+    tx, batch_gas = harvest_batch(harvester, to_harvest, keeper)
+    for strategy, gas_used in batch_gas.items():
+        print(f"{strategy}: {gas_used} gas")
+    print(f"Total: {tx.gas_used} gas")
@@ -0,0 +1,193 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+from brownie import Contract, StrategyConvex3CrvRewardsClonable
+from eth_utils import to_checksum_address
+
+from scripts.claimable_profit import ETH_ORACLE
+from scripts.event_store import DEFAULT_PATH, EventStore
+
+# how much want should we keep loose with setDepositParams()? any withdrawal bigger than our loose want makes
+# liquidatePosition() unstake from convex, which costs our depositors gas; whatever we keep loose earns nothing. we read
+# our vault's Withdraw events from the event store, fit their sizes, and replay them against a grid of buffer sizes at
+# once (each size is one lane of a numpy array), following what the strategy does: a withdrawal our loose want covers
+# just spends it, a bigger one unstakes and refills the buffer, and a harvest tops it back up.
+#
+# we assume every withdrawal reaches us. if our vault keeps its own idle funds or we're not first in its withdrawal
+# queue, pass share= for the fraction of each withdrawal that makes it to us.
+
+SECONDS_PER_YEAR = 31_536_000
+# what withdrawAndUnwrap() adds to a withdrawal. compare liquidatePosition_small between the default and idle_buffer
+# configs of our gas benchmark for the real number on a pool.
+DEFAULT_UNSTAKE_GAS = 200_000
+
+Withdrawals = namedtuple(
+    "Withdrawals",
+    [
+        "timestamps",  # seconds
+        "amounts",  # want, in its smallest unit
+    ],
+)
+
+Costs = namedtuple(
+    "Costs",
+    [
+        "idle_buffer",
+        "total",  # everything below is in want, over the whole series
+        "gas",
+        "idle",  # yield we gave up on loose want
+        "unstakes",
+    ],
+)
+
+
+def load_withdrawals(store, vault, start_block=0, share=1.0):
+    """Every Withdraw from our vault in the store since start_block, oldest first."""
+    rows = store.query(
+        """
+        SELECT b.timestamp, CAST(w.amount AS REAL) AS amount
+        FROM withdrawals w JOIN blocks b ON b.number = w.block
+        WHERE w.vault = ? AND w.block >= ?
+        ORDER BY w.block, w.log_index
+        """,
+        (to_checksum_address(vault), start_block),
+    )
+    return Withdrawals(
+        np.array([row["timestamp"] for row in rows], dtype=float),
+        np.array([row["amount"] for row in rows], dtype=float) * share,
+    )
+
+
+def load_refills(store, strategy):
+    """Timestamps of our strategy's harvests, which top our buffer back up."""
+    return np.array([row["timestamp"] for row in store.harvests(strategy)], dtype=float)
+
+
+def fit_lognormal(amounts):
+    """Fit withdrawal sizes to a lognormal, returning (mu, sigma) of their log. Zero-size withdrawals are ignored."""
+    logs = np.log(np.asarray(amounts, dtype=float)[np.asarray(amounts) > 0])
+    return float(logs.mean()), float(max(logs.std(), 1e-9))
+
+
+def exceedance(buffer, mu, sigma):
+    """How likely our fitted distribution says a single withdrawal is to be bigger than a full buffer."""
+    if buffer <= 0:
+        return 1.0
+    return 0.5 * math.erfc((math.log(buffer) - mu) / (sigma * math.sqrt(2)))
+
+
+def candidate_buffers(withdrawals, count=60, window=86400):
+    """
+    Zero, plus buffers spaced evenly in log from our fit's 10th percentile withdrawal up to the most that's ever been
+    withdrawn within `window` seconds (or our fit's 99.9th percentile, if that's bigger). A buffer drains over many
+    withdrawals, so the best one is usually well above any single withdrawal.
+    """
+    mu, sigma = fit_lognormal(withdrawals.amounts)
+    timestamps = np.asarray(withdrawals.timestamps, dtype=float)
+    total = np.concatenate([[0.0], np.cumsum(withdrawals.amounts)])
+    window_start = np.searchsorted(timestamps, timestamps - window)
+    busiest = (total[1:] - total[window_start]).max()
+    return np.concatenate(
+        [
+            [0.0],
+            np.geomspace(
+                math.exp(mu - 1.2816 * sigma),
+                max(math.exp(mu + 3.0902 * sigma), busiest),
+                count,
+            ),
+        ]
+    )
+
+
+def unstake_cost(
+    gas_price, eth_price, want_price=1.0, decimals=18, unstake_gas=DEFAULT_UNSTAKE_GAS
+):
+    """One unstake's gas in want. gas_price is in wei, prices in USD."""
+    return unstake_gas * gas_price / 1e18 * eth_price / want_price * 10 ** decimals
+
+
+def simulate_buffers(withdrawals, buffers, apr, cost, refills=()):
+    """
+    Replay our withdrawals once for every buffer size, and total what each costs us: gas (cost per unstake, in want)
+    plus the yield (apr, as a fraction) our loose want would have earned. Returns Costs.
+    """
+    buffers = np.asarray(buffers, dtype=float)
+    timestamps = np.asarray(withdrawals.timestamps, dtype=float)
+    amounts = np.asarray(withdrawals.amounts, dtype=float)
+    gaps = np.diff(timestamps, prepend=timestamps[:1])
+    # whether we harvested between each withdrawal and the one before it
+    harvested = np.searchsorted(
+        np.sort(np.asarray(refills, dtype=float)), timestamps, side="right"
+    )
+    refilled = np.diff(harvested, prepend=harvested[:1]) > 0
+
+    level = buffers.copy()
+    held = np.zeros(len(buffers))  # loose want x seconds
+    unstakes = np.zeros(len(buffers), dtype=int)
+    for i in range(len(amounts)):
+        if refilled[i]:
+            level = buffers.copy()
+        held += level * gaps[i]
+        # liquidatePosition only unstakes when our loose want can't cover the whole withdrawal, and then refills
+        unstake = amounts[i] > level
+        level = np.where(unstake, buffers, level - amounts[i])
+        unstakes += unstake
+
+    gas = unstakes * cost
+    idle = held * apr / SECONDS_PER_YEAR
+    return Costs(buffers, gas + idle, gas, idle, unstakes)
+
+
+def recommend(withdrawals, apr, cost, refills=(), buffers=None):
+    """The buffer with the lowest total cost (an int, in want), plus the Costs for every buffer we tried."""
+    if buffers is None:
+        buffers = candidate_buffers(withdrawals)
+    costs = simulate_buffers(withdrawals, buffers, apr, cost, refills)
+    return int(costs.idle_buffer[np.argmin(costs.total)]), costs
+
+
+def main(vault, strategy, path=DEFAULT_PATH, gas_gwei=30, apr=None, share=1.0):
+    strategy = StrategyConvex3CrvRewardsClonable.at(strategy)
+    vault = Contract(vault)
+    store = EventStore(path)
+    withdrawals = load_withdrawals(store, vault, share=float(share))
+    refills = load_refills(store, strategy)
+    if apr is None:
+        aprs = {row["strategy"]: row["apr"] for row in store.strategy_aprs(vault)}
+        apr = aprs[strategy.address]
+    store.close()
+
+    decimals = vault.decimals()
+    cost = unstake_cost(
+        float(gas_gwei) * 1e9,
+        Contract(ETH_ORACLE).latestAnswer() / 1e8,
+        decimals=decimals,
+    )
+    mu, sigma = fit_lognormal(withdrawals.amounts)
+    best, costs = recommend(withdrawals, float(apr), cost, refills)
+    current = simulate_buffers(
+        withdrawals, [strategy.idleBuffer()], float(apr), cost, refills
+    )
+    days = (withdrawals.timestamps[-1] - withdrawals.timestamps[0]) / 86400
+    lane = int(np.argmin(costs.total))
+
+    print(f"{len(withdrawals.amounts)} withdrawals over {days:,.0f} days")
+    print(
+        f"Sizes fit a lognormal with median {math.exp(mu) / 10 ** decimals:,.2f} "
+        f"and log std {sigma:.2f}"
+    )
+    print(
+        f"Current buffer {strategy.idleBuffer() / 10 ** decimals:,.2f}: {current.unstakes[0]} unstakes, "
+        f"cost {current.total[0] / 10 ** decimals:,.2f}"
+    )
+    print(
+        f"Best buffer {best / 10 ** decimals:,.2f}: {costs.unstakes[lane]} unstakes, "
+        f"cost {costs.total[lane] / 10 ** decimals:,.2f} "
+        f"(gas {costs.gas[lane] / 10 ** decimals:,.2f}, idle {costs.idle[lane] / 10 ** decimals:,.2f}), "
+        f"{exceedance(best, mu, sigma):.1%} of withdrawals bigger than it"
+    )
+    args = [strategy.minDeposit(), best]
+    print("\nRecommended call:")
+    print(f"strategy.setDepositParams({', '.join(str(arg) for arg in args)})")
+    print(f"  calldata: {strategy.setDepositParams.encode_input(*args)}")
@@ -0,0 +1,145 @@
+import numpy as np
+from brownie import Contract, chain
+
+from scripts.harvest_trigger_sim import (
+    CRV,
+    CVX,
+    bonus_rewards_value,
+    claimable_profit_in_usdt,
+)
+
+# evaluate claimableProfitInUsdt() for many strategies at once. on-chain, every strategy re-reads CVX supply, chainlink's
+# ETH price, and both curve price oracles; here we read those once, batch every strategy's reads into a single
+# multicall at one block, and do the math locally with the same integer rounding as the contract.
+
+MULTICALL2 = "0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696"
+MULTICALL2_ABI = [
+    {
+        "name": "aggregate",
+        "type": "function",
+        "stateMutability": "nonpayable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {"name": "blockNumber", "type": "uint256"},
+            {"name": "returnData", "type": "bytes[]"},
+        ],
+    }
+]
+
+# just what we need from convex's virtual rewards pools
+REWARDS_ABI = [
+    {
+        "name": "earned",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [{"name": "account", "type": "address"}],
+        "outputs": [{"name": "", "type": "uint256"}],
+    }
+]
+
+CONVEX_TOKEN = "0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B"
+ETH_ORACLE = "0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419"
+CRVETH = "0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511"
+CVXETH = "0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4"
+SUSHISWAP = "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F"
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+
+
+def multicall(calls, block=None):
+    """
+    Run a list of (contract method, args) view calls through Multicall2 in one eth_call. Returns the block number
+    they were read at, and the decoded results in order.
+    """
+    if not calls:
+        return block, []
+    aggregator = Contract.from_abi("Multicall2", MULTICALL2, MULTICALL2_ABI)
+    payload = [(method._address, method.encode_input(*args)) for method, args in calls]
+    block_number, return_data = aggregator.aggregate.call(
+        payload, block_identifier=block
+    )
+    results = [
+        method.decode_output(data) for (method, _), data in zip(calls, return_data)
+    ]
+    return block_number, results
+
+
+def claimable_profits(strategies, block=None, prices=None):
+    """
+    claimableProfitInUsdt() for every strategy in the list, all read at the same block. Returns a numpy array of
+    profits (USDT, 6 decimals) in the same order, and the block we read at. Pass prices (ETH price, CRV/ETH and CVX/ETH,
+    like PriceSnapshot.prices() returns) if we already have them for this block, and we'll skip reading the oracles.
+    """
+    convex_token = Contract(CONVEX_TOKEN)
+    eth_oracle = Contract(ETH_ORACLE)
+    crveth = Contract(CRVETH)
+    cvxeth = Contract(CVXETH)
+    if block is None:
+        block = chain.height
+
+    # one multicall for our shared inputs plus each strategy's claimable CRV and rewards setup
+    calls = [(convex_token.totalSupply, [])]
+    if prices is None:
+        calls += [
+            (eth_oracle.latestAnswer, []),
+            (crveth.price_oracle, []),
+            (cvxeth.price_oracle, []),
+        ]
+    for strategy in strategies:
+        calls += [
+            (strategy.claimableBalance, []),
+            (strategy.allRewards, []),
+        ]
+    block, results = multicall(calls, block)
+    shared = 1 if prices is not None else 4
+    cvx_supply = results[0]
+    eth_price, crv_eth_price, cvx_eth_price = prices or results[1:4]
+    per_strategy = [results[i : i + 2] for i in range(shared, len(results), 2)]
+    claimable_crv = [int(claimable) for claimable, _ in per_strategy]
+
+    # strategies with bonus rewards need what they've earned of each first, then sushiswap quotes for the ones that
+    # aren't CRV or CVX, all batched across strategies
+    rewards = [
+        (i, token, Contract.from_abi("VirtualRewardsPool", pool, REWARDS_ABI))
+        for i, (_, (tokens, pools)) in enumerate(per_strategy)
+        for token, pool in zip(tokens, pools)
+    ]
+    _, earned = multicall(
+        [(pool.earned, [strategies[i]]) for i, _, pool in rewards], block
+    )
+    router = Contract(SUSHISWAP)
+    quotes = [
+        (router.getAmountsOut, [amount, [token, WETH]])
+        for (_, token, _), amount in zip(rewards, earned)
+        if amount > 0 and token not in (CRV, CVX)
+    ]
+    _, amounts_out = multicall(quotes, block)
+    amounts_out = iter(amounts_out)
+    by_strategy = [[] for _ in strategies]
+    for (i, token, _), amount in zip(rewards, earned):
+        weth_out = 0
+        if amount > 0 and token not in (CRV, CVX):
+            weth_out = next(amounts_out)[-1]
+        by_strategy[i].append((token, amount, weth_out))
+    rewards_value = [
+        bonus_rewards_value(r, eth_price, crv_eth_price, cvx_eth_price)
+        for r in by_strategy
+    ]
+
+    profits = claimable_profit_in_usdt(
+        claimable_crv,
+        cvx_supply,
+        eth_price,
+        crv_eth_price,
+        cvx_eth_price,
+        rewards_value,
+    )
+    return np.asarray(profits, dtype=object), block
@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+import numpy as np
+
+# CVX's mint schedule, for modeling CVX yield off-chain. the CVX token mints a share of every CRV claimed from convex,
+# and that share drops by 0.1% for every 100k CVX in supply (a "cliff") until supply reaches 100m. our strategy's
+# claimableProfitInUsdt() re-derives this on every call; mintable_cvx() below matches it to the wei.
+
+TOTAL_CLIFFS = 1_000
+MAX_SUPPLY = 100 * 1_000_000 * 10 ** 18  # 100mil
+REDUCTION_PER_CLIFF = 100_000 * 10 ** 18  # 100,000
+
+# float copies for our modeling functions, since numpy can't multiply int64 arrays by ints this large
+_MAX_SUPPLY = float(MAX_SUPPLY)
+_REDUCTION_PER_CLIFF = float(REDUCTION_PER_CLIFF)
+
+
+def as_int_array(values):
+    # numpy object arrays of python ints, so we never overflow int64 or lose precision to floats
+    array = np.asarray(values)
+    if array.dtype == object:
+        return array
+    if array.dtype.kind == "f":
+        return np.vectorize(int, otypes=[object])(array)
+    return array.astype(object)
+
+
+def mintable_cvx(claimable_crv, cvx_supply):
+    """
+    CVX minted for claiming claimable_crv at a given CVX supply (both in wei), exactly as the CVX token and our
+    strategy compute it. Takes scalars or arrays.
+    """
+    claimable_crv = as_int_array(claimable_crv)
+    cvx_supply = as_int_array(cvx_supply)
+    cliff = cvx_supply // REDUCTION_PER_CLIFF
+    minting = cliff < TOTAL_CLIFFS
+    reduction = np.where(minting, as_int_array(TOTAL_CLIFFS - cliff), 0)
+    mintable = claimable_crv * reduction // TOTAL_CLIFFS
+    # supply cap check
+    amount_till_max = np.where(minting, as_int_array(MAX_SUPPLY - cvx_supply), 0)
+    return np.minimum(mintable, amount_till_max)
+
+
+def cvx_per_crv(cvx_supply):
+    """
+    CVX minted per CRV claimed at a given supply (in wei), as floats. Ignores the final supply cap, so use
+    mintable_cvx() when we need exact amounts.
+    """
+    cliff = np.asarray(cvx_supply, dtype=float) // _REDUCTION_PER_CLIFF
+    return np.clip(TOTAL_CLIFFS - cliff, 0, None) / TOTAL_CLIFFS
+
+
+@lru_cache(maxsize=None)
+def _cliff_schedule():
+    # cumulative CRV (in wei, as floats) that must be claimed across convex to mint CVX up to the start of each cliff
+    ratios = np.arange(TOTAL_CLIFFS, 0, -1) / TOTAL_CLIFFS
+    crv_to_cliff = np.concatenate([[0.0], np.cumsum(_REDUCTION_PER_CLIFF / ratios)])
+    return ratios, crv_to_cliff
+
+
+def _crv_claimed_at(cvx_supply):
+    # where a given supply sits on the schedule, measured in cumulative CRV claimed
+    ratios, crv_to_cliff = _cliff_schedule()
+    supply = np.clip(np.asarray(cvx_supply, dtype=float), 0, _MAX_SUPPLY)
+    cliff = np.minimum(supply // _REDUCTION_PER_CLIFF, TOTAL_CLIFFS - 1).astype(int)
+    into_cliff = supply - cliff * _REDUCTION_PER_CLIFF
+    return crv_to_cliff[cliff] + into_cliff / ratios[cliff]
+
+
+def cvx_supply_after(cvx_supply, crv_claimed):
+    """
+    CVX supply after crv_claimed (in wei) more CRV is claimed across all of convex, as floats. Unlike mintable_cvx(),
+    which prices a single claim at today's supply, this walks the supply up through every cliff it crosses, so it's
+    what we want when modeling CVX yield over months of emissions. Takes scalars or arrays, and broadcasts them.
+    """
+    ratios, crv_to_cliff = _cliff_schedule()
+    position = _crv_claimed_at(cvx_supply) + np.asarray(crv_claimed, dtype=float)
+    position = np.minimum(position, crv_to_cliff[-1])
+    cliff = np.searchsorted(crv_to_cliff, position, side="right") - 1
+    cliff = np.clip(cliff, 0, TOTAL_CLIFFS - 1)
+    supply = cliff * _REDUCTION_PER_CLIFF
+    supply = supply + (position - crv_to_cliff[cliff]) * ratios[cliff]
+    return np.minimum(supply, _MAX_SUPPLY)
+
+
+def cvx_minted(cvx_supply, crv_claimed):
+    """CVX minted (in wei, as floats) while crv_claimed more CRV is claimed across convex, starting at cvx_supply."""
+    start = np.clip(np.asarray(cvx_supply, dtype=float), 0, _MAX_SUPPLY)
+    return np.maximum(cvx_supply_after(cvx_supply, crv_claimed) - start, 0)
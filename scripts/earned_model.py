@@ -0,0 +1,193 @@
+from brownie import Contract, chain, web3
+from eth_utils import keccak
+
+from scripts.claimable_profit import multicall
+
+# off-chain copy of the reward math in convex's BaseRewardPool and VirtualBalanceRewardPool (synthetix-style staking
+# rewards), so we can predict earned() for our strategies at any timestamp without an RPC call. we seed each model from
+# the pool's storage once, and only read it again when the pool emits an event that changes that storage.
+
+_uint = [{"name": "", "type": "uint256"}]
+_account = [{"name": "account", "type": "address"}]
+REWARD_POOL_ABI = [
+    {
+        "name": name,
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": inputs,
+        "outputs": _uint,
+    }
+    for name, inputs in [
+        ("rewardRate", []),
+        ("periodFinish", []),
+        ("lastUpdateTime", []),
+        ("rewardPerTokenStored", []),
+        ("rewardPerToken", []),
+        ("totalSupply", []),
+        ("balanceOf", _account),
+        ("userRewardPerTokenPaid", _account),
+        ("rewards", _account),
+        ("earned", _account),
+    ]
+]
+
+# anyone staking or withdrawing changes totalSupply and checkpoints the pool, new rewards change the rate and period,
+# and our own claims reset what we've earned. nothing else touches the storage our model is built from.
+RESYNC_EVENTS = [
+    "Staked(address,uint256)",
+    "Withdrawn(address,uint256)",
+    "RewardAdded(uint256)",
+    "RewardPaid(address,uint256)",
+]
+RESYNC_TOPICS = ["0x" + keccak(text=event).hex() for event in RESYNC_EVENTS]
+
+
+class RewardAccrual:
+    """
+    One account's rewards in one convex rewards pool. earned(timestamp) matches the pool's earned(account) to the wei
+    at any timestamp, as long as nothing has changed the pool's storage since we seeded it.
+    """
+
+    def __init__(
+        self,
+        reward_rate,
+        period_finish,
+        last_update_time,
+        reward_per_token_stored,
+        total_supply,
+        balance,
+        reward_per_token_paid,
+        rewards,
+    ):
+        self.reward_rate = reward_rate
+        self.period_finish = period_finish
+        self.last_update_time = last_update_time
+        self.reward_per_token_stored = reward_per_token_stored
+        self.total_supply = total_supply
+        self.balance = balance
+        self.reward_per_token_paid = reward_per_token_paid
+        self.rewards = rewards
+
+    @staticmethod
+    def calls(pool, account):
+        return [
+            (pool.rewardRate, []),
+            (pool.periodFinish, []),
+            (pool.lastUpdateTime, []),
+            (pool.rewardPerTokenStored, []),
+            (pool.totalSupply, []),
+            (pool.balanceOf, [account]),
+            (pool.userRewardPerTokenPaid, [account]),
+            (pool.rewards, [account]),
+        ]
+
+    @classmethod
+    def from_pool(cls, pool, account, block=None):
+        _, values = multicall(cls.calls(pool, account), block)
+        return cls(*values)
+
+    def reward_per_token(self, timestamp):
+        if self.total_supply == 0:
+            return self.reward_per_token_stored
+        last_time_applicable = min(timestamp, self.period_finish)
+        return (
+            self.reward_per_token_stored
+            + (last_time_applicable - self.last_update_time)
+            * self.reward_rate
+            * 10 ** 18
+            // self.total_supply
+        )
+
+    def earned(self, timestamp):
+        return (
+            self.balance
+            * (self.reward_per_token(timestamp) - self.reward_per_token_paid)
+            // 10 ** 18
+            + self.rewards
+        )
+
+
+class EarnedTracker:
+    """
+    Models earned() for each strategy's rewardsContract, plus the virtual rewards pool of each of its bonus rewards.
+    Call sync() once per new block: it pulls that range's logs from our pools in one request and re-seeds only the
+    pools that emitted something, so a quiet block costs a single eth_getLogs no matter how many strategies we track.
+    """
+
+    def __init__(self, strategies, block=None):
+        if block is None:
+            block = chain.height
+        self.models = {}
+        self.pools = {}
+        calls = []
+        for strategy in strategies:
+            calls += [
+                (strategy.rewardsContract, []),
+                (strategy.allRewards, []),
+            ]
+        _, results = multicall(calls, block)
+        for i, strategy in enumerate(strategies):
+            rewards_contract, (_, virtual_pools) = results[i * 2 : i * 2 + 2]
+            pools = [rewards_contract] + list(virtual_pools)
+            self.pools[strategy.address] = [
+                Contract.from_abi("RewardPool", pool, REWARD_POOL_ABI) for pool in pools
+            ]
+        self.resyncs = 0
+        self._seed(
+            [
+                (pool, strategy)
+                for strategy, pools in self.pools.items()
+                for pool in pools
+            ],
+            block,
+        )
+        self.block = block
+
+    def _seed(self, keys, block):
+        # re-read every (pool, account) in one multicall
+        calls = []
+        for pool, account in keys:
+            calls += RewardAccrual.calls(pool, account)
+        _, values = multicall(calls, block)
+        for i, (pool, account) in enumerate(keys):
+            self.models[(pool.address, account)] = RewardAccrual(
+                *values[i * 8 : (i + 1) * 8]
+            )
+        self.resyncs += len(keys)
+
+    def sync(self, block=None):
+        """Catch up to a block (latest by default). Returns the pools we had to re-seed."""
+        if block is None:
+            block = chain.height
+        if block <= self.block:
+            return set()
+        logs = web3.eth.get_logs(
+            {
+                "address": sorted({address for address, _ in self.models}),
+                "fromBlock": self.block + 1,
+                "toBlock": block,
+                "topics": [RESYNC_TOPICS],
+            }
+        )
+        changed = {log["address"] for log in logs}
+        keys = [
+            (pool, account)
+            for account, pools in self.pools.items()
+            for pool in pools
+            if pool.address in changed
+        ]
+        if keys:
+            self._seed(keys, block)
+        self.block = block
+        return changed
+
+    def earned(self, strategy, timestamp):
+        """Our predicted earned() for each of this strategy's pools (rewardsContract first), at a timestamp."""
+        return [
+            self.models[(pool.address, strategy.address)].earned(timestamp)
+            for pool in self.pools[strategy.address]
+        ]
+
+    def claimable_balance(self, strategy, timestamp):
+        """Predicted claimableBalance(): the CRV our strategy could claim at a timestamp."""
+        return self.earned(strategy, timestamp)[0]
@@ -0,0 +1,352 @@
+import sqlite3
+from pathlib import Path
+
+from brownie import chain, web3
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+# eth_abi 4 renamed decode_abi to decode, and newer brownie (1.22 pins eth_abi 5) only has decode
+try:
+    from eth_abi import decode_abi
+except ImportError:
+    from eth_abi import decode as decode_abi
+
+# local history of our strategies and vaults, so we can look back over every harvest without re-reading the chain.
+# index() streams Harvested and Cloned from our strategies, plus StrategyReported, Deposit and Withdraw from our vaults,
+# into SQLite in block-range batches, and remembers how far it got for each address so the next run only reads new
+# blocks. clones are picked up from Cloned as we go. run it with `brownie run event_store main <vault> <strategy> ...`.
+
+DEFAULT_PATH = "build/events.db"
+
+# name: (table, [(argument, type, indexed)])
+EVENTS = {
+    "Harvested": (
+        "harvests",
+        [
+            ("profit", "uint256", False),
+            ("loss", "uint256", False),
+            ("debt_payment", "uint256", False),
+            ("debt_outstanding", "uint256", False),
+        ],
+    ),
+    "Cloned": ("clones", [("clone", "address", True)]),
+    "StrategyReported": (
+        "reports",
+        [
+            ("strategy", "address", True),
+            ("gain", "uint256", False),
+            ("loss", "uint256", False),
+            ("debt_paid", "uint256", False),
+            ("total_gain", "uint256", False),
+            ("total_loss", "uint256", False),
+            ("total_debt", "uint256", False),
+            ("debt_added", "uint256", False),
+            ("debt_ratio", "uint256", False),
+        ],
+    ),
+    "Deposit": (
+        "deposits",
+        [
+            ("recipient", "address", True),
+            ("shares", "uint256", False),
+            ("amount", "uint256", False),
+        ],
+    ),
+    "Withdraw": (
+        "withdrawals",
+        [
+            ("recipient", "address", True),
+            ("shares", "uint256", False),
+            ("amount", "uint256", False),
+        ],
+    ),
+}
+STRATEGY_EVENTS = ["Harvested", "Cloned"]
+VAULT_EVENTS = ["StrategyReported", "Deposit", "Withdraw"]
+
+
+def _topic(name):
+    types = ",".join(kind for _, kind, _ in EVENTS[name][1])
+    return "0x" + keccak(text=f"{name}({types})").hex()
+
+
+TOPICS = {_topic(name): name for name in EVENTS}
+
+# uint256 amounts don't fit in SQLite integers, so we keep them exact as text; cast them to REAL in queries
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    address TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    last_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    hash TEXT PRIMARY KEY,
+    gas_used INTEGER NOT NULL,
+    gas_price INTEGER NOT NULL
+);
+"""
+INDEXES = {
+    "harvests": "strategy",
+    "clones": "strategy",
+    "reports": "strategy",
+    "deposits": "vault",
+    "withdrawals": "vault",
+}
+
+
+def _create_tables(db):
+    db.executescript(SCHEMA)
+    for name, (table, args) in EVENTS.items():
+        # harvests and clones come from a strategy, everything else from a vault
+        emitter = "strategy" if name in STRATEGY_EVENTS else "vault"
+        columns = [f"{arg} TEXT NOT NULL" for arg, _, _ in args if arg != emitter]
+        db.execute(
+            f"""CREATE TABLE IF NOT EXISTS {table} (
+                block INTEGER NOT NULL,
+                log_index INTEGER NOT NULL,
+                tx_hash TEXT NOT NULL,
+                {emitter} TEXT NOT NULL,
+                {", ".join(columns)},
+                PRIMARY KEY (block, log_index)
+            )"""
+        )
+        db.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_by_{INDEXES[table]} "
+            f"ON {table} ({INDEXES[table]}, block)"
+        )
+
+
+def decode_log(log):
+    """(event name, {argument: value}) for one of our events, or None if it's not one we store."""
+    name = TOPICS.get(HexBytes(log["topics"][0]).hex())
+    if name is None:
+        return None
+    args = EVENTS[name][1]
+    indexed = [(arg, kind) for arg, kind, is_indexed in args if is_indexed]
+    data = [(arg, kind) for arg, kind, is_indexed in args if not is_indexed]
+    values = dict(
+        zip(
+            [arg for arg, _ in data],
+            decode_abi([kind for _, kind in data], HexBytes(log["data"])),
+        )
+    )
+    for (arg, kind), topic in zip(indexed, log["topics"][1:]):
+        values[arg] = decode_abi([kind], HexBytes(topic))[0]
+    for arg, kind, _ in args:
+        values[arg] = (
+            to_checksum_address(values[arg]) if kind == "address" else str(values[arg])
+        )
+    return name, values
+
+
+class EventStore:
+    def __init__(self, path=DEFAULT_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        _create_tables(self.db)
+
+    def close(self):
+        self.db.close()
+
+    def add_source(self, address, kind, start_block):
+        """Start indexing a strategy or vault from start_block. Does nothing if we're already indexing it."""
+        self.db.execute(
+            "INSERT OR IGNORE INTO sources VALUES (?, ?, ?)",
+            (to_checksum_address(address), kind, start_block - 1),
+        )
+        self.db.commit()
+
+    def last_block(self, address=None):
+        """The last block we've indexed for an address, or the furthest every source has reached if none is given."""
+        if address is None:
+            return self.db.execute("SELECT MIN(last_block) FROM sources").fetchone()[0]
+        row = self.db.execute(
+            "SELECT last_block FROM sources WHERE address = ?",
+            (to_checksum_address(address),),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def index(self, to_block=None, batch_size=10_000):
+        """
+        Read every source's events up to to_block (latest by default), batch_size blocks per eth_getLogs round. Each
+        batch is committed with our progress, so we can stop at any point and pick up where we left off.
+        """
+        if to_block is None:
+            to_block = chain.height
+        start = self.last_block()
+        if start is None:
+            return 0
+        count = 0
+        start += 1
+        while start <= to_block:
+            end = min(start + batch_size - 1, to_block)
+            count += self._index_range(start, end)
+            start = end + 1
+        return count
+
+    def _sources(self, kind, end):
+        # every address of this kind that hasn't reached the end of our batch yet, and how far it has got
+        return {
+            row["address"]: row["last_block"]
+            for row in self.db.execute(
+                "SELECT address, last_block FROM sources WHERE kind = ? AND last_block < ?",
+                (kind, end),
+            )
+        }
+
+    def _get_logs(self, sources, events, start, end):
+        # only keep logs past each address's own progress, since sources can be at different blocks
+        if not sources:
+            return []
+        logs = web3.eth.get_logs(
+            {
+                "address": sorted(sources),
+                "fromBlock": start,
+                "toBlock": end,
+                "topics": [[_topic(name) for name in events]],
+            }
+        )
+        return [log for log in logs if log["blockNumber"] > sources[log["address"]]]
+
+    def _index_range(self, start, end):
+        strategies = self._sources("strategy", end)
+        logs = self._get_logs(strategies, ["Cloned"], start, end)
+        # new clones can harvest in the same batch they're made in, so add them before reading harvests
+        for log in logs:
+            _, values = decode_log(log)
+            if values["clone"] not in strategies:
+                strategies[values["clone"]] = log["blockNumber"] - 1
+                self.add_source(values["clone"], "strategy", log["blockNumber"])
+        logs += self._get_logs(strategies, ["Harvested"], start, end)
+        vaults = self._sources("vault", end)
+        logs += self._get_logs(vaults, VAULT_EVENTS, start, end)
+
+        harvest_txs = set()
+        for log in logs:
+            name, values = decode_log(log)
+            table, args = EVENTS[name]
+            emitter = "strategy" if name in STRATEGY_EVENTS else "vault"
+            columns = [arg for arg, _, _ in args if arg != emitter]
+            self.db.execute(
+                f"INSERT OR IGNORE INTO {table} "
+                f"(block, log_index, tx_hash, {emitter}, {', '.join(columns)}) "
+                f"VALUES ({', '.join(['?'] * (len(columns) + 4))})",
+                [
+                    log["blockNumber"],
+                    log["logIndex"],
+                    HexBytes(log["transactionHash"]).hex(),
+                    log["address"],
+                ]
+                + [values[column] for column in columns],
+            )
+            self._add_block(log["blockNumber"])
+            if name == "Harvested":
+                harvest_txs.add(HexBytes(log["transactionHash"]).hex())
+
+        # gas is per transaction, so a batched harvest shares its gas across every strategy it harvested
+        for tx_hash in harvest_txs:
+            self._add_transaction(tx_hash)
+        self.db.execute(
+            "UPDATE sources SET last_block = ? WHERE last_block < ?", (end, end)
+        )
+        self.db.commit()
+        return len(logs)
+
+    def _add_block(self, number):
+        if self.db.execute(
+            "SELECT 1 FROM blocks WHERE number = ?", (number,)
+        ).fetchone():
+            return
+        timestamp = web3.eth.get_block(number)["timestamp"]
+        self.db.execute("INSERT INTO blocks VALUES (?, ?)", (number, timestamp))
+
+    def _add_transaction(self, tx_hash):
+        if self.db.execute(
+            "SELECT 1 FROM transactions WHERE hash = ?", (tx_hash,)
+        ).fetchone():
+            return
+        receipt = web3.eth.get_transaction_receipt(tx_hash)
+        gas_price = receipt.get("effectiveGasPrice")
+        if gas_price is None:
+            gas_price = web3.eth.get_transaction(tx_hash)["gasPrice"]
+        self.db.execute(
+            "INSERT INTO transactions VALUES (?, ?, ?)",
+            (tx_hash, receipt["gasUsed"], gas_price),
+        )
+
+    # ---- queries ----
+
+    def query(self, sql, params=()):
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def harvests(self, strategy=None):
+        """Every Harvested we've seen, oldest first, with its timestamp and its transaction's gas."""
+        sql = """
+            SELECT h.*, b.timestamp, t.gas_used, t.gas_price
+            FROM harvests h
+            JOIN blocks b ON b.number = h.block
+            LEFT JOIN transactions t ON t.hash = h.tx_hash
+        """
+        params = ()
+        if strategy is not None:
+            sql += " WHERE h.strategy = ?"
+            params = (to_checksum_address(strategy),)
+        return self.query(sql + " ORDER BY h.block, h.log_index", params)
+
+    def strategy_aprs(self, vault=None):
+        """
+        Each strategy's APR from its vault reports: total gain over the debt it held between reports, annualized over
+        the time from its first report to its last.
+        """
+        sql = """
+            WITH r AS (
+                SELECT r.vault, r.strategy, CAST(r.gain AS REAL) AS gain, b.timestamp,
+                    LAG(CAST(r.total_debt AS REAL)) OVER w AS debt_before,
+                    b.timestamp - LAG(b.timestamp) OVER w AS seconds
+                FROM reports r JOIN blocks b ON b.number = r.block
+                WINDOW w AS (PARTITION BY r.vault, r.strategy ORDER BY r.block, r.log_index)
+            )
+            SELECT vault, strategy, COUNT(*) AS reports,
+                SUM(gain) / (SUM(debt_before * seconds) / SUM(seconds)) * 31536000 / SUM(seconds) AS apr
+            FROM r WHERE seconds > 0 AND debt_before > 0
+        """
+        params = ()
+        if vault is not None:
+            sql += " AND vault = ?"
+            params = (to_checksum_address(vault),)
+        return self.query(sql + " GROUP BY vault, strategy", params)
+
+    def profit_per_gas(self):
+        """Per strategy: harvest count, average gas per harvest, and profit (in want) per gas spent and per ETH spent."""
+        return self.query(
+            """
+            SELECT h.strategy, COUNT(*) AS harvests, AVG(t.gas_used) AS avg_gas,
+                SUM(CAST(h.profit AS REAL)) / SUM(t.gas_used) AS profit_per_gas,
+                SUM(CAST(h.profit AS REAL)) / SUM(CAST(t.gas_used AS REAL) * t.gas_price) AS profit_per_wei
+            FROM harvests h JOIN transactions t ON t.hash = h.tx_hash
+            GROUP BY h.strategy
+            """
+        )
+
+
+def main(vault, *strategies, start_block=None, path=DEFAULT_PATH):
+    store = EventStore(path)
+    if start_block is None:
+        start_block = store.last_block()
+        start_block = chain.height if start_block is None else start_block + 1
+    store.add_source(vault, "vault", int(start_block))
+    for strategy in strategies:
+        store.add_source(strategy, "strategy", int(start_block))
+    count = store.index()
+    print(f"Indexed {count} events up to block {store.last_block()}")
+    for row in store.profit_per_gas():
+        print(
+            f"{row['strategy']}: {row['harvests']} harvests, {row['avg_gas']:,.0f} gas each, "
+            f"{row['profit_per_wei']:.4f} want per wei of gas"
+        )
+    store.close()
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+# compare two gas baselines from our benchmarks, e.g. one written with --update-gas-baseline before a change and one
+# after it: `brownie run gas_diff main before.json tests/benchmarks/gas_baseline.json`. both need to come from the same
+# fork block, or the numbers don't mean anything next to each other, so pin mainnet-fork to one block for both runs.
+
+
+def load(path):
+    saved = json.loads(Path(path).read_text())
+    return saved.get("fork_block"), saved.get("results", {})
+
+
+def diff(before, after):
+    """(key, before, after) for every key in either baseline, with None where one of them doesn't have it."""
+    return [(key, before.get(key), after.get(key)) for key in sorted({*before, *after})]
+
+
+def main(before_path, after_path):
+    before_block, before = load(before_path)
+    after_block, after = load(after_path)
+    # baselines from before we recorded their block don't have one, so we can only check when both do
+    if None not in (before_block, after_block) and before_block != after_block:
+        raise ValueError(
+            f"baselines are from different blocks ({before_block} and {after_block})"
+        )
+
+    print(f"{'':<48}{'before':>12}{'after':>12}{'change':>12}")
+    for key, old, new in diff(before, after):
+        if old is None or new is None:
+            print(f"{key:<48}{str(old):>12}{str(new):>12}")
+            continue
+        print(
+            f"{key:<48}{old:>12,}{new:>12,}{new - old:>+12,} ({(new - old) / old:+.1%})"
+        )
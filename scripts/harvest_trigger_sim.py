@@ -0,0 +1,204 @@
+from collections import namedtuple
+
+import numpy as np
+
+from scripts.cvx_mint import as_int_array, mintable_cvx
+
+# off-chain copy of StrategyConvex3CrvRewardsClonable.harvestTrigger(), vectorized with numpy so we can replay months of
+# history in milliseconds instead of making an eth_call per block. all inputs use the same raw units the contract reads:
+#  - claimable CRV and CVX supply in wei (1e18)
+#  - eth_price is chainlink's latestAnswer (1e8), crv_eth_price/cvx_eth_price are curve's price_oracle (1e18)
+#  - profits, harvestProfitMin and harvestProfitMax are in USDT (1e6), base fees in wei
+# math is done on python integers (numpy object arrays) so every rounding step matches the contract exactly.
+
+# these mirror the parameters we pass to setHarvestTriggerParams() and setMaxReportDelay(). use ints, not floats like
+# 1e24, since floats that large aren't exact and our comparisons need to match the contract to the wei.
+TriggerParams = namedtuple(
+    "TriggerParams",
+    [
+        "harvest_profit_min",
+        "harvest_profit_max",
+        "credit_threshold",
+        "check_earmark",
+        "max_report_delay",
+    ],
+)
+
+CRV = "0xD533a949740bb3306d119CC777fa900bA034cd52"
+CVX = "0x4e3FBD56CD56c3e72c1403e103b45Db9da5B9D2B"
+
+# same values the strategy starts with in _initializeStrat
+DEFAULT_PARAMS = TriggerParams(
+    60_000 * 10 ** 6, 120_000 * 10 ** 6, 10 ** 24, False, 21 * 86400
+)
+
+
+def claimable_profit_in_usdt(
+    claimable_crv, cvx_supply, eth_price, crv_eth_price, cvx_eth_price, rewards_value=0
+):
+    """
+    Vectorized claimableProfitInUsdt(). rewards_value is the USDT value of any bonus rewards, which the contract gets
+    from sushiswap's getAmountsOut; pass it in precomputed (see bonus_rewards_value) if our strategy has rewards.
+    """
+    claimable_crv = as_int_array(claimable_crv)
+    eth_price = as_int_array(eth_price) // 10 ** 2
+    crv_price = as_int_array(crv_eth_price) * eth_price // 10 ** 18
+    cvx_price = as_int_array(cvx_eth_price) * eth_price // 10 ** 18
+
+    crv_value = crv_price * claimable_crv // 10 ** 18
+    cvx_value = cvx_price * mintable_cvx(claimable_crv, cvx_supply) // 10 ** 18
+    return crv_value + cvx_value + as_int_array(rewards_value)
+
+
+def bonus_rewards_value(rewards, eth_price, crv_eth_price, cvx_eth_price):
+    """
+    What claimableProfitInUsdt() values one strategy's bonus rewards at (USDT, 1e6), for our rewards_value. rewards
+    is (token, earned, weth_out) for each, where weth_out is sushiswap's quote for selling earned to WETH. extra CRV
+    and CVX are valued at our prices like the rest of ours, so their weth_out is ignored.
+    """
+    eth_price = int(eth_price) // 10 ** 2
+    crv_price = int(crv_eth_price) * eth_price // 10 ** 18
+    cvx_price = int(cvx_eth_price) * eth_price // 10 ** 18
+    value = 0
+    weth_value = 0
+    for token, earned, weth_out in rewards:
+        if token == CRV:
+            value += crv_price * int(earned) // 10 ** 18
+        elif token == CVX:
+            value += cvx_price * int(earned) // 10 ** 18
+        else:
+            weth_value += int(weth_out)
+    return value + eth_price * weth_value // 10 ** 18
+
+
+def as_trigger_array(values):
+    # python ints, like everything else here, unless we're handed floats. those we keep as floats, so trigger_optimizer
+    # can check thousands of parameter lanes every step without converting each one to a python int.
+    array = np.asarray(values)
+    if array.dtype.kind == "f":
+        return array
+    return as_int_array(array)
+
+
+def harvest_trigger(
+    timestamps,
+    claimable_profit,
+    base_fee,
+    max_base_fee,
+    last_report,
+    params=DEFAULT_PARAMS,
+    credit_available=0,
+    force_harvest_trigger_once=False,
+    needs_earmark=False,
+    is_active=True,
+):
+    """
+    Vectorized harvestTrigger(), evaluated at every timestamp we pass. Returns a boolean array, checking conditions in
+    the same order as the contract does. params' fields can be arrays too, to check several parameter sets at once.
+    """
+    timestamps = as_trigger_array(timestamps)
+    claimable_profit = as_trigger_array(claimable_profit)
+    shape = timestamps.shape
+
+    inactive = ~np.broadcast_to(np.asarray(is_active, dtype=bool), shape)
+    blocked_by_earmark = np.broadcast_to(
+        np.asarray(needs_earmark, dtype=bool)
+        & np.asarray(params.check_earmark, dtype=bool),
+        shape,
+    )
+    above_max = claimable_profit > as_trigger_array(params.harvest_profit_max)
+    gas_ok = as_trigger_array(base_fee) <= as_trigger_array(max_base_fee)
+    forced = np.broadcast_to(np.asarray(force_harvest_trigger_once, dtype=bool), shape)
+    above_min = claimable_profit > as_trigger_array(params.harvest_profit_min)
+    too_old = timestamps - as_trigger_array(last_report) > as_trigger_array(
+        params.max_report_delay
+    )
+    credit = as_trigger_array(credit_available) > as_trigger_array(
+        params.credit_threshold
+    )
+
+    trigger = above_max | (gas_ok & (forced | above_min | too_old | credit))
+    return np.asarray(trigger & ~inactive & ~blocked_by_earmark, dtype=bool)
+
+
+def simulate_harvests(
+    timestamps,
+    earned_crv,
+    cvx_supply,
+    eth_price,
+    crv_eth_price,
+    cvx_eth_price,
+    base_fee,
+    max_base_fee,
+    last_report,
+    params=DEFAULT_PARAMS,
+    rewards_value=0,
+    credit_available=0,
+    needs_earmark=False,
+    is_active=True,
+    chunk_size=256,
+):
+    """
+    Replay a strategy's history and return the indices where a keeper would have harvested.
+
+    earned_crv (and rewards_value, if we have bonus rewards) are cumulative since the start of the series, as if we
+    never claimed; each harvest claims everything, so afterwards our claimable balance restarts from that point.
+    last_report is the timestamp of the harvest before our series starts. any other input can be a scalar or a series.
+    """
+    timestamps = as_int_array(timestamps)
+    length = len(timestamps)
+
+    def series(value):
+        return np.broadcast_to(as_int_array(value), (length,))
+
+    earned_crv = series(earned_crv)
+    cvx_supply = series(cvx_supply)
+    eth_price = series(eth_price)
+    crv_eth_price = series(crv_eth_price)
+    cvx_eth_price = series(cvx_eth_price)
+    base_fee = series(base_fee)
+    max_base_fee = series(max_base_fee)
+    rewards_value = series(rewards_value)
+    credit_available = series(credit_available)
+    needs_earmark = np.broadcast_to(np.asarray(needs_earmark, dtype=bool), (length,))
+    is_active = np.broadcast_to(np.asarray(is_active, dtype=bool), (length,))
+
+    # each harvest resets our claimable balance and lastReport, so we walk forward one harvest at a time, checking a
+    # chunk of timestamps at once. the next harvest is usually close, so this stays well under checking the full series.
+    harvests = []
+    start = 0
+    claimed_crv = 0
+    claimed_rewards = 0
+    while start < length:
+        window = slice(start, min(start + chunk_size, length))
+        profit = claimable_profit_in_usdt(
+            earned_crv[window] - claimed_crv,
+            cvx_supply[window],
+            eth_price[window],
+            crv_eth_price[window],
+            cvx_eth_price[window],
+            rewards_value[window] - claimed_rewards,
+        )
+        trigger = harvest_trigger(
+            timestamps[window],
+            profit,
+            base_fee[window],
+            max_base_fee[window],
+            last_report,
+            params,
+            credit_available[window],
+            False,
+            needs_earmark[window],
+            is_active[window],
+        )
+        if not trigger.any():
+            start = window.stop
+            continue
+        index = start + int(np.argmax(trigger))
+        harvests.append(index)
+        claimed_crv = earned_crv[index]
+        claimed_rewards = rewards_value[index]
+        last_report = timestamps[index]
+        start = index + 1
+
+    return np.asarray(harvests, dtype=int)
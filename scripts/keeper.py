@@ -0,0 +1,288 @@
+import asyncio
+import itertools
+import time
+
+import aiohttp
+import click
+from brownie import Contract, StrategyConvex3CrvRewardsClonable, accounts, web3
+
+from scripts.claimable_profit import CONVEX_TOKEN, CRVETH, CVXETH, ETH_ORACLE
+from scripts.harvest_trigger_sim import claimable_profit_in_usdt
+
+# asyncio keeper for all of our clones. every new block we:
+#  1. read the inputs every strategy shares (base fee oracle, chainlink ETH price, CVX supply, curve price oracles) once
+#  2. batch each strategy's own cheap reads, and value its claimable CRV + CVX locally with those shared inputs
+#  3. call harvestTrigger(0) only for strategies that could trigger, then submit harvest() for the ones that do
+# everything goes out as JSON-RPC batches over a small pool of connections, so each block costs a fixed number of round
+# trips no matter how many strategies we run. run it with `brownie run keeper main <strategy> <strategy> ... --network`.
+
+BASE_FEE_ORACLE = "0xb5e1CAcB567d98faaDB60a1fD4820720141f064F"
+BASE_FEE_ABI = [
+    {
+        "name": "isCurrentBaseFeeAcceptable",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "bool"}],
+    }
+]
+
+
+class RpcError(Exception):
+    pass
+
+
+class RpcPool:
+    """
+    JSON-RPC client on one pooled aiohttp session. batch() splits long request lists into JSON-RPC batches of
+    batch_size and sends them concurrently, using at most `connections` connections to our node.
+    """
+
+    def __init__(self, endpoint, connections=8, batch_size=100, timeout=30):
+        self.endpoint = endpoint
+        self.connections = connections
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.session = None
+        self._ids = itertools.count()
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, *args):
+        await self.session.close()
+
+    async def _post(self, payload):
+        async with self.session.post(self.endpoint, json=payload) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def request(self, method, params=()):
+        response = await self._post(
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": method,
+                "params": list(params),
+            }
+        )
+        if "error" in response:
+            raise RpcError(response["error"])
+        return response["result"]
+
+    async def batch(self, requests):
+        """Send a list of (method, params). Returns results in the same order, with an RpcError for any that failed."""
+        payloads = [
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": method,
+                "params": list(params),
+            }
+            for method, params in requests
+        ]
+        chunks = [
+            payloads[i : i + self.batch_size]
+            for i in range(0, len(payloads), self.batch_size)
+        ]
+        responses = await asyncio.gather(*[self._post(chunk) for chunk in chunks])
+        # nodes don't have to answer a batch in order, so match responses back up by id
+        by_id = {response["id"]: response for batch in responses for response in batch}
+        results = []
+        for payload in payloads:
+            response = by_id[payload["id"]]
+            if "error" in response:
+                results.append(RpcError(response["error"]))
+            else:
+                results.append(response["result"])
+        return results
+
+
+def eth_call(method, args, block):
+    # a brownie contract method plus its args, as an eth_call request at a given block
+    return (
+        "eth_call",
+        [{"to": method._address, "data": method.encode_input(*args)}, hex(block)],
+    )
+
+
+def decode(method, result):
+    if isinstance(result, RpcError):
+        raise result
+    return method.decode_output(result)
+
+
+class BlockCache:
+    """
+    Reads shared by everything that asks for them in the same block. The first caller for a key starts the fetch, and
+    anyone else asking during that block awaits the same task; moving to a new block drops the old entries.
+    """
+
+    def __init__(self):
+        self.block = None
+        self.tasks = {}
+
+    def get(self, block, key, fetch):
+        if block != self.block:
+            self.block = block
+            self.tasks = {}
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.ensure_future(fetch())
+        return self.tasks[key]
+
+
+class Keeper:
+    def __init__(self, rpc, strategies, account, chunk_size=100):
+        self.rpc = rpc
+        self.strategies = list(strategies)
+        self.account = account
+        self.chunk_size = chunk_size
+        self.cache = BlockCache()
+        self.pending = {}
+        self.base_fee_oracle = Contract.from_abi(
+            "BaseFeeOracle", BASE_FEE_ORACLE, BASE_FEE_ABI
+        )
+        self.convex_token = Contract(CONVEX_TOKEN)
+        self.eth_oracle = Contract(ETH_ORACLE)
+        self.crveth = Contract(CRVETH)
+        self.cvxeth = Contract(CVXETH)
+
+    async def _fetch_shared(self, block):
+        methods = {
+            "base_fee_ok": self.base_fee_oracle.isCurrentBaseFeeAcceptable,
+            "cvx_supply": self.convex_token.totalSupply,
+            "eth_price": self.eth_oracle.latestAnswer,
+            "crv_eth_price": self.crveth.price_oracle,
+            "cvx_eth_price": self.cvxeth.price_oracle,
+        }
+        results = await self.rpc.batch(
+            [eth_call(method, [], block) for method in methods.values()]
+        )
+        return {
+            key: decode(method, result)
+            for (key, method), result in zip(methods.items(), results)
+        }
+
+    def shared_reads(self, block):
+        """Inputs every strategy's trigger reads, fetched once per block however many strategies ask for them."""
+        return self.cache.get(block, "shared", lambda: self._fetch_shared(block))
+
+    async def _check_chunk(self, strategies, block):
+        shared = await self.shared_reads(block)
+        calls = []
+        for strategy in strategies:
+            calls += [
+                (strategy.isActive, []),
+                (strategy.claimableBalance, []),
+                (strategy.harvestProfitMax, []),
+                (strategy.hasRewards, []),
+            ]
+        results = await self.rpc.batch(
+            [eth_call(method, args, block) for method, args in calls]
+        )
+        values = [decode(method, result) for (method, _), result in zip(calls, results)]
+        per_strategy = [values[i : i + 4] for i in range(0, len(values), 4)]
+
+        profits = claimable_profit_in_usdt(
+            [claimable for _, claimable, _, _ in per_strategy],
+            shared["cvx_supply"],
+            shared["eth_price"],
+            shared["crv_eth_price"],
+            shared["cvx_eth_price"],
+        )
+
+        # with gas too high, only a profit over harvestProfitMax can trigger. bonus rewards aren't in our local profit,
+        # so strategies with rewards always get checked on-chain.
+        candidates = [
+            strategy
+            for strategy, (active, _, profit_max, has_rewards), profit in zip(
+                strategies, per_strategy, profits
+            )
+            if active and (shared["base_fee_ok"] or has_rewards or profit > profit_max)
+        ]
+        triggers = await self.rpc.batch(
+            [eth_call(strategy.harvestTrigger, [0], block) for strategy in candidates]
+        )
+        to_harvest = []
+        for strategy, result in zip(candidates, triggers):
+            if isinstance(result, RpcError):
+                print(f"harvestTrigger failed for {strategy.address}: {result}")
+            elif strategy.harvestTrigger.decode_output(result):
+                to_harvest.append(strategy)
+        return to_harvest
+
+    async def check(self, block):
+        """Every strategy whose harvestTrigger(0) is true at this block, checking chunks of strategies concurrently."""
+        chunks = [
+            self.strategies[i : i + self.chunk_size]
+            for i in range(0, len(self.strategies), self.chunk_size)
+        ]
+        results = await asyncio.gather(
+            *[self._check_chunk(chunk, block) for chunk in chunks]
+        )
+        return [strategy for chunk in results for strategy in chunk]
+
+    def _submit(self, strategies):
+        # brownie isn't async, so we send from a worker thread, one at a time to keep our nonces in order
+        txs = []
+        for strategy in strategies:
+            tx = strategy.harvest({"from": self.account, "required_confs": 0})
+            self.pending[strategy.address] = tx
+            txs.append(tx)
+        return txs
+
+    async def harvest(self, strategies):
+        # don't send a second harvest while our last one for a strategy is still pending
+        strategies = [
+            strategy
+            for strategy in strategies
+            if strategy.address not in self.pending
+            or self.pending[strategy.address].status != -1
+        ]
+        if not strategies:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._submit, strategies)
+
+    async def poll_once(self, block=None):
+        """Check every strategy at a block (latest by default) and harvest the ones that trigger."""
+        if block is None:
+            block = int(await self.rpc.request("eth_blockNumber"), 16)
+        start = time.perf_counter()
+        to_harvest = await self.check(block)
+        seconds = time.perf_counter() - start
+        print(
+            f"block {block}: checked {len(self.strategies)} strategies in {seconds:.2f}s, "
+            f"{len(to_harvest)} to harvest"
+        )
+        txs = await self.harvest(to_harvest)
+        return block, txs
+
+    async def run(self, poll_interval=2):
+        last_block = None
+        while True:
+            block = int(await self.rpc.request("eth_blockNumber"), 16)
+            if block != last_block:
+                await self.poll_once(block)
+                last_block = block
+            await asyncio.sleep(poll_interval)
+
+
+async def run_keeper(strategies, account, endpoint=None, poll_interval=2):
+    if endpoint is None:
+        endpoint = web3.provider.endpoint_uri
+    async with RpcPool(endpoint) as rpc:
+        await Keeper(rpc, strategies, account).run(poll_interval)
+
+
+def main(*addresses):
+    keeper = accounts.load(click.prompt("Keeper", type=click.Choice(accounts.load())))
+    strategies = [
+        StrategyConvex3CrvRewardsClonable.at(address) for address in addresses
+    ]
+    print(f"Keeping {len(strategies)} strategies with {keeper.address}")
+    asyncio.run(run_keeper(strategies, keeper))
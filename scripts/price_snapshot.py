@@ -0,0 +1,75 @@
+import click
+from brownie import PriceSnapshot, accounts, chain
+
+from scripts.claimable_profit import claimable_profits, multicall
+
+# off-chain side of our PriceSnapshot contract. a keeper checking many clones with eth_call doesn't share any storage
+# between calls, so the on-chain cache can't help it; instead we read the snapshot's prices and base fee check once per
+# block here, and hand the same values to everything that asks during that block.
+
+
+class PriceSnapshotClient:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.block = None
+        self.values = None
+
+    def read(self, block=None):
+        """
+        The snapshot's prices and base fee check at a block (latest by default), from one multicall the first time
+        we're asked for that block and from our cache after that.
+        """
+        if block is None:
+            block = chain.height
+        if block != self.block:
+            block, (prices, base_fee_ok, current) = multicall(
+                [
+                    (self.snapshot.prices, []),
+                    (self.snapshot.isCurrentBaseFeeAcceptable, []),
+                    (self.snapshot.isCurrent, []),
+                ],
+                block,
+            )
+            self.values = {
+                "eth_price": prices[0],
+                "crv_eth_price": prices[1],
+                "cvx_eth_price": prices[2],
+                "base_fee_ok": base_fee_ok,
+                "current": current,
+            }
+            self.block = block
+        return self.values
+
+    def prices(self, block=None):
+        values = self.read(block)
+        return values["eth_price"], values["crv_eth_price"], values["cvx_eth_price"]
+
+    def claimable_profits(self, strategies, block=None):
+        """claimable_profits() for our strategies, using this block's cached prices instead of reading the oracles."""
+        if block is None:
+            block = chain.height
+        return claimable_profits(strategies, block, prices=self.prices(block))
+
+    def update(self, account):
+        """Snapshot on-chain so harvests sent this block can read our cache. Skipped if someone already did."""
+        if self.snapshot.isCurrent():
+            return None
+        return self.snapshot.update({"from": account})
+
+
+def main(snapshot=None):
+    if snapshot is None:
+        deployer = accounts.load(
+            click.prompt("Deployer", type=click.Choice(accounts.load()))
+        )
+        snapshot = PriceSnapshot.deploy({"from": deployer})
+        print(f"Deployed PriceSnapshot at {snapshot.address}")
+    else:
+        snapshot = PriceSnapshot.at(snapshot)
+    values = PriceSnapshotClient(snapshot).read()
+    print(
+        f"ETH ${values['eth_price'] / 1e8:,.2f}, "
+        f"CRV {values['crv_eth_price'] / 1e18:.6f} ETH, "
+        f"CVX {values['cvx_eth_price'] / 1e18:.6f} ETH, "
+        f"base fee ok: {values['base_fee_ok']}, snapshotted this block: {values['current']}"
+    )
@@ -0,0 +1,83 @@
+from brownie import Contract, web3
+
+from scripts.claimable_profit import CRVETH, CVXETH, ETH_ORACLE, WETH, multicall
+
+# how much each swap in a harvest fell short of our oracle prices. we price every swap at the oracles as of the block
+# before the harvest (the same prices the strategy sets its minimum outputs from when maxSlippage is on), so any
+# shortfall is our swap fees and price impact, plus whatever anyone trading ahead of us in the block took.
+
+TRICRYPTO = "0xD51a44d3FaE010294C616388b506AcdA1bfAAE46"
+UNIV3_FACTORY = "0x1F98431c8aD98523631AE4a59f267346ea31F984"
+DAI = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+
+
+def load_swap_pools(strategy):
+    """
+    Load every pool our harvest can swap through, so brownie knows their events. Call this before harvesting, since
+    brownie decodes a transaction's events as soon as it's mined.
+    """
+    pool = Contract(UNIV3_FACTORY).getPool(
+        WETH, strategy.targetStable(), strategy.uniStableFee()
+    )
+    return [Contract(address) for address in [CRVETH, CVXETH, TRICRYPTO, pool]]
+
+
+def execution_shortfall(strategy, tx):
+    """
+    One row per CRV, CVX or WETH swap our harvest made: the pool, what we sold and bought, what our oracles said we
+    should have bought, and the shortfall in basis points (negative if we beat the oracle).
+    """
+    block = tx.block_number - 1
+    _, (eth_price, crv_eth_price, cvx_eth_price) = multicall(
+        [
+            (Contract(ETH_ORACLE).latestAnswer, []),
+            (Contract(CRVETH).price_oracle, []),
+            (Contract(CVXETH).price_oracle, []),
+        ],
+        block,
+    )
+    # our oracle's 8 decimals, plus 12 more unless we're buying DAI
+    stable_decimals = 10 ** 8 * (
+        1 if strategy.targetStable(block_identifier=block) == DAI else 10 ** 12
+    )
+
+    rows = []
+    for event in tx.events["TokenExchange"] if "TokenExchange" in tx.events else []:
+        address = web3.toChecksumAddress(event.address)
+        if address == CRVETH:
+            expected = event["tokens_sold"] * crv_eth_price // 10 ** 18
+        elif address == CVXETH:
+            expected = event["tokens_sold"] * cvx_eth_price // 10 ** 18
+        elif address == TRICRYPTO:
+            expected = event["tokens_sold"] * eth_price // stable_decimals
+        else:
+            continue
+        rows.append((address, event["tokens_sold"], event["tokens_bought"], expected))
+
+    # UniV3 pools log signed amounts; what went into the pool is positive. sushiswap's Swap has no sqrtPriceX96.
+    for event in tx.events["Swap"] if "Swap" in tx.events else []:
+        if "sqrtPriceX96" not in event:
+            continue
+        weth_first = int(WETH, 16) < int(strategy.targetStable(), 16)
+        weth_in, stable_out = (
+            (event["amount0"], -event["amount1"])
+            if weth_first
+            else (event["amount1"], -event["amount0"])
+        )
+        expected = weth_in * eth_price // stable_decimals
+        rows.append(
+            (web3.toChecksumAddress(event.address), weth_in, stable_out, expected)
+        )
+
+    return [
+        {
+            "pool": pool,
+            "sold": sold,
+            "bought": bought,
+            "expected": expected,
+            "shortfall_bps": (expected - bought) * 10_000 / expected
+            if expected
+            else 0.0,
+        }
+        for pool, sold, bought, expected in rows
+    ]
@@ -0,0 +1,286 @@
+from collections import namedtuple
+
+import numpy as np
+from brownie import Contract, StrategyConvex3CrvRewardsClonable, chain, web3
+
+from scripts.claimable_profit import (
+    CONVEX_TOKEN,
+    CRVETH,
+    CVXETH,
+    ETH_ORACLE,
+    multicall,
+)
+from scripts.cvx_mint import cvx_per_crv
+from scripts.earned_model import REWARD_POOL_ABI
+from scripts.harvest_trigger_sim import DEFAULT_PARAMS, TriggerParams, harvest_trigger
+from scripts.keeper import BASE_FEE_ORACLE
+
+# pick setHarvestTriggerParams() and setMaxReportDelay() values from history instead of by hand. we replay a strategy's
+# reward accrual, prices and base fees under every parameter combination on a grid at once (each combination is one
+# lane of a numpy array), and score each by what it would have left us with: harvested profit grown by compounding until
+# the end of the series, plus anything still unclaimed, minus the gas we spent harvesting.
+#
+# this uses floats, so it can be off by a rounding step right at a threshold; use harvest_trigger_sim when we need to
+# match the contract exactly. bonus rewards and creditThreshold aren't modeled, so we keep whatever those are set to.
+
+DEFAULT_HARVEST_GAS = 1_000_000  # a typical harvest; pass in our real average from the event store if we have it
+DEFAULT_PRIORITY_FEE = 2 * 10 ** 9
+
+# candidate values for our grid: profits in USDT (1e6) from $1k to $1m, report delays in seconds
+PROFIT_CANDIDATES = np.geomspace(1_000, 1_000_000, 25) * 1e6
+DELAY_CANDIDATES = np.array([1, 2, 3, 5, 7, 10, 14, 21, 30]) * 86400
+
+History = namedtuple(
+    "History",
+    [
+        "timestamps",  # seconds
+        "earned_crv",  # cumulative CRV earned since the start of the series, as if we never claimed (1e18)
+        "usdt_per_crv",  # USDT (1e6) that claimableProfitInUsdt() values 1 CRV (1e18) at, CVX included
+        "base_fee",  # wei
+        "eth_price",  # chainlink, 1e8
+    ],
+)
+
+Scores = namedtuple(
+    "Scores",
+    [
+        "harvest_profit_min",
+        "harvest_profit_max",
+        "max_report_delay",
+        "net",  # everything below is in USDT (1e6)
+        "profit",
+        "gas",
+        "harvests",
+    ],
+)
+
+
+def usdt_per_crv(cvx_supply, eth_price, crv_eth_price, cvx_eth_price):
+    """Float version of claimableProfitInUsdt() for 1 CRV claimable: its own value plus the CVX it mints."""
+    eth_price = np.asarray(eth_price, dtype=float) / 1e2
+    crv_price = np.asarray(crv_eth_price, dtype=float) * eth_price / 1e18
+    cvx_price = np.asarray(cvx_eth_price, dtype=float) * eth_price / 1e18
+    return crv_price + cvx_price * cvx_per_crv(cvx_supply)
+
+
+def load_history(strategy, start_block, end_block=None, step=300):
+    """
+    Sample a strategy's reward accrual, prices and base fee every `step` blocks (needs an archive node). Accrual comes
+    from the rewards pool's rewardPerToken, scaled by our current stake, so our own past harvests don't show up in it.
+    """
+    if end_block is None:
+        end_block = chain.height
+    pool = Contract.from_abi("RewardPool", strategy.rewardsContract(), REWARD_POOL_ABI)
+    staked = pool.balanceOf(strategy, block_identifier=end_block)
+    convex_token = Contract(CONVEX_TOKEN)
+    eth_oracle = Contract(ETH_ORACLE)
+    crveth = Contract(CRVETH)
+    cvxeth = Contract(CVXETH)
+
+    rows = []
+    for block in range(start_block, end_block + 1, step):
+        _, values = multicall(
+            [
+                (pool.rewardPerToken, []),
+                (convex_token.totalSupply, []),
+                (eth_oracle.latestAnswer, []),
+                (crveth.price_oracle, []),
+                (cvxeth.price_oracle, []),
+            ],
+            block,
+        )
+        header = web3.eth.get_block(block)
+        rows.append([header["timestamp"], header["baseFeePerGas"]] + list(values))
+    timestamps, base_fee, reward_per_token, supply, eth, crv_eth, cvx_eth = zip(*rows)
+
+    reward_per_token = np.asarray(reward_per_token, dtype=float)
+    return History(
+        np.asarray(timestamps, dtype=float),
+        (reward_per_token - reward_per_token[0]) * staked / 1e18,
+        usdt_per_crv(supply, eth, crv_eth, cvx_eth),
+        np.asarray(base_fee, dtype=float),
+        np.asarray(eth, dtype=float),
+    )
+
+
+def simulate_grid(
+    history,
+    harvest_profit_min,
+    harvest_profit_max,
+    max_report_delay,
+    max_base_fee,
+    last_report,
+    tvl,
+    harvest_gas=DEFAULT_HARVEST_GAS,
+    priority_fee=DEFAULT_PRIORITY_FEE,
+):
+    """
+    Replay history once for every parameter combination (the three parameter arrays broadcast together), checking
+    each step with harvest_trigger on floats. tvl is in USDT (1e6) and sets how fast harvested profit compounds.
+    Returns Scores.
+    """
+    profit_min, profit_max, delay = np.broadcast_arrays(
+        np.asarray(harvest_profit_min, dtype=float),
+        np.asarray(harvest_profit_max, dtype=float),
+        np.asarray(max_report_delay, dtype=float),
+    )
+    profit_min, profit_max, delay = (
+        profit_min.ravel(),
+        profit_max.ravel(),
+        delay.ravel(),
+    )
+    timestamps = np.asarray(history.timestamps, dtype=float)
+    earned = np.asarray(history.earned_crv, dtype=float)
+    price = np.asarray(history.usdt_per_crv, dtype=float) / 1e18
+    base_fee = np.asarray(history.base_fee, dtype=float)
+
+    # our yield over the whole series, as the rate anything we harvest goes on to compound at
+    duration = max(timestamps[-1] - timestamps[0], 1.0)
+    rate = earned[-1] * price[-1] / tvl / duration
+    growth = np.exp(rate * (timestamps[-1] - timestamps))
+    gas_cost = (
+        harvest_gas
+        * (base_fee + priority_fee)
+        * np.asarray(history.eth_price, dtype=float)
+        / 1e8  # chainlink decimals
+        / 1e18  # wei per ETH
+        * 1e6  # USDT decimals
+    )
+
+    lanes = len(profit_min)
+    # one lane per parameter set; we don't model credit, so creditThreshold never triggers
+    params = TriggerParams(profit_min, profit_max, np.inf, False, delay)
+    claimed = np.full(lanes, earned[0])
+    last_harvest = np.full(lanes, float(last_report))
+    profit = np.zeros(lanes)
+    compounded = np.zeros(lanes)
+    gas = np.zeros(lanes)
+    harvests = np.zeros(lanes, dtype=int)
+    for i in range(len(timestamps)):
+        claimable = (earned[i] - claimed) * price[i]
+        trigger = harvest_trigger(
+            np.full(lanes, timestamps[i]),
+            claimable,
+            base_fee[i],
+            float(max_base_fee),
+            last_harvest,
+            params,
+            0.0,
+        )
+        if not trigger.any():
+            continue
+        harvested = np.where(trigger, claimable, 0.0)
+        profit += harvested
+        compounded += harvested * growth[i]
+        gas += trigger * gas_cost[i]
+        harvests += trigger
+        claimed = np.where(trigger, earned[i], claimed)
+        last_harvest = np.where(trigger, timestamps[i], last_harvest)
+
+    # whatever we haven't claimed by the end still counts, it just hasn't compounded
+    unclaimed = (earned[-1] - claimed) * price[-1]
+    return Scores(
+        profit_min,
+        profit_max,
+        delay,
+        compounded + unclaimed - gas,
+        profit + unclaimed,
+        gas,
+        harvests,
+    )
+
+
+def parameter_grid(profits=PROFIT_CANDIDATES, delays=DELAY_CANDIDATES):
+    """Every (profit min, profit max, report delay) from our candidate values, keeping only max >= min."""
+    profit_min, profit_max, delay = np.meshgrid(profits, profits, delays, indexing="ij")
+    keep = profit_max >= profit_min
+    return profit_min[keep], profit_max[keep], delay[keep]
+
+
+def optimize(history, max_base_fee, last_report, tvl, current=DEFAULT_PARAMS, **kwargs):
+    """
+    Search our parameter grid and return the best TriggerParams (carrying over current's creditThreshold and
+    checkEarmark), plus the Scores for every combination we tried.
+    """
+    scores = simulate_grid(
+        history, *parameter_grid(), max_base_fee, last_report, tvl, **kwargs
+    )
+    best = int(np.argmax(scores.net))
+    params = TriggerParams(
+        int(scores.harvest_profit_min[best]),
+        int(scores.harvest_profit_max[best]),
+        current.credit_threshold,
+        current.check_earmark,
+        int(scores.max_report_delay[best]),
+    )
+    return params, scores
+
+
+def setter_calls(strategy, params):
+    """The (method, args) calls that apply our params to a strategy."""
+    return [
+        (
+            strategy.setHarvestTriggerParams,
+            [
+                params.harvest_profit_min,
+                params.harvest_profit_max,
+                params.credit_threshold,
+                params.check_earmark,
+            ],
+        ),
+        (strategy.setMaxReportDelay, [params.max_report_delay]),
+    ]
+
+
+def main(strategy, days=90, tvl=None, harvest_gas=DEFAULT_HARVEST_GAS):
+    strategy = StrategyConvex3CrvRewardsClonable.at(strategy)
+    vault = Contract(strategy.vault())
+    end_block = chain.height
+    start_block = end_block - int(days) * 7_200
+    history = load_history(strategy, start_block, end_block)
+
+    current = TriggerParams(
+        strategy.harvestProfitMin(),
+        strategy.harvestProfitMax(),
+        strategy.creditThreshold(),
+        strategy.checkEarmark(),
+        strategy.maxReportDelay(),
+    )
+    if tvl is None:
+        # our curve LPs are close enough to $1 that our assets in want are a fine TVL estimate
+        tvl = strategy.estimatedTotalAssets() / 10 ** vault.decimals() * 1e6
+    max_base_fee = Contract(BASE_FEE_ORACLE).maxAcceptableBaseFee()
+    last_report = history.timestamps[0]
+    params, scores = optimize(
+        history,
+        max_base_fee,
+        last_report,
+        float(tvl),
+        current,
+        harvest_gas=int(harvest_gas),
+    )
+
+    baseline = simulate_grid(
+        history,
+        current.harvest_profit_min,
+        current.harvest_profit_max,
+        current.max_report_delay,
+        max_base_fee,
+        last_report,
+        float(tvl),
+        harvest_gas=int(harvest_gas),
+    )
+    best = int(np.argmax(scores.net))
+    print(f"Tried {len(scores.net)} parameter sets over {days} days")
+    print(
+        f"Current: {baseline.harvests[0]} harvests, net ${baseline.net[0] / 1e6:,.2f}, "
+        f"gas ${baseline.gas[0] / 1e6:,.2f}"
+    )
+    print(
+        f"Best:    {scores.harvests[best]} harvests, net ${scores.net[best] / 1e6:,.2f}, "
+        f"gas ${scores.gas[best] / 1e6:,.2f}"
+    )
+    print("\nRecommended calls:")
+    for method, args in setter_calls(strategy, params):
+        print(f"strategy.{method.abi['name']}({', '.join(str(arg) for arg in args)})")
+        print(f"  calldata: {method.encode_input(*args)}")
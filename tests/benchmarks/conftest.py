@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import pytest
+
+# gas benchmarks only run with `brownie test tests/benchmarks --gas-benchmark`. results are compared against
+# gas_baseline.json, and a test fails if any of its code paths costs more than the baseline's threshold above baseline,
+# or if the baseline has no number for it at all. add --update-gas-baseline to write this run's numbers back to the
+# baseline once you're happy with them.
+#
+# gas depends on the state we fork from, so the baseline is tied to one block: it can only be written from a run that
+# starts on pinned_fork_block (in our top-level conftest), and it's only compared against runs from that same block.
+
+baseline_path = Path(__file__).parent / "gas_baseline.json"
+
+# bump this if we change what our benchmarks measure, so old numbers don't get compared against new ones
+BASELINE_VERSION = 1
+
+
+class GasBaseline:
+    def __init__(self, path, threshold=None, updating=False):
+        self.path = path
+        saved = json.loads(path.read_text()) if path.exists() else {}
+        if saved.get("version") != BASELINE_VERSION:
+            saved = {}
+        self.threshold = (
+            threshold if threshold is not None else saved.get("threshold", 0.02)
+        )
+        self.fork_block = saved.get("fork_block")
+        self.baseline = saved.get("results", {})
+        self.updating = updating
+        self.results = {}
+
+    def record(self, key, gas_used):
+        self.results[key] = gas_used
+        print(f"{key}: {gas_used} gas (baseline {self.baseline.get(key)})")
+
+    def regressions(self, prefix=""):
+        """
+        Every recorded key under prefix that costs more than threshold above its baseline, or that has no baseline (as
+        None), unless we're writing a new baseline.
+        """
+        if self.updating:
+            return {}
+        return {
+            key: (self.baseline.get(key), gas_used)
+            for key, gas_used in self.results.items()
+            if key.startswith(prefix)
+            and (
+                key not in self.baseline
+                or gas_used > self.baseline[key] * (1 + self.threshold)
+            )
+        }
+
+    def write(self, fork_block):
+        # a new block makes every old number meaningless, so start over instead of merging
+        results = self.results
+        if fork_block == self.fork_block:
+            results = {**self.baseline, **self.results}
+        saved = {
+            "version": BASELINE_VERSION,
+            "fork_block": fork_block,
+            "threshold": self.threshold,
+            "results": dict(sorted(results.items())),
+        }
+        self.path.write_text(json.dumps(saved, indent=2) + "\n")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--gas-benchmark"):
+        return
+    skip = pytest.mark.skip(reason="run with --gas-benchmark")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def gas_baseline(request, fork_block, on_pinned_fork):
+    updating = request.config.getoption("--update-gas-baseline")
+    gas_baseline = GasBaseline(
+        baseline_path, request.config.getoption("--gas-threshold"), updating
+    )
+    if updating and not on_pinned_fork:
+        pytest.fail(
+            f"our fork started at block {fork_block}; set pinned_fork_block and pin mainnet-fork to it to write a baseline"
+        )
+    if not updating and gas_baseline.fork_block is None:
+        pytest.fail(
+            "our gas baseline is empty; pin our fork and write one with --update-gas-baseline first"
+        )
+    if not updating and gas_baseline.fork_block != fork_block:
+        pytest.fail(
+            f"our gas baseline is from block {gas_baseline.fork_block}, but our fork started at block {fork_block}"
+        )
+    yield gas_baseline
+    if updating:
+        gas_baseline.write(fork_block)
@@ -0,0 +1,116 @@
+import brownie
+import pytest
+from brownie import Contract
+from brownie import config
+from utils import advance
+
+# gas used by each of our strategy's code paths, for every setting that changes what those paths do. we start from
+# our strategy's defaults and change one setting at a time.
+DEFAULT_CONFIG = {
+    "has_rewards": None,  # None leaves rewards however our pool sets them up in conftest
+    "keep_crv": 1000,
+    "keep_cvx": 0,
+    "optimal": 2,
+    "claim_rewards": False,
+    "max_slippage": 0,
+    "idle_buffer": 0,
+}
+CONFIGS = {
+    "default": {},
+    "rewards_on": {"has_rewards": True},
+    "rewards_off": {"has_rewards": False},
+    "no_keep": {"keep_crv": 0, "keep_cvx": 0},
+    "keep_crv_and_cvx": {"keep_crv": 1000, "keep_cvx": 1000},
+    "target_dai": {"optimal": 0},
+    "target_usdc": {"optimal": 1},
+    "claim_rewards": {"claim_rewards": True},
+    "max_slippage": {"max_slippage": 300},
+    "idle_buffer": {"idle_buffer": 1_000 * 10 ** 18},
+}
+
+
+def configure(strategy, settings, gov):
+    if settings["has_rewards"] is not None:
+        strategy.updateRewards(settings["has_rewards"], 0, {"from": gov})
+    strategy.setKeep(settings["keep_crv"], settings["keep_cvx"], gov, {"from": gov})
+    strategy.setOptimal(settings["optimal"], {"from": gov})
+    strategy.setClaimRewards(settings["claim_rewards"], {"from": gov})
+    strategy.setMaxSlippage(settings["max_slippage"], {"from": gov})
+    strategy.setDepositParams(0, settings["idle_buffer"], {"from": gov})
+
+
+@pytest.mark.parametrize("config_name", CONFIGS)
+def test_gas(
+    config_name,
+    gas_baseline,
+    contract_name,
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    amount,
+    pid,
+    pool,
+    strategy_name,
+    sleep_time,
+    rewardsContract,
+    is_convex,
+    accounts,
+):
+    if not is_convex:
+        pytest.skip("only our convex strategy is benchmarked")
+    settings = {**DEFAULT_CONFIG, **CONFIGS[config_name]}
+    if settings["has_rewards"] and rewardsContract.extraRewardsLength() == 0:
+        pytest.skip("our pool has no bonus rewards")
+    configure(strategy, settings, gov)
+    prefix = f"{pid}/{config_name}/"
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+
+    # harvestTrigger is a view, but our keepers pay for it on every check, so estimate it too
+    advance(sleep_time)
+    gas_baseline.record(
+        prefix + "harvestTrigger", strategy.harvestTrigger.estimate_gas(0)
+    )
+
+    # prepareReturn: claim and sell our rewards, then adjustPosition re-invests
+    tx = strategy.harvest({"from": gov})
+    gas_baseline.record(prefix + "prepareReturn", tx.gas_used)
+
+    # harvesting again right away has nothing but dust to claim, like a harvest that only rebalances debt
+    tx = strategy.harvest({"from": gov})
+    gas_baseline.record(prefix + "prepareReturn_no_profit", tx.gas_used)
+
+    # adjustPosition on its own: tend just invests any loose want
+    token.transfer(strategy, amount // 10, {"from": whale})
+    tx = strategy.tend({"from": gov})
+    gas_baseline.record(prefix + "adjustPosition", tx.gas_used)
+
+    # liquidatePosition: the vault pulls from us for a withdrawal, first a small one (that an idle buffer covers)
+    advance(1)
+    tx = strategy.withdraw(10 ** 18, {"from": accounts.at(vault, force=True)})
+    gas_baseline.record(prefix + "liquidatePosition_small", tx.gas_used)
+    tx = vault.withdraw(vault.balanceOf(whale) // 2, {"from": whale})
+    gas_baseline.record(prefix + "liquidatePosition", tx.gas_used)
+
+    # prepareMigration: move everything into a fresh strategy with the same settings
+    new_strategy = strategist.deploy(contract_name, vault, pid, pool, strategy_name)
+    configure(new_strategy, settings, gov)
+    tx = vault.migrateStrategy(strategy, new_strategy, {"from": gov})
+    gas_baseline.record(prefix + "prepareMigration", tx.gas_used)
+
+    # liquidateAllPositions: stake in our new strategy, then exit it all in an emergency
+    new_strategy.harvest({"from": gov})
+    advance(1)
+    new_strategy.setEmergencyExit({"from": gov})
+    tx = new_strategy.harvest({"from": gov})
+    gas_baseline.record(prefix + "liquidateAllPositions", tx.gas_used)
+
+    regressions = gas_baseline.regressions(prefix)
+    assert not regressions, f"gas regressions (baseline, now): {regressions}"
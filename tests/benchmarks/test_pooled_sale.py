@@ -0,0 +1,97 @@
+import brownie
+import pytest
+from brownie import Contract
+from brownie import config
+from utils import advance, transferred
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+CRVETH = "0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511"
+CVXETH = "0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4"
+
+# harvesting our strategy and a clone one at a time (each selling its own CRV and CVX) vs through our PooledSeller.
+# we undo the individual harvests before the pooled one, so both start from the same fork state and their gas and the
+# WETH we get for our CRV and CVX are directly comparable.
+def test_pooled_sale(
+    gas_baseline,
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    keeper,
+    rewards,
+    contract_name,
+    PooledSeller,
+    crv,
+    convexToken,
+    chain,
+    pid,
+    amount,
+    pool,
+    strategy_name,
+    sleep_time,
+    is_clonable,
+):
+    if not is_clonable:
+        pytest.skip("we need clones to pool sales")
+
+    # split our vault's debt between our strategy and a clone
+    tx = strategy.cloneConvex3CrvRewards(
+        vault,
+        strategist,
+        rewards,
+        keeper,
+        pid,
+        pool,
+        strategy_name,
+        {"from": gov},
+    )
+    clone = contract_name.at(tx.return_value)
+    strategies = [strategy, clone]
+    vault.updateStrategyDebtRatio(strategy, 5000, {"from": gov})
+    vault.addStrategy(clone, 5000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+    seller = keeper.deploy(PooledSeller)
+    for s in strategies:
+        s.setPooledSeller(seller, {"from": gov})
+        s.setKeeper(seller, {"from": gov})
+
+    ## deposit to the vault after approving, and get funds into both strategies
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    for s in strategies:
+        s.harvest({"from": gov})
+
+    advance(sleep_time)
+    individual = [s.harvest({"from": gov}) for s in strategies]
+    chain.undo(len(individual))
+    pooled = [seller.sellAndHarvest(strategies, {"from": keeper})]
+
+    results = {}
+    for mode, txs in [("individual", individual), ("pooled", pooled)]:
+        gas_used = sum(tx.gas_used for tx in txs)
+        gas_baseline.record(f"{pid}/pooled_sale/{mode}", gas_used)
+        # WETH that crveth and cvxeth paid out per CRV and CVX we sold them
+        prices = [
+            transferred(txs, WETH, sender=curve_pool)
+            * 10 ** 18
+            // max(transferred(txs, sell_token, receiver=curve_pool), 1)
+            for sell_token, curve_pool in [(crv, CRVETH), (convexToken, CVXETH)]
+        ]
+        print(
+            f"\n{mode}: {prices[0] / 1e18:.8f} WETH per CRV, {prices[1] / 1e18:.8f} WETH per CVX, {gas_used} gas"
+        )
+        results[mode] = gas_used, prices
+
+    # one sale for both strategies has to cost less than each of them selling on its own
+    assert results["pooled"][0] < results["individual"][0]
+    # and a single lot gets the same price as two halves sold back to back, give or take our extra second of rewards
+    assert results["pooled"][1][0] > 0
+    for pooled_price, individual_price in zip(
+        results["pooled"][1], results["individual"][1]
+    ):
+        assert pooled_price >= individual_price * 0.999
+
+    regressions = gas_baseline.regressions(f"{pid}/pooled_sale/")
+    assert not regressions, f"gas regressions (baseline, now): {regressions}"
@@ -0,0 +1,58 @@
+import brownie
+import pytest
+from brownie import Contract
+from brownie import config
+from utils import advance, transferred
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+USDT = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+
+# harvest gas and the price we get selling WETH for USDT, for our default UniV3 route vs curve's tricrypto2. both routes
+# take the same hops (CRV and CVX to WETH, WETH to USDT, USDT into our pool), and only the venue for WETH -> USDT
+# differs. both start from the same fork state, so the numbers are directly comparable.
+@pytest.mark.parametrize("use_curve_route", [False, True], ids=["univ3", "curve"])
+def test_routes(
+    use_curve_route,
+    gas_baseline,
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    pid,
+    sleep_time,
+    eth_oracle,
+    is_convex,
+):
+    if not is_convex:
+        pytest.skip("only our convex strategy has a curve route")
+    route = "curve" if use_curve_route else "univ3"
+    strategy.setOptimal(2, {"from": gov})
+    strategy.setUseCurveRoute(use_curve_route, {"from": gov})
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+
+    advance(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    gas_baseline.record(f"{pid}/route_{route}/harvest", tx.gas_used)
+
+    # WETH we sold and USDT we got back, from our transfers
+    weth_sold = transferred([tx], WETH, sender=strategy)
+    usdt_bought = transferred([tx], USDT, receiver=strategy)
+    assert weth_sold > 0 and usdt_bought > 0
+
+    # compare our price to chainlink (8 decimals) to see how much we lost to fees and price impact
+    price = usdt_bought * 1e12 / weth_sold
+    oracle_price = eth_oracle.latestAnswer() / 1e8
+    print(
+        f"\n{route}: sold {weth_sold / 1e18:.4f} WETH at {price:.2f} USDT, "
+        f"{(1 - price / oracle_price) * 10_000:.1f} bps below chainlink, {tx.gas_used} gas"
+    )
+
+    regressions = gas_baseline.regressions(f"{pid}/route_{route}/")
+    assert not regressions, f"gas regressions (baseline, now): {regressions}"
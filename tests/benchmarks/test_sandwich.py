@@ -0,0 +1,253 @@
+import brownie
+import pytest
+from brownie import Contract, chain
+from utils import advance, transferred
+from scripts.claimable_profit import CRVETH, CVXETH, SUSHISWAP, WETH
+from scripts.shortfall import execution_shortfall, load_swap_pools
+
+# what a sandwich around our harvest would take from us. we harvest once honestly, undo it, then replay the same harvest
+# with an attacker selling what we sell right before us and buying it back right after, on each pool we swap through:
+# crveth, cvxeth, the UniV3 WETH/stable pool, and sushiswap for bonus rewards. we compare the profit we report, and what
+# the attacker made, for a few harvest sizes and attack sizes (as multiples of our own trade on each pool).
+
+UNIV3_ROUTER = "0xE592427A0AEce92De3Edee1F18E0157C05861564"
+CRV_WHALE = "0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2"  # veCRV
+CVX_WHALE = "0x72a19342e8F1838460eBFCCEf09F6585e32db86E"  # vlCVX
+ATTACK_SIZES = [1, 5, 25]
+
+
+class Attacker:
+    """Front-runs and back-runs our swaps. Every method returns the transactions it sent, so we can undo them."""
+
+    def __init__(self, account, strategy):
+        self.account = account
+        self.weth = Contract(WETH)
+        self.crveth = Contract(CRVETH)
+        self.cvxeth = Contract(CVXETH)
+        self.router = Contract(UNIV3_ROUTER)
+        self.sushiswap = Contract(SUSHISWAP)
+        self.stable = Contract(strategy.targetStable())
+        self.fee = strategy.uniStableFee()
+        self.received = {}
+
+    def _send(self, method, *args):
+        return method(*args, {"from": self.account})
+
+    def _balance(self, token):
+        return token.balanceOf(self.account)
+
+    def front_run(self, pool, token, amount):
+        """Sell `amount` of the token we're about to sell into `pool`, remembering what we got for it."""
+        if pool in (self.crveth, self.cvxeth):
+            before = self._balance(self.weth)
+            tx = self._send(pool.exchange, 1, 0, amount, 0, False)
+            self.received[pool.address] = self._balance(self.weth) - before
+        elif pool == self.router:
+            before = self._balance(self.stable)
+            tx = self._send(
+                pool.exactInputSingle,
+                (WETH, self.stable, self.fee, self.account, 2 ** 64, amount, 0, 0),
+            )
+            self.received[pool.address] = self._balance(self.stable) - before
+        else:
+            before = self._balance(self.weth)
+            tx = self._send(
+                pool.swapExactTokensForTokens,
+                amount,
+                0,
+                [token, WETH],
+                self.account,
+                2 ** 64,
+            )
+            self.received[pool.address] = self._balance(self.weth) - before
+        return [tx]
+
+    def back_run(self, pool, token):
+        """Swap everything our front-run got back into the token we sold. Returns the txs and how much came back."""
+        amount = self.received.pop(pool.address)
+        before = self._balance(token)
+        if pool in (self.crveth, self.cvxeth):
+            tx = self._send(pool.exchange, 0, 1, amount, 0, False)
+        elif pool == self.router:
+            tx = self._send(
+                pool.exactInputSingle,
+                (self.stable, WETH, self.fee, self.account, 2 ** 64, amount, 0, 0),
+            )
+        else:
+            tx = self._send(
+                pool.swapExactTokensForTokens,
+                amount,
+                0,
+                [WETH, token],
+                self.account,
+                2 ** 64,
+            )
+        return [tx], self._balance(token) - before
+
+
+@pytest.mark.parametrize("harvest_size", [1, 4, 16])
+def test_sandwich(
+    harvest_size,
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    sleep_time,
+    crv,
+    convexToken,
+    eth_oracle,
+    has_rewards,
+    rewards_token,
+    rewards_whale,
+    accounts,
+    is_convex,
+):
+    if not is_convex:
+        pytest.skip("only our convex strategy is benchmarked")
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    load_swap_pools(strategy)
+
+    # our honest harvest, and what we sold into each pool
+    advance(sleep_time * harvest_size)
+    honest = strategy.harvest({"from": gov})
+    honest_profit = honest.events["Harvested"]["profit"]
+    sold = {
+        swap["pool"]: swap["sold"] for swap in execution_shortfall(strategy, honest)
+    }
+    attacker = Attacker(accounts[5], strategy)
+    # whatever we sold outside crveth and cvxeth is our WETH, on the UniV3 pool
+    legs = [
+        (attacker.crveth, crv, sold.get(CRVETH, 0)),
+        (attacker.cvxeth, convexToken, sold.get(CVXETH, 0)),
+        (
+            attacker.router,
+            attacker.weth,
+            sum(v for k, v in sold.items() if k not in (CRVETH, CVXETH)),
+        ),
+    ]
+    if has_rewards:
+        rewards_sold = transferred([honest], rewards_token, sender=strategy)
+        legs.append((attacker.sushiswap, rewards_token, rewards_sold))
+        # the WETH we got for 1e18 of our bonus reward on sushiswap, for our floor below
+        pair = Contract(attacker.sushiswap.factory()).getPair(rewards_token, WETH)
+        rewards_price = (
+            transferred([honest], WETH, sender=pair, receiver=strategy)
+            * 10 ** 18
+            // max(rewards_sold, 1)
+        )
+    legs = [leg for leg in legs if leg[2] > 0]
+    chain.undo()
+
+    # fund our attacker for the biggest attack, and approve everything up front so our replays only hold swaps
+    biggest = max(ATTACK_SIZES)
+    for pool, sell_token, our_amount in legs:
+        if sell_token == attacker.weth:
+            for donor in accounts[6:9]:
+                donor.transfer(attacker.account, donor.balance() - 10 ** 18)
+            attacker.weth.deposit(
+                {
+                    "from": attacker.account,
+                    "value": min(
+                        our_amount * biggest, attacker.account.balance() - 10 ** 18
+                    ),
+                }
+            )
+            attacker.stable.approve(pool, 2 ** 256 - 1, {"from": attacker.account})
+        elif sell_token == crv:
+            crv.transfer(
+                attacker.account,
+                our_amount * biggest,
+                {"from": accounts.at(CRV_WHALE, force=True)},
+            )
+        elif sell_token == convexToken:
+            convexToken.transfer(
+                attacker.account,
+                our_amount * biggest,
+                {"from": accounts.at(CVX_WHALE, force=True)},
+            )
+        else:
+            sell_token.transfer(
+                attacker.account,
+                min(our_amount * biggest, sell_token.balanceOf(rewards_whale)),
+                {"from": rewards_whale},
+            )
+        sell_token.approve(pool, 2 ** 256 - 1, {"from": attacker.account})
+        attacker.weth.approve(pool, 2 ** 256 - 1, {"from": attacker.account})
+
+    eth_price = eth_oracle.latestAnswer() / 1e8
+    print(
+        f"\nHarvest after {harvest_size}x sleep_time: honest profit {honest_profit / 1e18:,.4f}"
+    )
+    for size in ATTACK_SIZES:
+        txs = []
+        attacked = []
+        for pool, sell_token, our_amount in legs:
+            amount = min(our_amount * size, sell_token.balanceOf(attacker.account))
+            txs += attacker.front_run(pool, sell_token, amount)
+            attacked.append((pool, sell_token, amount))
+        harvest = strategy.harvest({"from": gov})
+        txs.append(harvest)
+
+        # value what the attacker got back over what they sold, at our oracle prices
+        attacker_eth = 0
+        for pool, sell_token, amount in attacked:
+            back_txs, returned = attacker.back_run(pool, sell_token)
+            txs += back_txs
+            gained = returned - amount
+            if pool in (attacker.crveth, attacker.cvxeth):
+                attacker_eth += gained * pool.price_oracle() / 1e36
+            elif pool == attacker.router:
+                attacker_eth += gained / 1e18
+            else:
+                attacker_eth += (
+                    gained
+                    * attacker.sushiswap.getAmountsOut(10 ** 18, [sell_token, WETH])[1]
+                    / 1e36
+                )
+
+        profit = harvest.events["Harvested"]["profit"]
+        lost = honest_profit - profit
+        print(
+            f"  attack {size}x: we report {profit / 1e18:,.4f} "
+            f"({lost / max(honest_profit, 1):.2%} less), attacker makes ${attacker_eth * eth_price:,.2f}"
+        )
+        assert (
+            profit <= honest_profit * 1.0001
+        )  # a few seconds of extra rewards at most
+        chain.undo(len(txs))
+
+    # with maxSlippage on and a floor under our bonus reward just below what we got honestly, the biggest attack moves
+    # every pool we sell into well past our 1% tolerance, so our harvest has to revert
+    start = chain.height
+    strategy.setMaxSlippage(100, {"from": gov})
+    if has_rewards:
+        strategy.setMinRewardsPrice(
+            rewards_token, rewards_price * 99 // 100, {"from": gov}
+        )
+    for pool, sell_token, our_amount in legs:
+        attacker.front_run(
+            pool,
+            sell_token,
+            min(our_amount * biggest, sell_token.balanceOf(attacker.account)),
+        )
+    with brownie.reverts():
+        strategy.harvest({"from": gov})
+
+    # and it's our checks that stop it: with them off, the same attack goes through
+    strategy.setMaxSlippage(0, {"from": gov})
+    if has_rewards:
+        strategy.setMinRewardsPrice(rewards_token, 0, {"from": gov})
+    strategy.harvest({"from": gov})
+    print("  biggest attack with maxSlippage at 1%: our harvest reverts")
+
+    # undo the attack and our settings, so nothing here leaks past this test
+    chain.undo(chain.height - start)
+    attacker.received.clear()
+    assert strategy.maxSlippage() == 0
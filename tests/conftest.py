@@ -1,16 +1,50 @@
 import pytest
 from brownie import config, Wei, Contract, chain, ZERO_ADDRESS
 import requests
+import json
+import os
+from pathlib import Path
+from utils import advance
+from fixture_profiler import FixtureProfiler
+
+# set this to True to deploy and set up our strategy once per session instead of once for every test module.
+# brownie then stops resetting the chain between modules, and each test reverts to the snapshot taken after our setup.
+use_session_strategy = False
 
 # Snapshots the chain before each test and reverts after test completion.
-@pytest.fixture(autouse=True)
-def isolation(fn_isolation):
-    pass
+if use_session_strategy:
+
+    @pytest.fixture(autouse=True)
+    def isolation(strategy, chain):
+        chain.snapshot()
+        yield
+        chain.revert()
+
+else:
+
+    @pytest.fixture(autouse=True)
+    def isolation(fn_isolation):
+        pass
+
+
+# our vault and strategy are deployed per module, unless we're using our session-wide strategy snapshot
+def strategy_scope(fixture_name, config):
+    if use_session_strategy:
+        return "session"
+    return "module"
 
 
 # set this for if we want to use tenderly or not; mostly helpful because with brownie.reverts fails in tenderly forks.
 use_tenderly = False
 
+# set this for if we want to cache the addresses our fixtures look up on-chain (poolInfo, curve registries) to disk.
+# this only saves those lookups; the fork's storage, code and balances still come from its RPC. what we cache is only
+# valid on one block, so it also needs pinned_fork_block set to the block our mainnet-fork starts from (pin it in the
+# mainnet-fork cmd_settings). we keep one file per pid for that block, and runs that start anywhere else skip the cache.
+use_fork_cache = False
+pinned_fork_block = None
+fork_cache_dir = Path(__file__).resolve().parent.parent / ".fork_cache"
+
 
 ################################################## TENDERLY DEBUGGING ##################################################
 
@@ -28,6 +62,74 @@ def tenderly_fork(web3, chain):
     print(f"https://dashboard.tenderly.co/yearn/yearn-web/fork/{fork_id}")
 
 
+############################################## PROFILING AND BENCHMARKS ##############################################
+
+# run with `brownie test --profile-fixtures build/fixture_profile.json` to see which fixtures and test phases are slowest
+def pytest_addoption(parser):
+    parser.addoption(
+        "--profile-fixtures",
+        action="store",
+        default=None,
+        metavar="path",
+        help="record time and RPC usage per fixture and test phase, and write it to this JSON file",
+    )
+    # gas benchmarks live in tests/benchmarks, see the conftest there
+    parser.addoption(
+        "--gas-benchmark",
+        action="store_true",
+        help="run our gas benchmarks and fail on regressions against the baseline",
+    )
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        help="write this run's gas benchmark results to the baseline",
+    )
+    parser.addoption(
+        "--gas-threshold",
+        action="store",
+        type=float,
+        default=None,
+        help="allowed gas increase over baseline as a fraction (default from the baseline file)",
+    )
+
+
+def pytest_configure(config):
+    output_path = config.getoption("--profile-fixtures")
+    if output_path:
+        config.pluginmanager.register(FixtureProfiler(output_path), "fixture_profiler")
+
+
+################################################## FORK STATE CACHE ##################################################
+
+# the block our fork starts from. this is autouse so we read it before any of our fixtures mine a block.
+@pytest.fixture(scope="session", autouse=True)
+def fork_block(chain):
+    yield chain.height
+
+
+# whether this run started on pinned_fork_block, so anything we saved from an earlier run on it still holds
+@pytest.fixture(scope="session")
+def on_pinned_fork(fork_block):
+    yield pinned_fork_block is not None and fork_block == pinned_fork_block
+
+
+# this is filled in by our fixtures the first time we run on our pinned fork block, and read back on every run after that
+@pytest.fixture(scope="session")
+def fork_cache(chain, pid, fork_block, on_pinned_fork):
+    use_cache = use_fork_cache and on_pinned_fork
+    cache_file = fork_cache_dir / f"{chain.id}-{fork_block}-{pid}.json"
+    cache = {}
+    if use_cache and cache_file.exists():
+        cache = json.loads(cache_file.read_text())
+    yield cache
+    if use_cache and cache:
+        # write to a temp file first, since parallel workers may finish with the same cache file at the same time
+        fork_cache_dir.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(cache, indent=2, sort_keys=True))
+        os.replace(tmp_file, cache_file)
+
+
 ################################################ UPDATE THINGS BELOW HERE ################################################
 
 
@@ -252,47 +354,51 @@ if chain_used == 1:  # mainnet
         # this is the token that we are farming and selling for more of our want.
         yield Contract("0xD533a949740bb3306d119CC777fa900bA034cd52")
 
+    # everything we need from the booster comes from poolInfo, so only read it once per fork block
     @pytest.fixture(scope="session")
-    def token(pid, booster):
+    def pool_info(pid, booster, fork_cache):
+        if "pool_info" not in fork_cache:
+            fork_cache["pool_info"] = list(booster.poolInfo(pid))
+        yield fork_cache["pool_info"]
+
+    @pytest.fixture(scope="session")
+    def token(pool_info):
         # this should be the address of the ERC-20 used by the strategy/vault
-        token_address = booster.poolInfo(pid)[0]
+        token_address = pool_info[0]
         yield Contract(token_address)
 
     @pytest.fixture(scope="session")
-    def cvxDeposit(booster, pid):
+    def cvxDeposit(pool_info):
         # this should be the address of the convex deposit token
-        cvx_address = booster.poolInfo(pid)[1]
+        cvx_address = pool_info[1]
         yield Contract(cvx_address)
 
     @pytest.fixture(scope="session")
-    def rewardsContract(pid, booster):
-        rewardsContract = booster.poolInfo(pid)[3]
+    def rewardsContract(pool_info):
+        rewardsContract = pool_info[3]
         yield Contract(rewardsContract)
 
     # gauge for the curve pool
     @pytest.fixture(scope="session")
-    def gauge(pid, booster):
-        gauge = booster.poolInfo(pid)[2]
+    def gauge(pool_info):
+        gauge = pool_info[2]
         yield Contract(gauge)
 
     # curve deposit pool
     @pytest.fixture(scope="session")
-    def pool(token, curve_registry, curve_cryptoswap_registry, old_pool):
+    def pool(token, curve_registry, curve_cryptoswap_registry, old_pool, fork_cache):
         if old_pool == ZERO_ADDRESS:
-            if curve_registry.get_pool_from_lp_token(token) == ZERO_ADDRESS:
-                if (
-                    curve_cryptoswap_registry.get_pool_from_lp_token(token)
-                    == ZERO_ADDRESS
-                ):
-                    poolContract = token
-                else:
+            if "pool" not in fork_cache:
+                poolAddress = curve_registry.get_pool_from_lp_token(token)
+                if poolAddress == ZERO_ADDRESS:
                     poolAddress = curve_cryptoswap_registry.get_pool_from_lp_token(
                         token
                     )
-                    poolContract = Contract(poolAddress)
+                fork_cache["pool"] = poolAddress
+            if fork_cache["pool"] == ZERO_ADDRESS:
+                poolContract = token
             else:
-                poolAddress = curve_registry.get_pool_from_lp_token(token)
-                poolContract = Contract(poolAddress)
+                poolContract = Contract(fork_cache["pool"])
         else:
             poolContract = Contract(old_pool)
         yield poolContract
@@ -301,6 +407,19 @@ if chain_used == 1:  # mainnet
     def gasOracle():
         yield Contract("0xb5e1CAcB567d98faaDB60a1fD4820720141f064F")
 
+    # these are the price sources our strategy reads in claimableProfitInUsdt
+    @pytest.fixture(scope="session")
+    def eth_oracle():
+        yield Contract("0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419")
+
+    @pytest.fixture(scope="session")
+    def crveth():
+        yield Contract("0x8301AE4fc9c624d1D396cbDAa1ed877821D7C511")
+
+    @pytest.fixture(scope="session")
+    def cvxeth():
+        yield Contract("0xB576491F1E6e5E62f1d8F26062Ee822B40B0E0d4")
+
     # Define any accounts in this section
     # for live testing, governance is the strategist MS; we will update this before we endorse
     # normal gov is ychad, 0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52
@@ -334,7 +453,7 @@ if chain_used == 1:  # mainnet
     def strategist(accounts):
         yield accounts.at("0x16388463d60FFE0661Cf7F1f31a7D658aC790ff7", force=True)
 
-    @pytest.fixture(scope="module")
+    @pytest.fixture(scope=strategy_scope)
     def vault(pm, gov, rewards, guardian, management, token, chain, vault_address):
         if vault_address == ZERO_ADDRESS:
             Vault = pm(config["dependencies"][0]).Vault
@@ -342,14 +461,13 @@ if chain_used == 1:  # mainnet
             vault.initialize(token, gov, rewards, "", "", guardian)
             vault.setDepositLimit(2 ** 256 - 1, {"from": gov})
             vault.setManagement(management, {"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            advance(1)
         else:
             vault = Contract(vault_address)
         yield vault
 
     # replace the first value with the name of your strategy
-    @pytest.fixture(scope="module")
+    @pytest.fixture(scope=strategy_scope)
     def strategy(
         contract_name,
         strategist,
@@ -407,8 +525,7 @@ if chain_used == 1:  # mainnet
         if is_convex:
             # earmark rewards if we are using a convex strategy
             booster.earmarkRewards(pid, {"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            advance(1)
 
             # do slightly different if vault is existing or not
             if vault_address == ZERO_ADDRESS:
@@ -416,8 +533,7 @@ if chain_used == 1:  # mainnet
                     strategy, 10_000, 0, 2 ** 256 - 1, 1_000, {"from": gov}
                 )
                 print("New Vault, Convex Strategy")
-                chain.sleep(1)
-                chain.mine(1)
+                advance(1)
             else:
                 if vault.withdrawalQueue(1) == ZERO_ADDRESS:  # only has convex
                     old_strategy = Contract(vault.withdrawalQueue(0))
@@ -441,8 +557,7 @@ if chain_used == 1:  # mainnet
                     strategy, 10_000, 0, 2 ** 256 - 1, 1_000, {"from": gov}
                 )
                 print("New Vault, Curve Strategy")
-                chain.sleep(1)
-                chain.mine(1)
+                advance(1)
             else:
                 if vault.withdrawalQueue(1) == ZERO_ADDRESS:  # only has convex
                     other_strat = Contract(vault.withdrawalQueue(0))
@@ -461,8 +576,7 @@ if chain_used == 1:  # mainnet
                     # turn off health check just in case it's a big harvest
                     other_strat.setDoHealthCheck(False, {"from": gov})
                     other_strat.harvest({"from": gov})
-                    chain.sleep(1)
-                    chain.mine(1)
+                    advance(1)
                 else:
                     other_strat = Contract(vault.withdrawalQueue(1))
                     # remove 50% of funds from our convex strategy
@@ -474,8 +588,7 @@ if chain_used == 1:  # mainnet
                     except:
                         print("This strategy doesn't have health check")
                     other_strat.harvest({"from": gov})
-                    chain.sleep(1)
-                    chain.mine(1)
+                    advance(1)
 
                     # give our curve strategy 50% of our debt and migrate it
                     old_strategy = Contract(vault.withdrawalQueue(0))
@@ -507,12 +620,10 @@ if chain_used == 1:  # mainnet
                 tx.events["Harvested"]["profit"] / 1e18,
             )
         if try_blocks:
-            chain.sleep(
-                1
-            )  # if we're close to Thursday midnight UTC, sleeping might kill our ability to earn from old gauges
+            # if we're close to Thursday midnight UTC, sleeping might kill our ability to earn from old gauges
+            advance(1)
         else:
-            chain.sleep(10 * 3600)  # normalize share price
-        chain.mine(1)
+            advance(10 * 3600)  # normalize share price
 
         # print assets in each strategy
         if vault_address != ZERO_ADDRESS and other_strat != ZERO_ADDRESS:
@@ -521,7 +632,6 @@ if chain_used == 1:  # mainnet
 
         yield strategy
 
-
 elif chain_used == 250:  # only fantom so far and convex doesn't exist there
 
     @pytest.fixture(scope="session")
@@ -0,0 +1,109 @@
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+from brownie import web3
+
+# pytest plugin that records wall time, RPC calls, and RPC bytes for every fixture setup and every test phase.
+# enable it with `brownie test --profile-fixtures <path>`; it prints a ranked report and writes the full results as JSON.
+class FixtureProfiler:
+    def __init__(self, output_path, top=25):
+        self.output_path = Path(output_path)
+        self.top = top
+        self.rpc_calls = 0
+        self.rpc_bytes = 0
+        self.fixtures = defaultdict(_empty_stats)
+        self.phases = defaultdict(dict)
+
+    # count every request that goes through our provider, including brownie's direct evm_* calls
+    def _patch_provider(self):
+        provider = web3.provider
+        if provider is None or getattr(provider, "_profiled", False):
+            return
+        make_request = provider.make_request
+
+        def profiled_request(method, params):
+            response = make_request(method, params)
+            self.rpc_calls += 1
+            self.rpc_bytes += len(json.dumps([method, params], default=str))
+            self.rpc_bytes += len(json.dumps(response, default=str))
+            return response
+
+        provider.make_request = profiled_request
+        provider._profiled = True
+        # web3 caches its middleware-wrapped make_request, so clear it to make sure our wrapper gets picked up
+        provider._request_func_cache = (None, None)
+
+    def _snapshot(self):
+        self._patch_provider()
+        return time.perf_counter(), self.rpc_calls, self.rpc_bytes
+
+    def _add(self, stats, start):
+        started, calls, sent = start
+        stats["calls"] += 1
+        stats["seconds"] += time.perf_counter() - started
+        stats["rpc_calls"] += self.rpc_calls - calls
+        stats["rpc_bytes"] += self.rpc_bytes - sent
+
+    # pytest sets up a fixture's dependencies before this hook runs, so these numbers only cover the fixture itself
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = self._snapshot()
+        yield
+        self._add(self.fixtures[fixturedef.argname], start)
+
+    def _phase(self, item, phase):
+        start = self._snapshot()
+        yield
+        stats = self.phases[item.nodeid].setdefault(phase, _empty_stats())
+        self._add(stats, start)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._phase(item, "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase(item, "call")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._phase(item, "teardown")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        write = terminalreporter.write_line
+        terminalreporter.section("fixture profile")
+        ranked = sorted(self.fixtures.items(), key=lambda x: -x[1]["seconds"])
+        write(
+            f"{'fixture':<32}{'setups':>8}{'seconds':>11}{'rpc calls':>11}{'rpc kB':>10}"
+        )
+        for name, stats in ranked[: self.top]:
+            write(
+                f"{name:<32}{stats['calls']:>8}{stats['seconds']:>11.2f}"
+                f"{stats['rpc_calls']:>11}{stats['rpc_bytes'] / 1024:>10.1f}"
+            )
+
+        terminalreporter.section("test phase profile")
+        totals = defaultdict(_empty_stats)
+        for phases in self.phases.values():
+            for phase, stats in phases.items():
+                for key in stats:
+                    totals[phase][key] += stats[key]
+        for phase in ("setup", "call", "teardown"):
+            stats = totals[phase]
+            write(
+                f"{phase:<32}{stats['calls']:>8}{stats['seconds']:>11.2f}"
+                f"{stats['rpc_calls']:>11}{stats['rpc_bytes'] / 1024:>10.1f}"
+            )
+        write(f"full results written to {self.output_path}")
+
+    def pytest_sessionfinish(self, session):
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        results = {"fixtures": self.fixtures, "tests": self.phases}
+        self.output_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+def _empty_stats():
+    return {"calls": 0, "seconds": 0.0, "rpc_calls": 0, "rpc_bytes": 0}
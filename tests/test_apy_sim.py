@@ -0,0 +1,73 @@
+import numpy as np
+from scripts.apy_sim import (
+    DEFAULT_INTERVALS,
+    DEFAULT_TVLS,
+    SECONDS_PER_YEAR,
+    Market,
+    Pool,
+    load_market,
+    load_pool,
+    simulate_apy,
+    sweep,
+)
+
+# a pool paying 0.5 CRV a second with $100m staked, priced around where they've been
+POOL = Pool("synthetic", 0.5, 100e6)
+MARKET = Market(
+    0.8, 4.0, 3_000.0, 0.03, 20e6, 2e6, 20_000.0, 0.0026, 0.0026, 0.0005, 50 * 10 ** 9
+)
+
+# sweep harvest cadence against TVL, and make sure the tradeoffs point the way they should
+def test_apy_sim():
+    result, best = sweep([POOL, POOL._replace(crv_per_second=0)], MARKET)
+    assert result.net_apy.shape == (2, len(DEFAULT_TVLS), len(DEFAULT_INTERVALS))
+    print(
+        f"\n{POOL.name}: best interval (hours) by TVL:",
+        dict(zip(DEFAULT_TVLS / 1e6, best[0] / 3600)),
+    )
+
+    # gas is a fixed cost per harvest, so harvesting a small strategy every hour should lose to waiting
+    assert result.net_apy[0, 0, 0] < result.net_apy[0, 0, -1]
+    # and bigger strategies should harvest at least as often as smaller ones
+    assert np.all(np.diff(best[0]) <= 0)
+    assert np.all(result.slippage >= 0) and np.all(result.gas > 0)
+
+    # with nothing to harvest, every harvest just burns gas
+    assert np.all(result.net_apy[1] < 0)
+    assert np.all(best[1] == DEFAULT_INTERVALS[-1])
+
+    # with no keep, fees, price impact or gas, we just compound our gross APR
+    free = MARKET._replace(
+        crveth_crv_reserve=1e30,
+        cvxeth_cvx_reserve=1e30,
+        stable_weth_reserve=1e30,
+        crveth_fee=0,
+        cvxeth_fee=0,
+        stable_fee=0,
+        gas_price=0,
+    )
+    result = simulate_apy(POOL, free, 10e6, 86400, keep_crv=0)
+    harvests = SECONDS_PER_YEAR / 86400
+    assert np.isclose(
+        result.net_apy, (1 + result.gross_apr / harvests) ** harvests - 1, rtol=1e-9
+    )
+
+
+# our pool and market load from the fork, and feed straight into a sweep
+def test_apy_sim_loaders(strategy, amount, token, vault, whale, gov, chain):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    pool = load_pool(strategy)
+    assert pool.name == strategy.name()
+    assert pool.crv_per_second > 0 and pool.staked_usd > 0
+    market = load_market(50 * 10 ** 9)
+    assert market.crv_price > 0 and market.cvx_price > 0 and market.eth_price > 0
+    assert 0 < market.cvx_per_crv <= 1
+
+    result, best = sweep([pool], market)
+    assert np.all(np.isfinite(result.net_apy))
+    assert np.all(np.isin(best, DEFAULT_INTERVALS))
@@ -0,0 +1,73 @@
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+from scripts.batch_harvest import measure_gas_saved, triggered
+
+# harvest our strategy and a clone together through our BatchHarvester, and make sure that's cheaper than one at a time
+def test_batch_harvest(
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    keeper,
+    rewards,
+    contract_name,
+    BatchHarvester,
+    pid,
+    amount,
+    pool,
+    strategy_name,
+    sleep_time,
+    is_clonable,
+):
+    if not is_clonable:
+        return
+
+    # split our vault's debt between our strategy and a clone
+    tx = strategy.cloneConvex3CrvRewards(
+        vault,
+        strategist,
+        rewards,
+        keeper,
+        pid,
+        pool,
+        strategy_name,
+        {"from": gov},
+    )
+    clone = contract_name.at(tx.return_value)
+    strategies = [strategy, clone]
+    vault.updateStrategyDebtRatio(strategy, 5000, {"from": gov})
+    vault.addStrategy(clone, 5000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+
+    # our harvester needs to be the keeper on both
+    harvester = keeper.deploy(BatchHarvester)
+    for s in strategies:
+        s.setKeeper(harvester, {"from": gov})
+    with brownie.reverts("!keeper"):
+        harvester.harvest(strategies, {"from": whale})
+
+    ## deposit to the vault after approving, and get funds into both strategies
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    for s in strategies:
+        s.harvest({"from": gov})
+    assert clone.estimatedTotalAssets() > 0
+
+    # simulate earnings, then force both to trigger
+    advance(sleep_time)
+    for s in strategies:
+        s.setForceHarvestTriggerOnce(True, {"from": gov})
+    assert triggered(strategies) == strategies
+
+    report, tx = measure_gas_saved(harvester, strategies, keeper, gov)
+    assert "HarvestFailed" not in tx.events
+    for s in strategies:
+        assert vault.strategies(s)["lastReport"] == tx.timestamp
+
+    # the first strategy warms everything up, so the second one should save gas
+    assert report[1]["saved"] > 0
+    assert sum(row["saved"] for row in report) > 0
@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+from scripts.buffer_sizer import (
+    Withdrawals,
+    candidate_buffers,
+    exceedance,
+    fit_lognormal,
+    load_withdrawals,
+    recommend,
+    simulate_buffers,
+)
+from scripts.event_store import EventStore
+from utils import advance
+
+# our buffer replay should match walking through each withdrawal by hand, and its recommendation should trade gas
+# against idle yield the way we'd expect
+def test_buffer_sizer():
+    # two years of lognormal withdrawals, about 40 a day
+    rng = np.random.default_rng(7)
+    count = 30_000
+    timestamps = 1_650_000_000 + np.cumsum(rng.exponential(2_160, count))
+    amounts = rng.lognormal(np.log(5_000e18), 1.5, count)
+    withdrawals = Withdrawals(timestamps, amounts)
+    refills = timestamps[::500] + 1
+    apr = 0.05
+    cost = 100e18  # a $100 unstake, in a $1 want
+
+    mu, sigma = fit_lognormal(amounts)
+    assert abs(mu - np.log(5_000e18)) < 0.05 and abs(sigma - 1.5) < 0.05
+    assert abs(exceedance(np.exp(mu), mu, sigma) - 0.5) < 1e-9
+
+    buffers = [0, 1e22, 1e23]
+    costs = simulate_buffers(withdrawals, buffers, apr, cost, refills)
+    for lane, buffer in enumerate(buffers):
+        level, held, unstakes, next_refill = buffer, 0.0, 0, 0
+        for i in range(count):
+            if next_refill < len(refills) and refills[next_refill] <= timestamps[i]:
+                while (
+                    next_refill < len(refills) and refills[next_refill] <= timestamps[i]
+                ):
+                    next_refill += 1
+                level = buffer
+            if i > 0:
+                held += level * (timestamps[i] - timestamps[i - 1])
+            if amounts[i] > level:
+                unstakes += 1
+                level = buffer
+            else:
+                level -= amounts[i]
+        assert costs.unstakes[lane] == unstakes
+        assert np.isclose(costs.idle[lane], held * apr / 31_536_000)
+    assert costs.unstakes[0] == count
+
+    start = time.perf_counter()
+    best, costs = recommend(withdrawals, apr, cost, refills)
+    print(
+        f"\nScored {len(costs.total)} buffers over {count} withdrawals in "
+        f"{time.perf_counter() - start:.2f}s: best {best / 1e18:,.0f}"
+    )
+    assert costs.total.min() <= costs.total[0]
+    assert costs.total.min() < costs.total[-1]
+    assert 0 < best < candidate_buffers(withdrawals)[-1]
+
+    # pricier unstakes should want a bigger buffer, and a higher yield a smaller one
+    assert recommend(withdrawals, apr, cost * 10, refills)[0] >= best
+    assert recommend(withdrawals, apr * 10, cost, refills)[0] <= best
+
+
+# the store's withdrawals feed straight into our replay, and our recommendation applies with setDepositParams()
+def test_buffer_sizer_from_store(
+    gov, token, vault, whale, strategy, chain, amount, tmp_path
+):
+    store = EventStore(tmp_path / "events.db")
+    store.add_source(vault, "vault", chain.height + 1)
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    shares = vault.balanceOf(whale)
+    withdrawn = []
+    for divisor in [100, 50, 20]:
+        chain.sleep(3600)
+        before = token.balanceOf(whale)
+        vault.withdraw(shares // divisor, {"from": whale})
+        withdrawn.append(token.balanceOf(whale) - before)
+
+    store.index()
+    withdrawals = load_withdrawals(store, vault)
+    store.close()
+    assert np.allclose(withdrawals.amounts, withdrawn, rtol=1e-12, atol=0)
+    assert np.all(np.diff(withdrawals.timestamps) >= 3600)
+
+    best, _ = recommend(withdrawals, 0.05, 10 ** 18, buffers=[0] + withdrawn)
+    strategy.setDepositParams(strategy.minDeposit(), best, {"from": gov})
+    assert strategy.idleBuffer() == best
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test changing the debtRatio on a strategy and then harvesting it
 def test_change_debt(
@@ -39,8 +40,7 @@ def test_change_debt(
     assert strategy.estimatedTotalAssets() <= startingStrategy
 
     # simulate one day of earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # set DebtRatio back to 100%
     vault.updateStrategyDebtRatio(strategy, currentDebt, {"from": gov})
@@ -55,8 +55,7 @@ def test_change_debt(
     assert new_assets >= old_assets or math.isclose(new_assets, old_assets, abs_tol=5)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -0,0 +1,59 @@
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+from scripts.claimable_profit import claimable_profits
+
+# our batched claimableProfitInUsdt() should match the on-chain view for every clone
+def test_claimable_profit(
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    keeper,
+    rewards,
+    chain,
+    contract_name,
+    pid,
+    amount,
+    pool,
+    strategy_name,
+    sleep_time,
+    is_clonable,
+):
+    if not is_clonable:
+        return
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    # add a couple of clones; they won't have any funds, but should still be valued correctly
+    strategies = [strategy]
+    for i in range(2):
+        tx = strategy.cloneConvex3CrvRewards(
+            vault,
+            strategist,
+            rewards,
+            keeper,
+            pid,
+            pool,
+            strategy_name,
+            {"from": gov},
+        )
+        strategies.append(contract_name.at(tx.return_value))
+
+    # simulate earnings
+    advance(sleep_time)
+
+    block = chain.height
+    profits, read_block = claimable_profits(strategies, block)
+    assert read_block == block
+    for clone, profit in zip(strategies, profits):
+        print("\nBatched claimable profit:", profit / 1e6)
+        assert profit == clone.claimableProfitInUsdt(block_identifier=block)
+    assert profits[0] > 0
@@ -1,6 +1,7 @@
 import brownie
 from brownie import Wei, accounts, Contract, config, ZERO_ADDRESS
 import math
+from utils import advance
 
 # test cloning our strategy, make sure the cloned strategy still works just fine by sending funds to it
 def test_cloning(
@@ -226,8 +227,7 @@ def test_cloning(
         print("\nAssets Staked: ", newStrategy.stakedBalance() / 1e18)
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest after a day, store new asset amount
     newStrategy.harvest({"from": gov})
@@ -247,8 +247,7 @@ def test_cloning(
     )
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
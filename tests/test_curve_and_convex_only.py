@@ -2,6 +2,7 @@ import brownie
 from brownie import Wei, accounts, Contract, config, ZERO_ADDRESS
 import pytest
 import math
+from utils import advance
 
 # set our rewards to nothing, then turn them back on
 def test_update_to_zero_then_back(
@@ -100,8 +101,7 @@ def test_update_to_zero_then_back(
     assert token.balanceOf(newStrategy) == 0
     assert newStrategy.estimatedTotalAssets() > 0
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest after a day, store new asset amount
     tx = newStrategy.harvest({"from": gov})
@@ -142,14 +142,12 @@ def test_update_to_zero_then_back(
     new_pps = vault.pricePerShare()
     old_assets_dai = vault.totalAssets()
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest with our new rewards token attached
     tx = newStrategy.harvest({"from": gov})
     rewards_off_profit = tx.events["Harvested"]["profit"]
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     new_assets_dai = vault.totalAssets()
 
     # Display estimated APR
@@ -176,8 +174,7 @@ def test_update_to_zero_then_back(
     new_pps = vault.pricePerShare()
     old_assets_dai = vault.totalAssets()
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest with our new rewards token attached
     newStrategy.setDoHealthCheck(False, {"from": gov})
@@ -206,8 +203,7 @@ def test_update_to_zero_then_back(
         print("Rewards token is accumulating as expected\n")
 
     # sleep so we free locked profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # withdraw and confirm what happened
     vault.withdraw({"from": whale})
@@ -317,14 +313,12 @@ def test_update_from_zero_to_off(
     assert token.balanceOf(newStrategy) == 0
     assert newStrategy.estimatedTotalAssets() > 0
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest after a day, store new asset amount
     tx = newStrategy.harvest({"from": gov})
     rewards_on_profit = tx.events["Harvested"]["profit"]
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     new_assets_dai = vault.totalAssets()
     # we can't use strategyEstimated Assets because the profits are sent to the vault
     assert new_assets_dai >= old_assets_dai
@@ -360,14 +354,12 @@ def test_update_from_zero_to_off(
     new_pps = vault.pricePerShare()
     old_assets_dai = vault.totalAssets()
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest with our new rewards token attached
     tx = newStrategy.harvest({"from": gov})
     rewards_off_profit = tx.events["Harvested"]["profit"]
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     new_assets_dai = vault.totalAssets()
 
     # Display estimated APR
@@ -394,14 +386,12 @@ def test_update_from_zero_to_off(
     # track our new pps and assets
     old_assets_dai = vault.totalAssets()
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest with our new rewards token attached
     tx = newStrategy.harvest({"from": gov})
     rewards_still_off_profit = tx.events["Harvested"]["profit"]
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     new_assets_dai = vault.totalAssets()
 
     # Display estimated APR
@@ -419,8 +409,7 @@ def test_update_from_zero_to_off(
         assert rewards_on_profit > rewards_off_profit
         print("Rewards token performing as expected\n")
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # withdraw and confirm what happened
     vault.withdraw({"from": whale})
@@ -510,12 +499,10 @@ def test_change_rewards(
     # harvest, store asset amount
     chain.sleep(1)
     tx = newStrategy.harvest({"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     old_assets_dai = vault.totalAssets()
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest after a day, store new asset amount
     newStrategy.harvest({"from": gov})
@@ -609,16 +596,14 @@ def test_check_rewards(
             proxy.claimRewards(gauge, rewards_token, {"from": strategy})
             assert rewards_token.balanceOf(strategy) > 0
 
-        chain.sleep(sleep_time)
-        chain.mine(1)
+        advance(sleep_time)
         tx = strategy.harvest({"from": gov})
         normal_profits = tx.events["Harvested"]["profit"]
         print("Normal Profit:", normal_profits / 1e18)
 
         # check after our whale donates
         rewards_token.transfer(strategy, rewards_amount, {"from": rewards_whale})
-        chain.sleep(sleep_time)
-        chain.mine(1)
+        advance(sleep_time)
         strategy.setDoHealthCheck(False, {"from": gov})
         tx = strategy.harvest({"from": gov})
         rewards_profits = tx.events["Harvested"]["profit"]
@@ -651,45 +636,39 @@ def test_weird_amounts(
     strategy.setOptimal(0, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # take 100% of our CRV to the voter
     if is_convex:
         strategy.setKeep(10000, 0, gov, {"from": gov})
     else:
         strategy.setKeepCRV(10000, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     strategy.harvest({"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # switch to USDC, want to not have any profit tho
     strategy.setOptimal(1, {"from": gov})
     strategy.harvest({"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # switch to USDT, want to not have any profit tho
     strategy.setOptimal(2, {"from": gov})
     strategy.harvest({"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # take 0% of our CRV to the voter
     if is_convex:
         strategy.setKeep(0, 0, gov, {"from": gov})
     else:
         strategy.setKeepCRV(0, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     strategy.harvest({"from": gov})
 
 
@@ -736,8 +715,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(0, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit DAI (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -745,8 +723,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(1, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDC (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -754,8 +731,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(2, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDT (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -771,8 +747,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(0, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit DAI (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -780,8 +755,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(1, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDC (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -789,8 +763,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(2, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDT (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -799,8 +772,7 @@ def test_more_rewards_stuff(
         strategy.setKeep(10000, 0, gov, {"from": gov})
     else:
         strategy.setKeepCRV(10000, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     tx = strategy.harvest(
         {"from": gov}
     )  # this one seems to randomly fail sometimes, adding sleep/mine before fixed it, likely because of updating the view variable?
@@ -817,8 +789,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(0, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit DAI (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -826,8 +797,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(1, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDC (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -835,8 +805,7 @@ def test_more_rewards_stuff(
     strategy.setOptimal(2, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDT (rewards off):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -852,16 +821,14 @@ def test_more_rewards_stuff(
     strategy.setOptimal(0, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     strategy.harvest({"from": gov})
 
     # set our optimal to USDC with rewards on
     strategy.setOptimal(1, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit DAI (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
 
@@ -869,14 +836,12 @@ def test_more_rewards_stuff(
     strategy.setOptimal(2, {"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDC (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # can't set to 4
     with brownie.reverts():
@@ -887,7 +852,101 @@ def test_more_rewards_stuff(
         strategy.setKeep(0, 0, gov, {"from": gov})
     else:
         strategy.setKeepCRV(0, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     tx = strategy.harvest({"from": gov})
     print("Harvest Profit USDT (rewards on):", tx.events["Harvested"]["profit"] / 1e18)
+
+
+# sell our WETH on curve's tricrypto2 instead of UniV3, then switch back
+def test_curve_route(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    is_convex,
+    sleep_time,
+):
+    # only our convex strategy has this
+    if not is_convex:
+        return
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+
+    # turning on our curve route should put us on USDT, and keep us there
+    strategy.setOptimal(0, {"from": gov})
+    strategy.setUseCurveRoute(True, {"from": gov})
+    assert strategy.targetStable() == "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+    with brownie.reverts("curve route is USDT only"):
+        strategy.setOptimal(0, {"from": gov})
+    strategy.setOptimal(2, {"from": gov})
+
+    # sleep to get some profit
+    advance(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    print("Harvest Profit (curve route):", tx.events["Harvested"]["profit"] / 1e18)
+    assert tx.events["Harvested"]["profit"] > 0
+
+    # switch back to UniV3, and we can pick any stable again
+    strategy.setUseCurveRoute(False, {"from": gov})
+    strategy.setOptimal(1, {"from": gov})
+    advance(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    print("Harvest Profit (UniV3 route):", tx.events["Harvested"]["profit"] / 1e18)
+    assert tx.events["Harvested"]["profit"] > 0
+
+
+# harvests should skip claiming and selling anything below our dust thresholds
+def test_dust_thresholds(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    is_convex,
+    sleep_time,
+    accounts,
+):
+    # only our convex strategy has this
+    if not is_convex:
+        return
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+
+    # can't set thresholds bigger than we store
+    with brownie.reverts():
+        strategy.setDustThresholds(2 ** 80, 0, 0, {"from": gov})
+
+    # with huge thresholds we shouldn't claim or sell anything (unless we have bonus rewards to claim)
+    advance(sleep_time)
+    strategy.setDustThresholds(1e24, 1e24, 1e24, {"from": gov})
+    claimable = strategy.claimableBalance()
+    assert claimable > 0
+    # stables we already hold (from a donation, say) still get deposited, even though we don't sell anything
+    usdt = Contract("0xdAC17F958D2ee523a2206206994597C13D831ec7")
+    three_pool = accounts.at("0xbEbc44782C7dB0a1A60Cb6fe97d0b483032FF1C7", force=True)
+    usdt.transfer(strategy, 1_000 * 10 ** 6, {"from": three_pool})
+    tx = strategy.harvest({"from": gov})
+    print("\nDust harvest gas:", tx.gas_used)
+    assert usdt.balanceOf(strategy) == 0
+    if not strategy.hasRewards():
+        assert "RewardPaid" not in tx.events
+        assert strategy.claimableBalance() >= claimable
+
+    # back to our defaults, now we should claim and sell everything
+    strategy.setDustThresholds(1e17, 1e17, 1e15, {"from": gov})
+    advance(1)
+    tx = strategy.harvest({"from": gov})
+    print("Normal harvest gas:", tx.gas_used)
+    assert tx.events["Harvested"]["profit"] > 0
+    assert strategy.claimableBalance() == 0
@@ -0,0 +1,43 @@
+import brownie
+from brownie import Contract
+from brownie import config
+import math
+from utils import advance
+from scripts.cvx_mint import cvx_minted, mintable_cvx
+
+# check our off-chain CVX mint model against what the CVX token actually mints when we claim
+def test_cvx_mint(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    chain,
+    amount,
+    rewardsContract,
+    convexToken,
+    sleep_time,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    # simulate earnings
+    advance(sleep_time)
+
+    # anyone can claim for our strategy; CVX is minted based on supply right before the claim
+    supply_before = convexToken.totalSupply()
+    cvx_before = convexToken.balanceOf(strategy)
+    tx = rewardsContract.getReward(strategy, False, {"from": gov})
+    crv_claimed = tx.events["RewardPaid"]["reward"]
+    cvx_received = convexToken.balanceOf(strategy) - cvx_before
+    print("\nCRV claimed:", crv_claimed / 1e18, "CVX minted:", cvx_received / 1e18)
+    assert crv_claimed > 0
+
+    # our exact model should match to the wei, and our float model should be very close
+    assert mintable_cvx(crv_claimed, supply_before) == cvx_received
+    assert math.isclose(
+        cvx_minted(supply_before, crv_claimed), cvx_received, rel_tol=1e-9
+    )
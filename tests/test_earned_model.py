@@ -0,0 +1,56 @@
+import brownie
+from brownie import Contract
+from utils import advance
+from scripts.earned_model import EarnedTracker
+
+# our incremental earned() model should match convex to the wei, and only re-read a pool when it changes
+def test_earned_model(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    chain,
+    amount,
+    rewardsContract,
+    sleep_time,
+    has_rewards,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount // 2, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    tracker = EarnedTracker([strategy])
+    pools = tracker.pools[strategy.address]
+    assert pools[0].address == rewardsContract.address
+    assert len(pools) == (2 if has_rewards else 1)
+    seeded = tracker.resyncs
+
+    # as time passes our predictions keep matching each pool's earned(), without re-reading anything
+    for _ in range(3):
+        advance(sleep_time // 3)
+        block = chain.height
+        predicted = tracker.earned(strategy, chain[block].timestamp)
+        actual = [pool.earned(strategy, block_identifier=block) for pool in pools]
+        assert predicted == actual
+        assert tracker.claimable_balance(
+            strategy, chain[block].timestamp
+        ) == strategy.claimableBalance(block_identifier=block)
+        tracker.sync(block)
+        assert tracker.resyncs == seeded
+
+    # depositing more stakes in our pool, so we should re-seed it and still match
+    vault.deposit(amount // 2, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+    changed = tracker.sync()
+    assert rewardsContract.address in changed
+    assert tracker.resyncs > seeded
+    advance(sleep_time)
+    block = chain.height
+    tracker.sync(block)
+    assert tracker.earned(strategy, chain[block].timestamp) == [
+        pool.earned(strategy, block_identifier=block) for pool in pools
+    ]
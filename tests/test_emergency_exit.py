@@ -2,6 +2,7 @@ import math
 import brownie
 from brownie import Contract
 from brownie import config
+from utils import advance
 
 # test that emergency exit works properly
 def test_emergency_exit(
@@ -25,8 +26,7 @@ def test_emergency_exit(
     chain.sleep(1)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     chain.sleep(1)
     strategy.harvest({"from": gov})
     chain.sleep(1)
@@ -39,8 +39,7 @@ def test_emergency_exit(
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -76,8 +75,7 @@ def test_emergency_exit_with_profit(
     chain.sleep(1)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     chain.sleep(1)
     strategy.harvest({"from": gov})
     chain.sleep(1)
@@ -93,8 +91,7 @@ def test_emergency_exit_with_profit(
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -163,8 +160,7 @@ def test_emergency_exit_with_loss(
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and see how down bad we are
     vault.withdraw({"from": whale})
@@ -242,8 +238,7 @@ def test_emergency_exit_with_no_loss(
     assert strategy.estimatedTotalAssets() == 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we have about the same when including convex profit
     whale_profit = (
@@ -288,8 +283,7 @@ def test_emergency_withdraw_method_0(
     chain.sleep(1)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # set emergency exit so no funds will go back to strategy
     # here we assume that the swap out to curve pool tokens is borked, so we stay in cvx vault tokens and send to gov
@@ -342,8 +336,7 @@ def test_emergency_withdraw_method_1(
     strategy.harvest({"from": gov})
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # set emergency exit so no funds will go back to strategy
     # here we assume that the swap out to curve pool tokens is borked, so we stay in cvx vault tokens and send to gov
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test calling emergency shutdown from the vault, harvesting to ensure we can get all assets out
 def test_emergency_shutdown_from_vault(
@@ -41,8 +42,7 @@ def test_emergency_shutdown_from_vault(
     assert math.isclose(strategy.estimatedTotalAssets(), 0, abs_tol=5)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -0,0 +1,93 @@
+import brownie
+from brownie import Contract
+from utils import advance
+from scripts.event_store import EventStore
+
+# index our strategy's and vault's events into SQLite, then pick up where we left off after another harvest
+def test_event_store(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    strategist,
+    rewards,
+    keeper,
+    chain,
+    amount,
+    contract_name,
+    pid,
+    pool,
+    strategy_name,
+    sleep_time,
+    is_clonable,
+    tmp_path,
+):
+    store = EventStore(tmp_path / "events.db")
+    store.add_source(vault, "vault", chain.height + 1)
+    store.add_source(strategy, "strategy", chain.height + 1)
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    harvests = [strategy.harvest({"from": gov})]
+    advance(sleep_time)
+    harvests.append(strategy.harvest({"from": gov}))
+
+    # a clone made along the way gets picked up from its Cloned event
+    clone = None
+    if is_clonable:
+        tx = strategy.cloneConvex3CrvRewards(
+            vault,
+            strategist,
+            rewards,
+            keeper,
+            pid,
+            pool,
+            strategy_name,
+            {"from": gov},
+        )
+        clone = contract_name.at(tx.return_value)
+        vault.updateStrategyDebtRatio(strategy, 5000, {"from": gov})
+        vault.addStrategy(clone, 5000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+        chain.sleep(1)
+        clone_harvest = clone.harvest({"from": gov})
+
+    # small batches make sure we carry our progress between them
+    count = store.index(batch_size=2)
+    assert count > 0
+    assert store.last_block() == chain.height
+    rows = store.harvests(strategy)
+    assert [row["tx_hash"] for row in rows] == [tx.txid for tx in harvests]
+    for row, tx in zip(rows, harvests):
+        assert int(row["profit"]) == tx.events["Harvested"]["profit"]
+        assert row["timestamp"] == tx.timestamp
+        assert row["gas_used"] == tx.gas_used
+    deposits = store.query("SELECT * FROM deposits")
+    assert len(deposits) == 1 and int(deposits[0]["amount"]) == amount
+    if clone is not None:
+        assert store.query("SELECT clone FROM clones") == [{"clone": clone.address}]
+        assert [row["tx_hash"] for row in store.harvests(clone)] == [clone_harvest.txid]
+    reports = store.query(
+        "SELECT * FROM reports WHERE strategy = ?", (strategy.address,)
+    )
+    assert len(reports) == len(harvests)
+
+    # running again only reads the new blocks
+    assert store.index() == 0
+    advance(sleep_time)
+    harvests.append(strategy.harvest({"from": gov}))
+    store.index()
+    assert [row["tx_hash"] for row in store.harvests(strategy)] == [
+        tx.txid for tx in harvests
+    ]
+
+    # and our analyses are just queries
+    by_strategy = {row["strategy"]: row for row in store.profit_per_gas()}
+    assert by_strategy[strategy.address]["harvests"] == len(harvests)
+    assert by_strategy[strategy.address]["avg_gas"] > 0
+    aprs = {row["strategy"]: row["apr"] for row in store.strategy_aprs(vault)}
+    print("\nAPRs:", aprs)
+    assert aprs[strategy.address] > 0
+    store.close()
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+from scripts.gas_diff import diff, load, main
+
+# our diff should line up every key from both baselines, and refuse to compare baselines from different blocks
+def test_gas_diff(tmp_path, capsys):
+    before = tmp_path / "before.json"
+    after = tmp_path / "after.json"
+    before.write_text(
+        json.dumps({"fork_block": 1, "results": {"40/harvest": 1000, "40/tend": 50}})
+    )
+    after.write_text(
+        json.dumps({"fork_block": 1, "results": {"40/harvest": 900, "40/new": 10}})
+    )
+    assert diff(load(before)[1], load(after)[1]) == [
+        ("40/harvest", 1000, 900),
+        ("40/new", None, 10),
+        ("40/tend", 50, None),
+    ]
+    main(before, after)
+    assert "-100 (-10.0%)" in capsys.readouterr().out
+
+    after.write_text(json.dumps({"fork_block": 2, "results": {}}))
+    with pytest.raises(ValueError):
+        main(before, after)
@@ -0,0 +1,90 @@
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+
+# with an idle buffer, withdrawals it covers shouldn't unstake from convex, and with a minimum deposit we shouldn't
+# deposit dust
+def test_idle_buffer(gov, token, vault, whale, strategy, amount, accounts):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    assert strategy.balanceOfWant() == 0
+
+    buffer = strategy.stakedBalance() // 100
+    with brownie.reverts():
+        strategy.setDepositParams(0, buffer, {"from": whale})
+    strategy.setDepositParams(0, buffer, {"from": gov})
+    assert strategy.idleBuffer() == buffer
+
+    # tend keeps our buffer loose, and deposits the rest
+    token.transfer(strategy, buffer * 3, {"from": whale})
+    strategy.tend({"from": gov})
+    assert strategy.balanceOfWant() == buffer
+
+    # a withdrawal our buffer covers doesn't touch convex
+    vault_account = accounts.at(vault, force=True)
+    staked = strategy.stakedBalance()
+    tx = strategy.withdraw(buffer // 2, {"from": vault_account})
+    assert strategy.stakedBalance() == staked
+    assert strategy.balanceOfWant() == buffer - buffer // 2
+    buffered_gas = tx.gas_used
+
+    # a bigger one unstakes what it needs plus enough to refill our buffer, in one call
+    tx = strategy.withdraw(buffer * 2, {"from": vault_account})
+    assert strategy.balanceOfWant() == buffer
+    assert strategy.stakedBalance() == staked - (buffer * 2 + buffer // 2)
+
+    # without a buffer, the same small withdrawal has to unstake
+    strategy.setDepositParams(0, 0, {"from": gov})
+    strategy.tend({"from": gov})
+    assert strategy.balanceOfWant() == 0
+    tx = strategy.withdraw(buffer // 2, {"from": vault_account})
+    print("\nSmall withdrawal gas, buffered:", buffered_gas, "unstaking:", tx.gas_used)
+    assert tx.gas_used > buffered_gas
+
+    # loose want at or under our minimum deposit waits for more to join it
+    strategy.setDepositParams(buffer, 0, {"from": gov})
+    token.transfer(strategy, buffer, {"from": whale})
+    staked = strategy.stakedBalance()
+    strategy.tend({"from": gov})
+    assert strategy.stakedBalance() == staked
+    token.transfer(strategy, 1, {"from": whale})
+    strategy.tend({"from": gov})
+    assert strategy.stakedBalance() == staked + buffer + 1
+    assert strategy.balanceOfWant() == 0
+
+
+# when the vault wants some debt back, we pay it from our loose want first and only unstake what that can't cover
+def test_idle_buffer_debt(gov, token, vault, whale, strategy, amount):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+
+    # with a minimum deposit, our next credit stays loose
+    extra = amount // 10
+    strategy.setDepositParams(extra, 0, {"from": gov})
+    vault.deposit(extra, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    assert strategy.balanceOfWant() == extra
+
+    # ask for less back than we have loose
+    ratio = vault.strategies(strategy)["debtRatio"]
+    vault.updateStrategyDebtRatio(strategy, ratio - 50, {"from": gov})
+    debt = vault.strategies(strategy)["totalDebt"]
+    outstanding = vault.debtOutstanding(strategy)
+    assert 0 < outstanding < extra
+    staked = strategy.stakedBalance()
+    advance(1)
+    tx = strategy.harvest({"from": gov})
+    assert tx.events["Harvested"]["debtPayment"] == outstanding
+    assert vault.strategies(strategy)["totalDebt"] == debt - outstanding
+
+    # our loose want paid our debt and our profit, so we didn't unstake anything
+    assert strategy.stakedBalance() == staked
+    assert strategy.balanceOfWant() == extra - outstanding
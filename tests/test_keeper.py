@@ -0,0 +1,87 @@
+import asyncio
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+from scripts.keeper import Keeper, RpcPool
+
+# our async keeper should agree with harvestTrigger(0) on every strategy, and harvest the ones that trigger
+def test_keeper(
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    keeper,
+    rewards,
+    chain,
+    web3,
+    contract_name,
+    pid,
+    amount,
+    pool,
+    strategy_name,
+    sleep_time,
+    gasOracle,
+    strategist_ms,
+    is_clonable,
+):
+    if not is_clonable:
+        return
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    # add a few clones; they aren't attached to a vault, so they should never trigger
+    strategies = [strategy]
+    for i in range(3):
+        tx = strategy.cloneConvex3CrvRewards(
+            vault,
+            strategist,
+            rewards,
+            keeper,
+            pid,
+            pool,
+            strategy_name,
+            {"from": gov},
+        )
+        strategies.append(contract_name.at(tx.return_value))
+
+    # simulate earnings
+    advance(sleep_time)
+
+    async def poll(block=None):
+        async with RpcPool(web3.provider.endpoint_uri, batch_size=5) as rpc:
+            keeper_bot = Keeper(rpc, strategies, keeper, chunk_size=2)
+            if block is None:
+                return await keeper_bot.poll_once()
+            return await keeper_bot.check(block)
+
+    # gas is too high, so nothing should trigger
+    gasOracle.setMaxAcceptableBaseFee(0, {"from": strategist_ms})
+    block = chain.height
+    assert asyncio.run(poll(block)) == []
+    for clone in strategies:
+        assert clone.harvestTrigger(0, block_identifier=block) == False
+
+    # force a harvest on our main strategy with acceptable gas
+    gasOracle.setMaxAcceptableBaseFee(10000 * 1e9, {"from": strategist_ms})
+    strategy.setForceHarvestTriggerOnce(True, {"from": gov})
+    block = chain.height
+    to_harvest = asyncio.run(poll(block))
+    assert to_harvest == [strategy]
+    for clone in strategies:
+        assert clone.harvestTrigger(0, block_identifier=block) == (clone == strategy)
+
+    # now let it actually harvest for us
+    last_report = vault.strategies(strategy)["lastReport"]
+    _, txs = asyncio.run(poll())
+    assert len(txs) == 1
+    txs[0].wait(1)
+    assert txs[0].status == 1
+    assert vault.strategies(strategy)["lastReport"] > last_report
+    assert strategy.harvestTrigger(0) == False
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test migrating a strategy
 def test_migration(
@@ -91,8 +92,7 @@ def test_migration(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
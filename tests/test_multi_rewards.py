@@ -0,0 +1,74 @@
+import brownie
+import pytest
+from brownie import Contract, ZERO_ADDRESS
+from utils import advance
+from scripts.claimable_profit import claimable_profits
+
+# turn on every extra reward our pool has, make sure we value and sell all of them, then go back to one and to none
+def test_multi_rewards(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    chain,
+    amount,
+    rewardsContract,
+    sushi_router,
+    crv,
+    convexToken,
+    sleep_time,
+    is_convex,
+):
+    if not is_convex:
+        pytest.skip("only our convex strategy sells extra rewards")
+    length = rewardsContract.extraRewardsLength()
+    if length == 0:
+        pytest.skip("our pool has no extra rewards")
+    pools = [rewardsContract.extraRewards(i) for i in range(length)]
+    tokens = [Contract(pool).rewardToken() for pool in pools]
+    sold = [Contract(t) for t in set(tokens) if t not in (crv, convexToken)]
+
+    with brownie.reverts():
+        strategy.updateAllRewards({"from": whale})
+    strategy.updateAllRewards({"from": gov})
+    assert strategy.allRewards() == (tokens, pools)
+    assert strategy.hasRewards()
+    assert strategy.rewardsToken() == tokens[0]
+    assert strategy.virtualRewardsPool() == pools[0]
+    for reward in sold:
+        assert reward.allowance(strategy, sushi_router) == 2 ** 256 - 1
+
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    advance(sleep_time)
+
+    # our off-chain valuation should match, to the wei
+    block = chain.height
+    profits, _ = claimable_profits([strategy], block)
+    assert profits[0] == strategy.claimableProfitInUsdt(block_identifier=block)
+
+    # one harvest claims and sells everything
+    strategy.harvest({"from": gov})
+    for reward in sold:
+        assert reward.balanceOf(strategy) == 0
+    assert all(Contract(pool).earned(strategy) == 0 for pool in pools)
+
+    # updateRewards still sets a single reward, and drops the rest
+    strategy.updateRewards(True, length - 1, {"from": gov})
+    assert strategy.allRewards() == ([tokens[-1]], [pools[-1]])
+    assert strategy.rewardsToken() == tokens[-1]
+    for reward in sold:
+        expected = 2 ** 256 - 1 if reward == tokens[-1] else 0
+        assert reward.allowance(strategy, sushi_router) == expected
+
+    strategy.updateRewards(False, 0, {"from": gov})
+    assert strategy.allRewards() == ([], [])
+    assert not strategy.hasRewards()
+    assert strategy.rewardsToken() == ZERO_ADDRESS
+    assert strategy.virtualRewardsPool() == ZERO_ADDRESS
+    for reward in sold:
+        assert reward.allowance(strategy, sushi_router) == 0
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 
 def test_odds_and_ends(
@@ -74,8 +75,7 @@ def test_odds_and_ends(
     # our whale donates 1 wei to the vault so we don't divide by zero (0.3.5 vault errors in vault._reportLoss)
     token.transfer(strategy, 1, {"from": whale})
 
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
     strategy.setDoHealthCheck(False, {"from": gov})
     strategy.harvest({"from": gov})
     chain.sleep(1)
@@ -122,8 +122,7 @@ def test_odds_and_ends(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
@@ -282,12 +281,10 @@ def test_odds_and_ends_migration(
     print("\nVault starting assets with new strategy: ", startingVault)
 
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # Test out our migrated strategy, confirm we're making a profit
     new_strategy.harvest({"from": gov})
@@ -346,8 +343,7 @@ def test_odds_and_ends_liquidatePosition(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate time for earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest, store new asset amount
     chain.sleep(1)
@@ -368,8 +364,7 @@ def test_odds_and_ends_liquidatePosition(
         ),
     )
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # transfer funds to our strategy so we have enough for our withdrawal
     token.transfer(strategy, amount, {"from": whale})
@@ -451,8 +446,7 @@ def test_odds_and_ends_rekt(
     vault.updateStrategyDebtRatio(strategy, 0, {"from": gov})
 
     strategy.setDoHealthCheck(False, {"from": gov})
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     tx = strategy.harvest({"from": gov})
     chain.sleep(1)
 
@@ -694,15 +688,13 @@ def test_odds_and_ends_keep_cvx(
     strategy.harvest({"from": gov})
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # take 100% of our CVX to the treasury
     strategy.setKeep(
         1000, 10000, "0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde", {"from": gov}
     )
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     treasury_before = convexToken.balanceOf(strategy.keepCVXDestination())
     tx = strategy.harvest({"from": gov})
     treasury_after = convexToken.balanceOf(strategy.keepCVXDestination())
@@ -710,15 +702,13 @@ def test_odds_and_ends_keep_cvx(
         assert treasury_after > treasury_before
 
     # sleep to get some profit
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # take 0% of our CVX to the treasury
     strategy.setKeep(
         1000, 0, "0x93A62dA5a14C80f265DAbC077fCEE437B1a0Efde", {"from": gov}
     )
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     treasury_before = convexToken.balanceOf(vault.rewards())
     strategy.harvest({"from": gov})
     treasury_after = convexToken.balanceOf(vault.rewards())
@@ -0,0 +1,132 @@
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+
+# sell CRV and CVX for our strategy and a clone together, and make sure each gets its pro-rata share of WETH back
+def test_pooled_seller(
+    gov,
+    token,
+    vault,
+    strategist,
+    whale,
+    strategy,
+    keeper,
+    rewards,
+    contract_name,
+    PooledSeller,
+    pid,
+    amount,
+    pool,
+    strategy_name,
+    sleep_time,
+    is_clonable,
+    crv,
+    convexToken,
+    crveth,
+    cvxeth,
+):
+    if not is_clonable:
+        return
+
+    # split our vault's debt unevenly between our strategy and a clone, so our shares are different
+    tx = strategy.cloneConvex3CrvRewards(
+        vault,
+        strategist,
+        rewards,
+        keeper,
+        pid,
+        pool,
+        strategy_name,
+        {"from": gov},
+    )
+    clone = contract_name.at(tx.return_value)
+    strategies = [strategy, clone]
+    vault.updateStrategyDebtRatio(strategy, 7000, {"from": gov})
+    vault.addStrategy(clone, 3000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+
+    # our seller needs to be the pooled seller and keeper on both
+    seller = keeper.deploy(PooledSeller)
+    for s in strategies:
+        s.setPooledSeller(seller, {"from": gov})
+        s.setKeeper(seller, {"from": gov})
+
+    # only our seller can claim, and only our keepers can use our seller
+    with brownie.reverts():
+        strategy.claimForSeller({"from": whale})
+    with brownie.reverts("!keeper"):
+        seller.sellAndHarvest(strategies, {"from": whale})
+
+    ## deposit to the vault after approving, and get funds into both strategies
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    for s in strategies:
+        s.harvest({"from": gov})
+
+    # simulate earnings
+    advance(sleep_time)
+    tx = seller.sellAndHarvest(strategies, {"from": keeper})
+    sold = tx.events["Sold"]
+    print("\nPooled sale:", sold)
+    assert sold["wethFromCrv"] > 0 and sold["wethFromConvex"] > 0
+
+    # every strategy gets exactly its share of the WETH from each swap, rounded down
+    distributed = tx.events["Distributed"]
+    assert sum(event["crvAmount"] for event in distributed) == sold["crvAmount"]
+    assert sum(event["convexAmount"] for event in distributed) == sold["convexAmount"]
+    for event in distributed:
+        expected = (
+            sold["wethFromCrv"] * event["crvAmount"] // sold["crvAmount"]
+            + sold["wethFromConvex"] * event["convexAmount"] // sold["convexAmount"]
+        )
+        assert event["wethAmount"] == expected
+    assert distributed[0]["strategy"] == strategy
+    assert distributed[0]["wethAmount"] > distributed[1]["wethAmount"]
+
+    # only rounding dust should be left behind, and both strategies should have compounded their WETH
+    weth = Contract("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2")
+    assert weth.balanceOf(seller) <= 2 * len(strategies)
+    for s in strategies:
+        assert weth.balanceOf(s) == 0
+    harvested = tx.events["Harvested"]
+    assert len(harvested) == 2
+    for event in harvested:
+        assert event["profit"] > 0
+
+    # below our minimums we hold everyone's CRV and CVX for a later round, since they've already had keepCRV and
+    # keepCVX taken out. sending them back would take those out again.
+    advance(sleep_time)
+    seller.setMinToSell(2 ** 256 - 1, 2 ** 256 - 1, {"from": keeper})
+    tx = seller.sellAndHarvest(strategies, {"from": keeper})
+    assert tx.events["Sold"]["wethFromCrv"] == 0
+    carried_crv = 0
+    carried_cvx = 0
+    for s, event in zip(strategies, tx.events["Distributed"]):
+        assert seller.crvCarried(s) == event["crvAmount"] > 0
+        assert seller.convexCarried(s) == event["convexAmount"] > 0
+        assert event["wethAmount"] == 0
+        carried_crv += event["crvAmount"]
+        carried_cvx += event["convexAmount"]
+    assert crv.balanceOf(seller) == carried_crv
+    assert convexToken.balanceOf(seller) == carried_cvx
+    with brownie.reverts("!protected"):
+        seller.sweep(crv, {"from": keeper})
+
+    # next round sells what we held along with what's new, within our slippage limit of curve's price oracles
+    advance(sleep_time)
+    seller.setMinToSell(1e17, 1e17, {"from": keeper})
+    seller.setMaxSlippage(500, {"from": keeper})
+    crv_price = crveth.price_oracle()
+    cvx_price = cvxeth.price_oracle()
+    tx = seller.sellAndHarvest(strategies, {"from": keeper})
+    sold = tx.events["Sold"]
+    assert sold["crvAmount"] > carried_crv and sold["convexAmount"] > carried_cvx
+    assert sold["wethFromCrv"] >= sold["crvAmount"] * crv_price // 10 ** 18 * 95 // 100
+    assert (
+        sold["wethFromConvex"]
+        >= sold["convexAmount"] * cvx_price // 10 ** 18 * 95 // 100
+    )
+    for s in strategies:
+        assert seller.crvCarried(s) == 0 and seller.convexCarried(s) == 0
+    assert crv.balanceOf(seller) == 0 and convexToken.balanceOf(seller) == 0
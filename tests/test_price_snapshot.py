@@ -0,0 +1,81 @@
+import brownie
+from brownie import Contract, ZERO_ADDRESS
+from utils import advance
+from scripts.claimable_profit import CRVETH, CVXETH, ETH_ORACLE, claimable_profits
+from scripts.price_snapshot import PriceSnapshotClient
+
+# our snapshot should give the same answers as the oracles it caches, whether or not it's been updated this block
+def test_price_snapshot(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    keeper,
+    chain,
+    PriceSnapshot,
+    BatchHarvester,
+    amount,
+    sleep_time,
+):
+    eth_oracle = Contract(ETH_ORACLE)
+    crveth = Contract(CRVETH)
+    cvxeth = Contract(CVXETH)
+    snapshot = gov.deploy(PriceSnapshot)
+
+    # before any update, we read straight through to the oracles
+    block = chain.height
+    live = (
+        eth_oracle.latestAnswer(block_identifier=block),
+        crveth.price_oracle(block_identifier=block),
+        cvxeth.price_oracle(block_identifier=block),
+    )
+    assert not snapshot.isCurrent()
+    assert snapshot.prices(block_identifier=block) == live
+
+    # an update caches this block's values, and a second update in the same block does nothing
+    tx = snapshot.update({"from": keeper})
+    assert tx.events["Updated"]["blockNumber"] == tx.block_number
+    assert snapshot.lastUpdate() == tx.block_number
+    assert snapshot.isCurrent(block_identifier=tx.block_number)
+    assert snapshot.prices(block_identifier=tx.block_number) == (
+        tx.events["Updated"]["ethPrice"],
+        tx.events["Updated"]["crvEthPrice"],
+        tx.events["Updated"]["cvxEthPrice"],
+    )
+
+    # get some CRV to value, then point our strategy at the snapshot; its profit should match reading the oracles
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    advance(sleep_time)
+    with brownie.reverts():
+        strategy.setPriceSnapshot(snapshot, {"from": whale})
+    strategy.setPriceSnapshot(snapshot, {"from": gov})
+    profits, block = claimable_profits([strategy])
+    assert strategy.claimableProfitInUsdt(block_identifier=block) == profits[0]
+    assert strategy.claimableProfitInUsdt(block_identifier=block) > 0
+
+    # our off-chain client reads once per block and gives the same profits
+    client = PriceSnapshotClient(snapshot)
+    assert client.read(block) is client.read(block)
+    assert client.prices(block) == snapshot.prices(block_identifier=block)
+    client_profits, _ = client.claimable_profits([strategy], block)
+    assert list(client_profits) == list(profits)
+
+    # our batch harvester snapshots before it checks triggers, and harvests like normal
+    harvester = keeper.deploy(BatchHarvester)
+    harvester.setPriceSnapshot(snapshot, {"from": keeper})
+    strategy.setKeeper(harvester, {"from": gov})
+    strategy.setForceHarvestTriggerOnce(True, {"from": gov})
+    tx = harvester.harvestTriggered([strategy], {"from": keeper})
+    assert snapshot.lastUpdate() == tx.block_number
+    assert "StrategyHarvested" in tx.events
+    assert vault.strategies(strategy)["lastReport"] == tx.timestamp
+
+    # and with no snapshot set, our strategy goes back to the oracles
+    strategy.setPriceSnapshot(ZERO_ADDRESS, {"from": gov})
+    assert strategy.priceSnapshot() == ZERO_ADDRESS
+    profits, block = claimable_profits([strategy])
+    assert strategy.claimableProfitInUsdt(block_identifier=block) == profits[0]
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test removing a strategy from the withdrawal queue
 def test_remove_from_withdrawal_queue(
@@ -22,8 +23,7 @@ def test_remove_from_withdrawal_queue(
     chain.sleep(1)
 
     # simulate one day of earnings
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
     strategy.harvest({"from": gov})
     chain.sleep(1)
     before = strategy.estimatedTotalAssets()
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test revoking a strategy from the vault
 def test_revoke_strategy_from_vault(
@@ -25,8 +26,7 @@ def test_revoke_strategy_from_vault(
     strategy.harvest({"from": gov})
 
     # sleep to earn some yield
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     vaultAssets_starting = vault.totalAssets()
     vault_holdings_starting = token.balanceOf(vault)
@@ -46,8 +46,7 @@ def test_revoke_strategy_from_vault(
     assert token.balanceOf(vault) >= vault_holdings_starting + strategy_starting
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test the our strategy's ability to deposit, harvest, and withdraw, with different optimal deposit tokens if we have them
 def test_simple_harvest(
@@ -29,8 +30,7 @@ def test_simple_harvest(
     token.approve(vault, 2 ** 256 - 1, {"from": whale})
     vault.deposit(amount, {"from": whale})
     newWhale = token.balanceOf(whale)
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
 
     # this is part of our check into the staking contract balance
     if is_convex:
@@ -44,8 +44,7 @@ def test_simple_harvest(
     # harvest, store asset amount
     tx = strategy.harvest({"from": gov})
     print("Harvest info:", tx.events["Harvested"])
-    chain.sleep(1)
-    chain.mine(1)
+    advance(1)
     old_assets = vault.totalAssets()
     assert old_assets > 0
     assert token.balanceOf(strategy) == 0
@@ -59,8 +58,7 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest, store new asset amount
     chain.sleep(1)
@@ -92,12 +90,10 @@ def test_simple_harvest(
 
         # harvest, store new asset amount, turn off health check since we're donating a lot
         old_assets = vault.totalAssets()
-        chain.sleep(1)
-        chain.mine(1)
+        advance(1)
         strategy.setDoHealthCheck(False, {"from": gov})
         tx = strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        advance(1)
         new_assets = vault.totalAssets()
         # confirm we made money, or at least that we have about the same
         assert new_assets >= old_assets
@@ -123,12 +119,10 @@ def test_simple_harvest(
 
             # harvest, store new asset amount, turn off health check since we're donating a lot
             old_assets = vault.totalAssets()
-            chain.sleep(1)
-            chain.mine(1)
+            advance(1)
             strategy.setDoHealthCheck(False, {"from": gov})
             tx = strategy.harvest({"from": gov})
-            chain.sleep(1)
-            chain.mine(1)
+            advance(1)
             new_assets = vault.totalAssets()
             # confirm we made money, or at least that we have about the same
             assert new_assets >= old_assets
@@ -162,8 +156,7 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest, store new asset amount
     chain.sleep(1)
@@ -200,8 +193,7 @@ def test_simple_harvest(
         stakingBeforeHarvest < strategy.stakedBalance()
 
     # simulate profits
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest, store new asset amount
     chain.sleep(1)
@@ -224,8 +216,7 @@ def test_simple_harvest(
         assert tx.events["Harvested"]["profit"] > 0
 
     # simulate a day of waiting for share price to bump back up
-    chain.sleep(86400)
-    chain.mine(1)
+    advance(86400)
 
     # withdraw and confirm we made money, or at least that we have about the same
     vault.withdraw({"from": whale})
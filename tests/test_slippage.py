@@ -0,0 +1,109 @@
+import brownie
+from brownie import Contract
+from utils import advance
+from scripts.shortfall import execution_shortfall, load_swap_pools
+
+# with maxSlippage on, our swaps should fill within our tolerance of the oracles, and a harvest that's been front-run
+# past it should revert instead of selling at a bad price
+def test_slippage(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    crv,
+    crveth,
+    sleep_time,
+    accounts,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    advance(1)
+    strategy.harvest({"from": gov})
+    load_swap_pools(strategy)
+
+    # only managers can set our tolerance, and it has to be under 100%
+    with brownie.reverts():
+        strategy.setMaxSlippage(300, {"from": whale})
+    with brownie.reverts():
+        strategy.setMaxSlippage(10_000, {"from": gov})
+
+    # a normal harvest fills well inside 3%
+    strategy.setMaxSlippage(300, {"from": gov})
+    advance(sleep_time)
+    tx = strategy.harvest({"from": gov})
+    swaps = execution_shortfall(strategy, tx)
+    print("\nShortfall per swap:", swaps)
+    assert len(swaps) > 0
+    for swap in swaps:
+        assert swap["bought"] >= swap["expected"] * (10_000 - 300) // 10_000
+
+    # someone dumps CRV ahead of our harvest, so our CRV sale would fill well below the oracle
+    advance(sleep_time)
+    crv_whale = accounts.at("0x5f3b5DfEb7B28CDbD7FAba78963EE202a494e2A2", force=True)
+    dump = crveth.balances(1) // 5
+    crv.approve(crveth, dump, {"from": crv_whale})
+    crveth.exchange(1, 0, dump, 0, False, {"from": crv_whale})
+    strategy.setMaxSlippage(100, {"from": gov})
+    with brownie.reverts():
+        strategy.harvest({"from": gov})
+
+    # with our check off we'd have sold anyway, and taken the hit
+    strategy.setMaxSlippage(0, {"from": gov})
+    tx = strategy.harvest({"from": gov})
+    crv_swaps = [
+        s for s in execution_shortfall(strategy, tx) if s["pool"] == crveth.address
+    ]
+    print("Front-run CRV sale:", crv_swaps)
+    assert crv_swaps[0]["shortfall_bps"] > 100
+
+
+# our bonus rewards are sold on sushiswap, where only the minRewardsPrice floor managers set for each token protects us
+def test_rewards_floor(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    amount,
+    is_convex,
+    rewards_token,
+    rewards_whale,
+    rewards_amount,
+    sushi_router,
+):
+    # only our convex strategy has this
+    if not is_convex:
+        return
+
+    ## deposit to the vault after approving, and turn on our bonus reward
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    strategy.updateRewards(True, 0, {"from": gov})
+    advance(1)
+    strategy.harvest({"from": gov})
+    assert strategy.rewardsToken() == rewards_token.address
+
+    # only managers can set a floor
+    with brownie.reverts():
+        strategy.setMinRewardsPrice(rewards_token, 1, {"from": whale})
+
+    # sushiswap's price for 1e18 of our reward, before our sale moves it
+    rewards_token.transfer(strategy, rewards_amount, {"from": rewards_whale})
+    weth = sushi_router.WETH()
+    quote = sushi_router.getAmountsOut(1e18, [rewards_token, weth])[1]
+    assert quote > 0
+
+    # a floor above the market should stop our harvest instead of selling under it
+    strategy.setMinRewardsPrice(rewards_token, quote * 2, {"from": gov})
+    assert strategy.minRewardsPrice(rewards_token) == quote * 2
+    advance(1)
+    with brownie.reverts():
+        strategy.harvest({"from": gov})
+
+    # and one comfortably below it lets us sell everything
+    strategy.setMinRewardsPrice(rewards_token, quote // 2, {"from": gov})
+    strategy.harvest({"from": gov})
+    assert rewards_token.balanceOf(strategy) == 0
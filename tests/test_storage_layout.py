@@ -0,0 +1,61 @@
+import brownie
+from brownie import Contract
+from brownie import config
+
+# read a packed value out of a storage slot; solidity packs from the lowest-order bytes up
+def packed(word, offset, size):
+    return (word >> (8 * offset)) & ((1 << (8 * size)) - 1)
+
+
+def find_address(words, address, start=0):
+    # the first slot (from start) and byte offset where an address is stored
+    address = int(address, 16)
+    for slot, word in enumerate(words[start:], start):
+        for offset in range(13):
+            if packed(word, offset, 20) == address:
+                return slot, offset
+    raise ValueError("address not found in storage")
+
+
+# make sure the settings we read on every harvest and harvestTrigger stay packed into as few slots as possible
+def test_storage_layout(gov, strategy, web3, is_convex):
+    if not is_convex:
+        return
+
+    strategy.setKeep(1234, 567, gov, {"from": gov})
+    strategy.setClaimRewards(True, {"from": gov})
+    strategy.setForceHarvestTriggerOnce(True, {"from": gov})
+    strategy.setHarvestTriggerParams(11e6, 22e6, 33e18, True, {"from": gov})
+    strategy.setDepositParams(44e18, 55e18, {"from": gov})
+
+    words = [
+        int.from_bytes(web3.eth.get_storage_at(strategy.address, slot), "big")
+        for slot in range(64)
+    ]
+
+    # rewardsContract shares its slot with keepCRV, keepCVX, forceHarvestTriggerOnce and claimRewards
+    slot, offset = find_address(words, strategy.rewardsContract())
+    word = words[slot]
+    assert packed(word, offset + 20, 2) == 1234
+    assert packed(word, offset + 22, 2) == 567
+    assert packed(word, offset + 24, 1) == 1
+    assert packed(word, offset + 25, 1) == 1
+
+    # our trigger params get the next slot to themselves
+    word = words[slot + 1]
+    assert packed(word, 0, 8) == 11e6
+    assert packed(word, 8, 8) == 22e6
+    assert packed(word, 16, 16) == 33e18
+
+    # then our deposit params
+    word = words[slot + 2]
+    assert packed(word, 0, 16) == 44e18
+    assert packed(word, 16, 16) == 55e18
+
+    # curve shares its slot with checkEarmark, hasRewards and isOriginal. for metapools curve is also our want, which
+    # BaseStrategy stores earlier, so start looking after our own variables.
+    slot, offset = find_address(words, strategy.curve(), slot + 3)
+    word = words[slot]
+    assert packed(word, offset + 20, 1) == 1
+    assert packed(word, offset + 21, 1) == strategy.hasRewards()
+    assert packed(word, offset + 22, 1) == 1
@@ -0,0 +1,101 @@
+import time
+
+import numpy as np
+from scripts.harvest_trigger_sim import DEFAULT_PARAMS, TriggerParams, simulate_harvests
+from scripts.trigger_optimizer import (
+    History,
+    optimize,
+    setter_calls,
+    simulate_grid,
+    usdt_per_crv,
+)
+
+# our grid optimizer should make the same harvest decisions as our exact trigger simulator, and its recommended
+# parameters should beat what we'd set by hand
+def test_trigger_optimizer():
+    # 60 days of hourly samples with noisy base fees around our limit
+    rng = np.random.default_rng(42)
+    hours = 60 * 24
+    timestamps = 1_650_000_000 + np.arange(hours) * 3600
+    earned_crv = np.cumsum(rng.integers(200, 400, hours)) * 10 ** 18
+    cvx_supply = 60_000_000 * 10 ** 18
+    eth_price = 3_000 * 10 ** 8
+    crv_eth_price = 10 ** 15
+    cvx_eth_price = 10 ** 16
+    base_fee = rng.integers(20, 150, hours) * 10 ** 9
+    max_base_fee = 80 * 10 ** 9
+    history = History(
+        timestamps,
+        earned_crv,
+        np.full(
+            hours, usdt_per_crv(cvx_supply, eth_price, crv_eth_price, cvx_eth_price)
+        ),
+        base_fee,
+        np.full(hours, eth_price),
+    )
+    last_report = timestamps[0]
+
+    params = [
+        TriggerParams(20_000 * 10 ** 6, 90_000 * 10 ** 6, 10 ** 24, False, 21 * 86400),
+        TriggerParams(60_000 * 10 ** 6, 120_000 * 10 ** 6, 10 ** 24, False, 3 * 86400),
+        TriggerParams(10 ** 12, 10 ** 12, 10 ** 24, False, 7 * 86400),
+    ]
+    scores = simulate_grid(
+        history,
+        [p.harvest_profit_min for p in params],
+        [p.harvest_profit_max for p in params],
+        [p.max_report_delay for p in params],
+        max_base_fee,
+        last_report,
+        10_000_000 * 10 ** 6,
+    )
+    for lane, p in enumerate(params):
+        exact = simulate_harvests(
+            [int(t) for t in timestamps],
+            [int(e) for e in earned_crv],
+            cvx_supply,
+            eth_price,
+            crv_eth_price,
+            cvx_eth_price,
+            [int(b) for b in base_fee],
+            max_base_fee,
+            int(last_report),
+            p,
+        )
+        assert scores.harvests[lane] == len(exact)
+
+    start = time.perf_counter()
+    best, scores = optimize(
+        history, max_base_fee, last_report, 10_000_000 * 10 ** 6, DEFAULT_PARAMS
+    )
+    print(
+        f"\nScored {len(scores.net)} parameter sets in {time.perf_counter() - start:.2f}s:",
+        best,
+    )
+    assert len(scores.net) > 1_000
+    default = simulate_grid(
+        history,
+        DEFAULT_PARAMS.harvest_profit_min,
+        DEFAULT_PARAMS.harvest_profit_max,
+        DEFAULT_PARAMS.max_report_delay,
+        max_base_fee,
+        last_report,
+        10_000_000 * 10 ** 6,
+    )
+    assert scores.net.max() >= default.net[0]
+
+
+# our recommended calls should apply cleanly, and only change what we optimize
+def test_trigger_optimizer_setters(gov, strategy):
+    credit_threshold = strategy.creditThreshold()
+    check_earmark = strategy.checkEarmark()
+    params = TriggerParams(
+        25_000 * 10 ** 6, 150_000 * 10 ** 6, credit_threshold, check_earmark, 5 * 86400
+    )
+    for method, args in setter_calls(strategy, params):
+        method(*args, {"from": gov})
+    assert strategy.harvestProfitMin() == params.harvest_profit_min
+    assert strategy.harvestProfitMax() == params.harvest_profit_max
+    assert strategy.maxReportDelay() == params.max_report_delay
+    assert strategy.creditThreshold() == credit_threshold
+    assert strategy.checkEarmark() == check_earmark
@@ -0,0 +1,116 @@
+import brownie
+from brownie import Contract
+from brownie import config
+from utils import advance
+from scripts.harvest_trigger_sim import (
+    TriggerParams,
+    CRV,
+    CVX,
+    bonus_rewards_value,
+    claimable_profit_in_usdt,
+    harvest_trigger,
+)
+
+# make sure our off-chain harvestTrigger simulator agrees with the strategy, to the wei
+def test_trigger_sim(
+    gov,
+    token,
+    vault,
+    whale,
+    strategy,
+    chain,
+    amount,
+    gasOracle,
+    strategist_ms,
+    convexToken,
+    eth_oracle,
+    crveth,
+    cvxeth,
+    sushi_router,
+    sleep_time,
+):
+    ## deposit to the vault after approving
+    token.approve(vault, 2 ** 256 - 1, {"from": whale})
+    vault.deposit(amount, {"from": whale})
+    chain.sleep(1)
+    strategy.harvest({"from": gov})
+
+    # simulate earnings
+    advance(sleep_time)
+
+    # check a few parameter sets, with gas both acceptable and too high
+    trigger_params = [
+        (1, 10 ** 12, 10 ** 24),
+        (10 ** 12, 1, 10 ** 24),
+        (10 ** 12, 10 ** 12, 10 ** 24),
+        (10 ** 12, 10 ** 12, 1),
+    ]
+    for max_base_fee in [2000 * 10 ** 9, 1]:
+        gasOracle.setMaxAcceptableBaseFee(max_base_fee, {"from": strategist_ms})
+        for (profit_min, profit_max, credit_threshold) in trigger_params:
+            strategy.setHarvestTriggerParams(
+                profit_min, profit_max, credit_threshold, False, {"from": gov}
+            )
+
+            # read everything at the same block, since our claimable rewards change every second
+            block = chain.height
+            profit = simulated_profit(
+                strategy, convexToken, eth_oracle, crveth, cvxeth, sushi_router, block
+            )
+            assert profit == strategy.claimableProfitInUsdt(block_identifier=block)
+            assert profit > 0
+
+            params = TriggerParams(
+                profit_min,
+                profit_max,
+                credit_threshold,
+                False,
+                strategy.maxReportDelay(block_identifier=block),
+            )
+            gas_ok = gasOracle.isCurrentBaseFeeAcceptable(block_identifier=block)
+            simulated = harvest_trigger(
+                chain[block].timestamp,
+                profit,
+                0 if gas_ok else 1,
+                0,
+                vault.strategies(strategy, block_identifier=block)["lastReport"],
+                params,
+                vault.creditAvailable(strategy, block_identifier=block),
+                False,
+                strategy.needsEarmarkReward(block_identifier=block),
+                strategy.isActive(block_identifier=block),
+            )
+            print("\nSimulated trigger:", bool(simulated), "profit:", profit / 1e6)
+            assert bool(simulated) == strategy.harvestTrigger(
+                0, {"from": gov}, block_identifier=block
+            )
+
+
+# value our claimable rewards off-chain, reading the same inputs the strategy does
+def simulated_profit(
+    strategy, convexToken, eth_oracle, crveth, cvxeth, sushi_router, block
+):
+    eth_price = eth_oracle.latestAnswer(block_identifier=block)
+    crv_eth_price = crveth.price_oracle(block_identifier=block)
+    cvx_eth_price = cvxeth.price_oracle(block_identifier=block)
+
+    # value any bonus rewards the same way the strategy does, through sushiswap unless they're CRV or CVX
+    rewards = []
+    weth = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+    for token, pool in zip(*strategy.allRewards(block_identifier=block)):
+        earned_bonus = Contract(pool).earned(strategy, block_identifier=block)
+        weth_out = 0
+        if earned_bonus > 0 and token not in (CRV, CVX):
+            weth_out = sushi_router.getAmountsOut(
+                earned_bonus, [token, weth], block_identifier=block
+            )[-1]
+        rewards.append((token, earned_bonus, weth_out))
+
+    return claimable_profit_in_usdt(
+        strategy.claimableBalance(block_identifier=block),
+        convexToken.totalSupply(block_identifier=block),
+        eth_price,
+        crv_eth_price,
+        cvx_eth_price,
+        bonus_rewards_value(rewards, eth_price, crv_eth_price, cvx_eth_price),
+    )
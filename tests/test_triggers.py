@@ -2,6 +2,7 @@ import brownie
 from brownie import Contract
 from brownie import config
 import math
+from utils import advance
 
 # test our harvest triggers
 def test_triggers(
@@ -50,8 +51,7 @@ def test_triggers(
         # harvest the credit
         chain.sleep(1)
         strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        advance(1)
 
         # should trigger false, nothing is ready yet
         tx = strategy.harvestTrigger(0, {"from": gov})
@@ -61,12 +61,10 @@ def test_triggers(
         # harvest the credit
         chain.sleep(1)
         strategy.harvest({"from": gov})
-        chain.sleep(1)
-        chain.mine(1)
+        advance(1)
 
     # simulate earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # set our max delay to 1 day so we trigger true, then set it back to 21 days
     strategy.setMaxReportDelay(sleep_time - 1)
@@ -125,8 +123,7 @@ def test_triggers(
     chain.sleep(1)
     tx = strategy.harvest({"from": gov})
     print("Harvest info:", tx.events["Harvested"])
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # harvest should trigger false due to high gas price
     gasOracle.setMaxAcceptableBaseFee(1 * 1e9, {"from": strategist_ms})
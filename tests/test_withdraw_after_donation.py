@@ -1,6 +1,7 @@
 import brownie
 from brownie import chain, Contract, ZERO_ADDRESS
 import math
+from utils import advance
 
 # these tests all assess whether a strategy will hit accounting errors following donations to the strategy.
 # lower debtRatio to 50%, donate, withdraw less than the donation, then harvest
@@ -39,8 +40,7 @@ def test_withdraw_after_donation_1(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -49,8 +49,7 @@ def test_withdraw_after_donation_1(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -115,8 +114,7 @@ def test_withdraw_after_donation_2(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -125,8 +123,7 @@ def test_withdraw_after_donation_2(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -195,8 +192,7 @@ def test_withdraw_after_donation_3(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -205,8 +201,7 @@ def test_withdraw_after_donation_3(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -275,8 +270,7 @@ def test_withdraw_after_donation_4(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -285,8 +279,7 @@ def test_withdraw_after_donation_4(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -354,8 +347,7 @@ def test_withdraw_after_donation_5(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -364,8 +356,7 @@ def test_withdraw_after_donation_5(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -426,8 +417,7 @@ def test_withdraw_after_donation_6(
     vault.withdraw(donation / 2, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # turn off health check since we just took big profit
     strategy.setDoHealthCheck(False, {"from": gov})
@@ -436,8 +426,7 @@ def test_withdraw_after_donation_6(
     new_params = vault.strategies(strategy)
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -510,8 +499,7 @@ def test_withdraw_after_donation_7(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # We harvest twice to take profits and then to send the funds to our strategy. This is for our last check below.
     chain.sleep(1)
@@ -546,8 +534,7 @@ def test_withdraw_after_donation_7(
         assert starting_total_vault_debt - starting_strategy_debt <= vault.totalDebt()
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -611,8 +598,7 @@ def test_withdraw_after_donation_8(
     vault.withdraw(withdrawal_in_shares, {"from": whale})
 
     # simulate some earnings
-    chain.sleep(sleep_time)
-    chain.mine(1)
+    advance(sleep_time)
 
     # We harvest twice to take profits and then to send the funds to our strategy. This is for our last check below.
     chain.sleep(1)
@@ -647,8 +633,7 @@ def test_withdraw_after_donation_8(
         assert starting_total_vault_debt - starting_strategy_debt <= vault.totalDebt()
 
     # sleep 10 hours to allow share price to normalize
-    chain.sleep(60 * 60 * 10)
-    chain.mine(1)
+    advance(60 * 60 * 10)
 
     profit = new_params["totalGain"] - prev_params["totalGain"]
 
@@ -0,0 +1,29 @@
+from brownie import chain
+
+# move time forward and seal a block at the new timestamp in one go, instead of a chain.sleep() then chain.mine() pair.
+# chain.sleep() and chain.mine() each round-trip to our node (and each takes a fresh snapshot), while this mines straight
+# to the target timestamp. the clock is shared, so one call moves time forward for every strategy on our fork at once.
+def advance(seconds, blocks=1):
+    chain.mine(blocks, timedelta=seconds)
+
+
+# total amount of `token` moved by Transfer events in `txs`, optionally only from `sender` and/or to `receiver`. WETH
+# names its Transfer fields src, dst and wad rather than from, to and value, so we read them by name for either.
+def transferred(txs, token, sender=None, receiver=None):
+    token, sender, receiver = [
+        None if address is None else str(address)
+        for address in (token, sender, receiver)
+    ]
+    total = 0
+    for tx in txs:
+        for event in tx.events["Transfer"] if "Transfer" in tx.events else []:
+            if event.address != token:
+                continue
+            src, dst, amount = (
+                (event["src"], event["dst"], event["wad"])
+                if "wad" in event
+                else (event["from"], event["to"], event["value"])
+            )
+            if sender in (None, src) and receiver in (None, dst):
+                total += amount
+    return total